@@ -0,0 +1,64 @@
+"""
+Compare the time taken to run jobs with each backend, for jobs that wait for
+I/O, jobs that pass large arguments and results, and very few jobs.
+
+Each I/O job sleeps for the given duration, as a stand-in for a network
+request. Each buffer job returns its large ``bytes`` argument, which is
+pickled twice when the jobs are run in worker processes.
+
+Run this benchmark with::
+
+    python benchmarks/bench_backends.py --jobs 200 --workers 8
+"""
+
+import argparse
+import time
+
+import parq
+
+
+def wait_for_io(duration):
+    time.sleep(duration)
+
+
+def return_buffer(buf):
+    return buf
+
+
+def elapsed_time(func, job_args, n_proc, backend):
+    start = time.perf_counter()
+    result = parq.run(
+        func, job_args, n_proc=n_proc, results=True, backend=backend
+    )
+    elapsed = time.perf_counter() - start
+    assert result
+    return elapsed
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=0.01)
+    parser.add_argument('--buffer-size', type=int, default=1024 * 1024)
+    opts = parser.parse_args(args)
+
+    workloads = [
+        ('I/O', wait_for_io, [(opts.duration,)] * opts.jobs),
+        ('buffers', return_buffer, [(bytes(opts.buffer_size),)] * opts.jobs),
+        ('one job', wait_for_io, [(opts.duration,)]),
+    ]
+    backends = ['process', 'thread', 'serial']
+    print(f'{opts.jobs} jobs, {opts.workers} workers')
+    print()
+    print('workload     ' + ''.join(f'{name:>10s}' for name in backends))
+    for name, func, job_args in workloads:
+        times = [
+            elapsed_time(func, job_args, opts.workers, backend)
+            for backend in backends
+        ]
+        print(f'{name:10s}   ' + ''.join(f'{t:9.3f}s' for t in times))
+
+
+if __name__ == '__main__':
+    main()
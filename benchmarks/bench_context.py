@@ -0,0 +1,82 @@
+"""
+Measure the cost of providing a large lookup table to every job, either as an
+argument of each job or by loading it once in each worker process.
+
+Run this benchmark once for each approach, because the peak memory use of a
+process never decreases::
+
+    python benchmarks/bench_context.py --jobs 50 --size 1000000
+    python benchmarks/bench_context.py --jobs 50 --size 1000000 --initializer
+"""
+
+import argparse
+import resource
+import time
+
+import parq
+
+
+TABLE = None
+
+
+def set_table(table):
+    global TABLE
+    TABLE = table
+
+
+def look_up_arg(job_num, table):
+    return table[job_num]
+
+
+def look_up_global(job_num):
+    return TABLE[job_num]
+
+
+def main_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=50)
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--initializer', action='store_true')
+    opts = parser.parse_args(args)
+
+    table = [float(i) for i in range(opts.size)]
+    print(
+        f'{opts.jobs} jobs with a {opts.size}-entry table, '
+        f'{opts.workers} workers, initializer = {opts.initializer}'
+    )
+
+    cpu_start = main_cpu_time()
+    start = time.perf_counter()
+    if opts.initializer:
+        result = parq.run(
+            look_up_global,
+            [(i,) for i in range(opts.jobs)],
+            n_proc=opts.workers,
+            initializer=set_table,
+            initargs=(table,),
+        )
+    else:
+        result = parq.run(
+            look_up_arg,
+            [(i, table) for i in range(opts.jobs)],
+            n_proc=opts.workers,
+        )
+    run_time = time.perf_counter() - start
+    cpu_time = main_cpu_time() - cpu_start
+    assert result
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f'run time = {run_time:6.2f} s    '
+        f'main process CPU = {cpu_time:6.2f} s    '
+        f'peak RSS = {peak_rss:6.0f} MiB'
+    )
+
+
+if __name__ == '__main__':
+    main()
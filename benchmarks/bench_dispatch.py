@@ -0,0 +1,67 @@
+"""
+Measure the CPU time consumed by worker processes when dispatching many cheap
+jobs to more worker processes than there are available CPU cores.
+
+Run this benchmark with::
+
+    python benchmarks/bench_dispatch.py --jobs 20000 --workers 8
+"""
+
+import argparse
+import os
+import resource
+import time
+
+import parq
+
+
+def cheap_job(x):
+    return x
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count()
+
+
+def children_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--chunksize', default='1')
+    opts = parser.parse_args(args)
+    if opts.chunksize != 'auto':
+        opts.chunksize = int(opts.chunksize)
+
+    n_cores = available_cores()
+    n_proc = opts.workers if opts.workers is not None else 4 * n_cores
+    job_args = [(i,) for i in range(opts.jobs)]
+    print(f'{opts.jobs} jobs, {n_proc} workers, {n_cores} available cores')
+    print(f'chunksize = {opts.chunksize}')
+
+    for _ in range(opts.repeats):
+        cpu_start = children_cpu_time()
+        wall_start = time.perf_counter()
+        result = parq.run(
+            cheap_job, job_args, n_proc=n_proc, chunksize=opts.chunksize
+        )
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = children_cpu_time() - cpu_start
+        assert result
+        print(
+            f'wall = {wall_time:6.2f} s    '
+            f'worker CPU = {cpu_time:6.2f} s    '
+            f'CPU per worker = {cpu_time / n_proc:6.3f} s'
+        )
+
+
+if __name__ == '__main__':
+    main()
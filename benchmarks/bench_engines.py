@@ -0,0 +1,69 @@
+"""
+Compare how the throughput of each engine scales with the number of worker
+processes, by running many cheap jobs with 1 to N worker processes.
+
+Run this benchmark with::
+
+    python benchmarks/bench_engines.py --jobs 20000 --max-workers 64
+"""
+
+import argparse
+import os
+import time
+
+import parq
+
+
+def cheap_job(x):
+    return x
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count()
+
+
+def worker_counts(max_workers):
+    n_proc = 1
+    while n_proc < max_workers:
+        yield n_proc
+        n_proc *= 2
+    yield max_workers
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--max-workers', type=int)
+    parser.add_argument('--chunksize', type=int, default=1)
+    opts = parser.parse_args(args)
+
+    n_cores = available_cores()
+    max_workers = opts.max_workers or n_cores
+    job_args = [(i,) for i in range(opts.jobs)]
+    print(f'{opts.jobs} jobs, chunksize = {opts.chunksize}')
+    print(f'{n_cores} available cores')
+    print()
+    print('workers    queue (jobs/s)    pipes (jobs/s)')
+
+    for n_proc in worker_counts(max_workers):
+        rates = []
+        for engine in parq._ENGINES:
+            start = time.perf_counter()
+            result = parq.run(
+                cheap_job,
+                job_args,
+                n_proc=n_proc,
+                chunksize=opts.chunksize,
+                engine=engine,
+            )
+            elapsed = time.perf_counter() - start
+            assert result
+            rates.append(opts.jobs / elapsed)
+        print(f'{n_proc:7d}    {rates[0]:14.0f}    {rates[1]:14.0f}')
+
+
+if __name__ == '__main__':
+    main()
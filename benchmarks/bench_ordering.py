@@ -0,0 +1,77 @@
+"""
+Compare the time taken to run jobs with skewed durations in the order that
+they are given, and in order of decreasing expected cost.
+
+The job durations are drawn from a Pareto distribution, so that most jobs are
+short and a few jobs are much longer. By default, the jobs are given in order
+of increasing duration, so that the longest jobs are started last. Each job
+sleeps for its duration, so the results do not depend on the number of
+available cores.
+
+Run this benchmark with::
+
+    python benchmarks/bench_ordering.py --jobs 200 --workers 4
+"""
+
+import argparse
+import random
+import time
+
+import parq
+
+
+def sleep_for(duration):
+    time.sleep(duration)
+
+
+def job_durations(n_jobs, mean, alpha, arrangement, seed):
+    rng = random.Random(seed)
+    # NOTE: the mean of the Pareto distribution is alpha / (alpha - 1).
+    scale = mean * (alpha - 1) / alpha
+    durations = [scale * rng.paretovariate(alpha) for _ in range(n_jobs)]
+    if arrangement == 'ascending':
+        durations.sort()
+    return durations
+
+
+def makespan(durations, n_proc, **kwargs):
+    job_args = [(duration,) for duration in durations]
+    start = time.perf_counter()
+    result = parq.run(sleep_for, job_args, n_proc=n_proc, **kwargs)
+    elapsed = time.perf_counter() - start
+    assert result
+    return elapsed
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--mean', type=float, default=0.02)
+    parser.add_argument('--alpha', type=float, default=1.2)
+    parser.add_argument(
+        '--arrangement', choices=['ascending', 'random'], default='ascending'
+    )
+    parser.add_argument('--seed', type=int, default=1)
+    opts = parser.parse_args(args)
+
+    durations = job_durations(
+        opts.jobs, opts.mean, opts.alpha, opts.arrangement, opts.seed
+    )
+    total = sum(durations)
+    lower_bound = max(total / opts.workers, max(durations))
+    print(f'{opts.jobs} jobs, {opts.workers} workers, {opts.arrangement}')
+    print(f'Total job time:   {total:6.2f} s')
+    print(f'Longest job:      {max(durations):6.2f} s')
+    print(f'Lower bound:      {lower_bound:6.2f} s')
+    print()
+
+    in_order = makespan(durations, opts.workers)
+    print(f'In order:         {in_order:6.2f} s')
+    costs = dict(enumerate(durations))
+    longest_first = makespan(durations, opts.workers, cost=costs)
+    print(f'Longest first:    {longest_first:6.2f} s')
+
+
+if __name__ == '__main__':
+    main()
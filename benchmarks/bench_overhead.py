@@ -0,0 +1,57 @@
+"""
+Measure the overhead of running each job, by running very many jobs that do
+nothing, and optionally check that the overhead is within a budget.
+
+Run this benchmark with::
+
+    python benchmarks/bench_overhead.py --jobs 1000000 --budget 10
+"""
+
+import argparse
+import sys
+import time
+
+import parq
+
+
+def no_op():
+    pass
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunksize', default='1000')
+    parser.add_argument('--stats', action='store_true')
+    parser.add_argument(
+        '--budget', type=float, help='the maximum overhead per job (µs)'
+    )
+    opts = parser.parse_args(args)
+    if opts.chunksize != 'auto':
+        opts.chunksize = int(opts.chunksize)
+
+    print(
+        f'{opts.jobs} jobs, {opts.workers} workers, '
+        f'chunksize = {opts.chunksize}, stats = {opts.stats}'
+    )
+    start = time.perf_counter()
+    result = parq.run(
+        no_op,
+        [()] * opts.jobs,
+        n_proc=opts.workers,
+        chunksize=opts.chunksize,
+        stats=opts.stats,
+    )
+    elapsed = time.perf_counter() - start
+    assert result
+    per_job = 1e6 * elapsed / opts.jobs
+    print(f'run time = {elapsed:6.2f} s    overhead = {per_job:6.2f} µs/job')
+    if opts.budget is not None and per_job > opts.budget:
+        print(f'Overhead exceeds the budget of {opts.budget} µs/job')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Measure the per-submission overhead of running many small batches of jobs
+with parq.run(), which spawns new worker processes for each batch, and with
+parq.Pool, which reuses the same worker processes.
+
+Run this benchmark with::
+
+    python benchmarks/bench_pool.py --submissions 200 --jobs 10 --workers 4
+"""
+
+import argparse
+import time
+
+import parq
+
+
+def cheap_job(x):
+    return x
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--submissions', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=4)
+    opts = parser.parse_args(args)
+
+    job_args = [(i,) for i in range(opts.jobs)]
+    print(
+        f'{opts.submissions} submissions of {opts.jobs} jobs, '
+        f'{opts.workers} workers'
+    )
+
+    start = time.perf_counter()
+    for _ in range(opts.submissions):
+        assert parq.run(cheap_job, job_args, n_proc=opts.workers)
+    run_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with parq.Pool(n_proc=opts.workers) as pool:
+        for _ in range(opts.submissions):
+            assert pool.run(cheap_job, job_args)
+    pool_time = time.perf_counter() - start
+
+    for name, total in [('parq.run()', run_time), ('parq.Pool', pool_time)]:
+        per_submission = 1e3 * total / opts.submissions
+        print(
+            f'{name:<12} total = {total:6.2f} s    '
+            f'per submission = {per_submission:7.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure the cost of returning large job results, with and without shared
+memory, by measuring the run time and the peak memory use of the main process.
+
+Run this benchmark once for each transport, because the peak memory use of a
+process never decreases::
+
+    python benchmarks/bench_results.py --jobs 100 --size 4
+    python benchmarks/bench_results.py --jobs 100 --size 4 --shared-memory
+"""
+
+import argparse
+import array
+import resource
+import time
+
+import parq
+
+
+def make_result(job_num, n_values):
+    return memoryview(array.array('d', [job_num]) * n_values)
+
+
+def make_bytes_result(job_num, n_values):
+    return make_result(job_num, n_values).tobytes()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=100)
+    parser.add_argument('--size', type=int, default=4, help='MiB per result')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--shared-memory', action='store_true')
+    opts = parser.parse_args(args)
+
+    n_values = opts.size * 1024 * 1024 // 8
+    job_args = [(i, n_values) for i in range(opts.jobs)]
+    print(
+        f'{opts.jobs} jobs with {opts.size} MiB results, '
+        f'{opts.workers} workers, shared memory = {opts.shared_memory}'
+    )
+
+    # NOTE: memoryview values cannot be pickled, so when results are sent
+    # through the result queue, each job returns a bytes value instead.
+    func = make_result if opts.shared_memory else make_bytes_result
+    start = time.perf_counter()
+    result = parq.run(
+        func,
+        job_args,
+        n_proc=opts.workers,
+        results=True,
+        shared_memory=opts.shared_memory,
+    )
+    run_time = time.perf_counter() - start
+    assert result
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'run time = {run_time:6.2f} s    peak RSS = {peak_rss:6.0f} MiB')
+
+
+if __name__ == '__main__':
+    main()
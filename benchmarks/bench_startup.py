@@ -0,0 +1,83 @@
+"""
+Measure the time from calling parq.run() until the first job starts, for
+each of the start methods that are supported on this platform.
+
+Each job imports the modules given by ``--preload``, which are imported by
+the main process before any jobs are run. Forked worker processes inherit
+these modules, spawned worker processes must import them, and worker
+processes that are forked from the fork server inherit them from the fork
+server.
+
+Run this benchmark with::
+
+    python benchmarks/bench_startup.py --workers 4 --preload numpy
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import statistics
+import time
+
+import parq
+
+
+def first_job(modules):
+    for name in modules:
+        importlib.import_module(name)
+    return time.time()
+
+
+def time_to_first_job(n_proc, modules, start_method, preload):
+    job_args = [(modules,)] * n_proc
+    start = time.time()
+    result = parq.run(
+        first_job,
+        job_args,
+        n_proc=n_proc,
+        results=True,
+        start_method=start_method,
+        preload=preload,
+    )
+    elapsed = time.time() - start
+    assert result
+    return (min(result.job_results.values()) - start, elapsed)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--preload', nargs='*', default=[])
+    opts = parser.parse_args(args)
+
+    modules = tuple(opts.preload)
+    for name in modules:
+        importlib.import_module(name)
+    methods = multiprocessing.get_all_start_methods()
+    print(f'{opts.workers} workers, {opts.repeat} runs per start method')
+    print(f'preloaded modules: {", ".join(modules) or "none"}')
+    print()
+    print('method         first job (ms)    best (ms)    run time (ms)')
+
+    for method in ['fork', 'spawn', 'forkserver']:
+        if method not in methods:
+            continue
+        # NOTE: the fork server only imports these modules when it is
+        # started, which is included in the first run.
+        preload = ['parq', *modules] if method == 'forkserver' else ()
+        times = [
+            time_to_first_job(opts.workers, modules, method, preload)
+            for _ in range(opts.repeat)
+        ]
+        first = 1e3 * times[0][0]
+        best = 1e3 * min(t for (t, _elapsed) in times)
+        run_time = 1e3 * statistics.mean(e for (_t, e) in times)
+        print(
+            f'{method:<10}    {first:14.1f}    {best:9.1f}    '
+            f'{run_time:13.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure the time taken to submit jobs whose arguments are large, by running
+jobs that do nothing and measuring the CPU time used by the main process.
+
+Run this benchmark with::
+
+    python benchmarks/bench_submit.py --jobs 2000 --size 5000
+"""
+
+import argparse
+import resource
+import time
+
+import parq
+
+
+def ignore_params(job_num, params):
+    pass
+
+
+def main_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--validate', default='all')
+    parser.add_argument('--repeats', type=int, default=3)
+    opts = parser.parse_args(args)
+
+    params = {f'param_{i}': float(i) for i in range(opts.size)}
+    job_args = [(i, params) for i in range(opts.jobs)]
+    print(
+        f'{opts.jobs} jobs with {opts.size} parameters, '
+        f'{opts.workers} workers, validate = {opts.validate}'
+    )
+
+    for _ in range(opts.repeats):
+        cpu_start = main_cpu_time()
+        start = time.perf_counter()
+        result = parq.run(
+            ignore_params,
+            job_args,
+            n_proc=opts.workers,
+            validate=opts.validate,
+        )
+        run_time = time.perf_counter() - start
+        cpu_time = main_cpu_time() - cpu_start
+        assert result
+        print(
+            f'run time = {run_time:6.2f} s    '
+            f'main process CPU = {cpu_time:6.2f} s'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,42 @@
 """A multi-process job queue."""
 
+import argparse
+import array
+import asyncio
+import collections.abc
 import ctypes
 import dataclasses
+import heapq
+import io
+import itertools
 import logging
+import math
 import multiprocessing
+import multiprocessing.connection
+import multiprocessing.resource_tracker
+import multiprocessing.shared_memory
 import multiprocessing.sharedctypes
+import operator
+import os
 import pickle
 import queue
 import signal
+import socket
 import sys
+import tempfile
+import threading
+import time
 import traceback
-from typing import Any, Callable, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 
 @dataclasses.dataclass
@@ -19,10 +45,26 @@ class WorkerConfig:
     in_queue: multiprocessing.Queue
     out_queue: multiprocessing.Queue
     stop_workers: multiprocessing.sharedctypes.Synchronized
+    chunk_slots: multiprocessing.sharedctypes.SynchronizedArray
     log_level: int
     fail_early: bool = True
     trace: bool = True
     collect_results: bool = False
+    shared_memory: bool = False
+    retry_on: Any = ()
+    stats: bool = False
+    task_id: int = 0
+    persistent: bool = False
+    initializer: Optional[Callable[..., None]] = None
+    initargs: tuple = ()
+    job_slots: Optional[multiprocessing.sharedctypes.SynchronizedArray] = None
+    start_times: Optional[multiprocessing.sharedctypes.SynchronizedArray] = (
+        None
+    )
+    retire: Optional[multiprocessing.sharedctypes.SynchronizedArray] = None
+    admit: Any = None
+    max_jobs: Optional[int] = None
+    local: bool = False
 
 
 @dataclasses.dataclass
@@ -35,8 +77,10 @@ class Result:
     :param job_count: The number of jobs that were submitted.
     :type job_count: int
     :param successful_jobs: A list that contains the arguments for each job
-        that was completed successfully.
-    :type successful_jobs: [Any]
+        that was completed successfully. This will be ``None`` if the
+        arguments were not retained (see the ``max_in_flight`` argument of
+        :func:`run`).
+    :type successful_jobs: Optional[[Any]]
     :param unsuccessful_jobs: A list that contains the arguments for each job
         that was not completed successfully.
     :type unsuccessful_jobs: [Any]
@@ -45,11 +89,25 @@ class Result:
     :type failed_worker_count: int
     :param job_results: An optional dictionary that maps successful job
        numbers to the returned results of those jobs. If results were not
-       collected, this will be ``None``.
-    :type job_results: Optional[Dict[int, Any]]
+       collected, this will be ``None``. If results were written to a file
+       (see the ``spill`` argument of :func:`run`), this will be a read-only
+       mapping that loads each result from the file when it is accessed, and
+       the file remains open until :meth:`close` is called.
+    :type job_results: Optional[Mapping[int, Any]]
+    :param attempts: A dictionary that maps job numbers to the number of times
+        that each job was run, for the jobs that were run more than once (see
+        the ``retries`` argument of :func:`run`).
+    :type attempts: Dict[int, int]
+    :param stats: The time spent in each phase and by each job, if these
+        were recorded (see the ``stats`` argument of :func:`run`).
+    :type stats: Optional[Stats]
+
+    The job numbers of the successful and unsuccessful jobs are available
+    from :meth:`successful_job_nums` and :meth:`unsuccessful_job_nums`.
 
     Instances are considered true if ``success`` is true, otherwise they are
-    considered false.
+    considered false. Instances can be used as context managers, which call
+    :meth:`close` on exit.
 
     >>> from parq import Result
     >>> res_good = Result(True, 0, [], [], 0)
@@ -60,10 +118,15 @@ class Result:
 
     success: bool
     job_count: int
-    successful_jobs: List[Any]
+    successful_jobs: Optional[List[Any]]
     unsuccessful_jobs: List[Any]
     failed_worker_count: int
-    job_results: Optional[Dict[int, Any]] = None
+    job_results: Optional[Mapping[int, Any]] = None
+    attempts: Dict[int, int] = dataclasses.field(default_factory=dict)
+    stats: Optional['Stats'] = None
+    _successful_job_nums: Optional['_JobBitmap'] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def __bool__(self):
         """
@@ -72,14 +135,184 @@ class Result:
         """
         return self.success
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the file that the job results were written to, if any (see the
+        ``spill`` argument of :func:`run`); these results can then no longer
+        be accessed. This has no effect if the results are held in memory.
+        """
+        if isinstance(self.job_results, _ResultStore):
+            self.job_results.close()
+
     def num_successful(self):
         """Return the number of jobs that were completed successfully."""
+        if self._successful_job_nums is not None:
+            return len(self._successful_job_nums)
+        if self.successful_jobs is None:
+            return self.job_count - len(self.unsuccessful_jobs)
         return len(self.successful_jobs)
 
     def num_unsuccessful(self):
         """Return the number of jobs that were not completed successfully."""
+        if self._successful_job_nums is not None:
+            return self.job_count - len(self._successful_job_nums)
         return len(self.unsuccessful_jobs)
 
+    def successful_job_nums(self):
+        """
+        Return an iterator over the numbers of the jobs that were completed
+        successfully, in ascending order.
+
+        :raises ValueError: if the job numbers were not recorded.
+        """
+        if self._successful_job_nums is None:
+            raise ValueError('Job numbers were not recorded')
+        return iter(self._successful_job_nums)
+
+    def unsuccessful_job_nums(self):
+        """
+        Return an iterator over the numbers of the jobs that were not
+        completed successfully, in ascending order.
+
+        :raises ValueError: if the job numbers were not recorded.
+        """
+        if self._successful_job_nums is None:
+            raise ValueError('Job numbers were not recorded')
+        return self._successful_job_nums.missing(self.job_count)
+
+
+@dataclasses.dataclass
+class Stats:
+    """
+    Describes where the time was spent when running a number of jobs.
+
+    All times are in seconds. The per-job times are recorded in the order
+    that the outcomes of each job were received.
+
+    :param phases: The time spent in each phase: adding the initial jobs to
+        the job queue (``'build'``), spawning the worker processes
+        (``'spawn'``), running the jobs and receiving their outcomes
+        (``'run'``), and waiting for the worker processes to exit
+        (``'join'``).
+    :type phases: Dict[str, float]
+    :param wall_times: The elapsed time of each job.
+    :type wall_times: Sequence[float]
+    :param cpu_times: The CPU time used by each job.
+    :type cpu_times: Sequence[float]
+    :param queue_wait_times: The time between adding each job to the job
+        queue and the job starting. This is empty for remote worker
+        processes (see :func:`run_remote`), whose clocks cannot be compared
+        with the clock of the main process.
+    :type queue_wait_times: Sequence[float]
+    :param transfer_times: The time between a worker process sending the
+        outcomes of a chunk of jobs and the main process receiving them. As
+        for ``queue_wait_times``, this is empty for remote worker processes.
+    :type transfer_times: Sequence[float]
+    :param jobs_per_worker: The number of jobs run by each worker process.
+    :type jobs_per_worker: Dict[int, int]
+
+    >>> from parq import Stats
+    >>> stats = Stats({'run': 2.0}, [0.1, 0.2, 0.3, 0.4], [], [], [], {0: 4})
+    >>> stats.jobs_per_second()
+    2.0
+    >>> stats.percentiles('wall_times', [50, 100])
+    {50: 0.2, 100: 0.4}
+    """
+
+    phases: Dict[str, float]
+    wall_times: Sequence[float]
+    cpu_times: Sequence[float]
+    queue_wait_times: Sequence[float]
+    transfer_times: Sequence[float]
+    jobs_per_worker: Dict[int, int]
+
+    def jobs_per_second(self):
+        """
+        Return the number of jobs that were run per second of the ``'run'``
+        phase, or ``None`` if no time was spent in this phase.
+        """
+        elapsed = self.phases.get('run', 0)
+        if elapsed <= 0:
+            return None
+        return len(self.wall_times) / elapsed
+
+    def percentiles(self, name='wall_times', qs=(50, 90, 99)):
+        """
+        Return a dictionary that maps each percentile in ``qs`` to the value
+        of that percentile of the named times (e.g., ``'wall_times'``), using
+        the nearest-rank method. The values are ``None`` if there are no
+        times.
+        """
+        values = sorted(getattr(self, name))
+        if not values:
+            return {q: None for q in qs}
+        n = len(values)
+        return {
+            q: values[min(n - 1, max(0, math.ceil(q / 100 * n) - 1))]
+            for q in qs
+        }
+
+
+@dataclasses.dataclass
+class Progress:
+    """
+    A snapshot of the progress of a number of jobs, which is passed to the
+    ``progress`` callback of :func:`run`.
+
+    :param completed: The number of jobs that were completed successfully,
+        including jobs that were completed before a run was resumed (see the
+        ``resume`` argument of :func:`run`).
+    :type completed: int
+    :param failed: The number of jobs that were not completed successfully.
+    :type failed: int
+    :param in_flight: The number of jobs that are queued or running.
+    :type in_flight: int
+    :param job_count: The total number of jobs, or ``None`` if this is not
+        yet known (see the ``max_in_flight`` argument of :func:`run`).
+    :type job_count: Optional[int]
+    :param elapsed: The time (in seconds) since the worker processes were
+        started.
+    :type elapsed: float
+    :param rate: The number of jobs that were completed or failed per second,
+        excluding jobs that were completed before a run was resumed.
+    :type rate: float
+    :param eta: The estimated time (in seconds) until every job is finished,
+        or ``None`` if this cannot be estimated.
+    :type eta: Optional[float]
+    :param worker_rss: The resident set size (in bytes) of each worker
+        process, or ``None`` for worker processes whose memory use cannot be
+        measured.
+    :type worker_rss: Dict[int, Optional[int]]
+    """
+
+    completed: int
+    failed: int
+    in_flight: int
+    job_count: Optional[int]
+    elapsed: float
+    rate: float
+    eta: Optional[float]
+    worker_rss: Dict[int, Optional[int]]
+
+
+def _process_rss(pid):
+    """
+    Return the resident set size (in bytes) of a process, or ``None`` if it
+    cannot be measured on this platform.
+    """
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
 
 def fails_to_pickle(item):
     """
@@ -125,247 +358,4796 @@ def fails_to_pickle(item):
     return False
 
 
-def _worker(config):
-    # Ignore the signal that raises KeyboardInterrupt exceptions; the main
-    # loop will handle this exception and ensure each process terminates.
-    signal.signal(signal.SIGINT, signal.SIG_IGN)
+class _JobBitmap:
+    """
+    A set of job numbers, stored as one bit per job so that the outcomes of
+    very many jobs can be recorded in a small amount of memory.
+
+    >>> job_nums = _JobBitmap()
+    >>> job_nums.update([9, 2, 3, 2])
+    >>> (len(job_nums), 3 in job_nums, 4 in job_nums)
+    (3, True, False)
+    >>> list(job_nums)
+    [2, 3, 9]
+    >>> list(job_nums.missing(6))
+    [0, 1, 4, 5]
+    """
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+
+    def add(self, job_num):
+        """Add a job number to this set."""
+        (ix, bit) = divmod(job_num, 8)
+        if ix >= len(self.bits):
+            self.bits.extend(bytes(ix + 1 - len(self.bits)))
+        mask = 1 << bit
+        if not self.bits[ix] & mask:
+            self.bits[ix] |= mask
+            self.count += 1
+
+    def update(self, job_nums):
+        """Add each of the job numbers to this set."""
+        # NOTE: this is equivalent to calling add() for each job number, but
+        # avoids a method call per job.
+        bits = self.bits
+        count = 0
+        for job_num in job_nums:
+            ix = job_num >> 3
+            if ix >= len(bits):
+                bits.extend(bytes(ix + 1 - len(bits)))
+            mask = 1 << (job_num & 7)
+            if not bits[ix] & mask:
+                bits[ix] |= mask
+                count += 1
+        self.count += count
+
+    def missing(self, job_count):
+        """
+        Return an iterator over the job numbers less than ``job_count`` that
+        are not in this set, in ascending order.
+        """
+        bits = self.bits
+        for ix in range((job_count + 7) // 8):
+            byte = bits[ix] if ix < len(bits) else 0
+            if byte == 0xFF:
+                # Skip every eight consecutive job numbers in this set.
+                continue
+            for job_num in range(8 * ix, min(8 * ix + 8, job_count)):
+                if not byte & (1 << (job_num & 7)):
+                    yield job_num
+
+    def __contains__(self, job_num):
+        (ix, bit) = divmod(job_num, 8)
+        return ix < len(self.bits) and bool(self.bits[ix] & (1 << bit))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for ix, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield 8 * ix + bit
+
+
+class _JobList(collections.abc.Sequence):
+    """
+    A sequence of job arguments that are looked up from the job table as they
+    are accessed, rather than being copied into a list.
+
+    :param table: The arguments for each job, indexed by job number.
+    :param job_nums: A function that returns an iterator over the job numbers
+        in this sequence, in ascending order.
+    :param length: The number of jobs in this sequence.
+
+    Indexing this sequence requires iterating over the job numbers, and so
+    iterating over the jobs is much more efficient than indexing each job.
+    """
+
+    def __init__(self, table, job_nums, length):
+        self.table = table
+        self.job_nums = job_nums
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        table = self.table
+        return (table[job_num] for job_num in self.job_nums())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('Job index out of range')
+        job_num = next(itertools.islice(self.job_nums(), index, None))
+        return self.table[job_num]
+
+    def __eq__(self, other):
+        if isinstance(other, collections.abc.Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _ResultStore(collections.abc.Mapping):
+    """
+    A read-only mapping from job numbers to job results, which are written to
+    a file as they are received and loaded from this file when accessed, so
+    that the results of very many jobs do not need to be held in memory.
+
+    Each result is pickled and appended to the file, and its offset is
+    recorded in an index of job numbers, which requires 8 bytes per job.
+
+    :param path: The path of the file, which is replaced if it exists, or
+        ``None`` to use a temporary file that is removed when it is closed.
+
+    The file is closed by :meth:`close`, or on leaving a ``with`` block.
+
+    >>> with _ResultStore() as store:
+    ...     store.update([(3, 'c'), (0, 'a')])
+    ...     (len(store), store[3], 1 in store, 'a' in store)
+    (2, 'c', False, False)
+    >>> store.file.closed
+    True
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            self.file = tempfile.TemporaryFile()
+        else:
+            self.file = open(path, 'w+b')
+        self.offsets = array.array('q')
+        self.count = 0
+        self.end = 0
+        self.reading = False
+
+    def update(self, items):
+        """Write each ``(job_num, result)`` item to the file."""
+        f = self.file
+        if self.reading:
+            f.seek(self.end)
+            self.reading = False
+        offsets = self.offsets
+        for job_num, result in items:
+            if job_num >= len(offsets):
+                size = max(job_num + 1 - len(offsets), len(offsets))
+                offsets.extend(itertools.repeat(-1, size))
+            if offsets[job_num] < 0:
+                self.count += 1
+            offsets[job_num] = self.end
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(data)
+            self.end += len(data)
+
+    def flush(self):
+        """Write any buffered results to the file."""
+        self.file.flush()
+
+    def close(self):
+        """Close the file; no more results can be loaded."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, job_num):
+        if job_num not in self:
+            raise KeyError(job_num)
+        self.file.seek(self.offsets[job_num])
+        self.reading = True
+        return pickle.load(self.file)
+
+    def __contains__(self, job_num):
+        return (
+            isinstance(job_num, int)
+            and 0 <= job_num < len(self.offsets)
+            and self.offsets[job_num] >= 0
+        )
+
+    def __iter__(self):
+        for job_num, offset in enumerate(self.offsets):
+            if offset >= 0:
+                yield job_num
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f'<{type(self).__name__}: {self.count} results>'
+
+
+@dataclasses.dataclass
+class _Task:
+    """
+    The settings for a single submission of jobs to a :class:`Pool`, which
+    are sent to the worker processes along with each chunk of jobs.
+
+    This provides the same job settings as :class:`WorkerConfig`, so that
+    the worker processes can use either one.
+    """
+
+    func: Callable[[Any], None]
+    task_id: int
+    fail_early: bool = True
+    trace: bool = True
+    collect_results: bool = False
+    shared_memory: bool = False
+    retry_on: Any = ()
+    stats: bool = False
+
+
+def _pickle_args(args):
+    """
+    Serialise the arguments for a single job, so that they can be sent to a
+    worker process.
+
+    :raises ValueError: if the arguments cannot be pickled. The invalid
+        values are identified by :func:`fails_to_pickle` and logged.
+    """
+    try:
+        return pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        fails_to_pickle(args)
+    raise ValueError(f'Invalid arguments: {args}')
+
+
+_VALIDATE_MODES = ['all', 'sample', 'on_failure']
+"""The supported job argument validation modes; see :func:`run`."""
+
+_VALIDATE_SAMPLE_SIZE = 16
+"""How many jobs have their arguments checked with ``validate='sample'``."""
+
+_DEFERRED_CHUNKS_PER_WORKER = 4
+"""
+The number of chunks per worker process that are added to the job queue
+before the worker processes are spawned, when job arguments are not all
+checked in advance (see :func:`run`); the arguments of the other jobs are
+pickled as these chunks are completed.
+"""
+
+
+_SHARED_MEMORY_MIN_SIZE = 64 * 1024
+"""
+The size (in bytes) of the smallest buffer in a job's result that is placed in
+a shared memory block, rather than being sent through the result queue.
+"""
+
+
+def _shared_memory_supported():
+    """
+    Return whether job results can be returned through shared memory blocks.
+
+    This requires POSIX shared memory, because the worker process closes each
+    block before the main process opens it.
+    """
+    return os.name == 'posix'
+
+
+def _shared_block_name(pid, task_id, job_num, index):
+    """
+    Return the name of a shared memory block that holds one buffer of a job's
+    result.
+
+    These names are short enough for every POSIX platform, and can be derived
+    by the main process if the worker process is terminated before it reports
+    the result.
+    """
+    return f'parq_{pid:x}_{task_id:x}_{job_num:x}_{index:x}'
+
+
+def _unlink_shared_block(name):
+    """
+    Remove a shared memory block, and return ``False`` if it does not exist.
+    """
+    try:
+        block = multiprocessing.shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    block.close()
+    block.unlink()
+    return True
+
+
+def _discard_shared_blocks(pid, task_id, job_nums):
+    """
+    Remove the shared memory blocks that a worker process created for the
+    results of these jobs, but which it did not report.
+    """
+    for job_num in job_nums:
+        for index in itertools.count():
+            name = _shared_block_name(pid, task_id, job_num, index)
+            if not _unlink_shared_block(name):
+                break
+
+
+class _SharedBlock(multiprocessing.shared_memory.SharedMemory):
+    """
+    A shared memory block whose contents remain mapped for as long as they
+    are referred to by a job result.
+    """
+
+    def close(self):
+        try:
+            super().close()
+        except BufferError:
+            # NOTE: the memory is still in use by a job result, and will be
+            # unmapped when the result is deallocated. We only need to close
+            # the file descriptor that was used to open the block.
+            # SharedMemory has no public way to do this; the private _mmap
+            # attribute and the order in which SharedMemory.close() releases
+            # the buffer, mmap, and file descriptor are the same in CPython
+            # 3.8 to 3.13. test_shared_block_close fails if this changes.
+            self._mmap = None
+            super().close()
+
+
+class _ResultPickler(pickle.Pickler):
+    """
+    Pickle job results so that large memoryviews can be sent out-of-band.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, memoryview) and obj.c_contiguous:
+            buf = pickle.PickleBuffer(obj)
+            return (_load_memoryview, (buf, obj.format, obj.shape))
+        return NotImplemented
+
+
+def _load_memoryview(buf, fmt, shape):
+    return memoryview(buf).cast('B').cast(fmt, shape)
+
+
+@dataclasses.dataclass
+class _SharedResult:
+    """
+    A job result whose large buffers have been placed in shared memory
+    blocks, so that only the names of these blocks are sent through the
+    result queue.
+
+    :param data: The pickled result, excluding the large buffers.
+    :param blocks: The name and buffer size of each shared memory block, in
+        the order that they are required to unpickle the result.
+    """
+
+    data: bytes
+    blocks: List[Tuple[str, int]]
+
+    @classmethod
+    def share(cls, result, task_id, job_num):
+        """
+        Pickle a job result with protocol 5, and place each large buffer in
+        its own shared memory block.
+        """
+        buffers = []
+
+        def out_of_band(buf):
+            try:
+                size = buf.raw().nbytes
+            except BufferError:
+                # Non-contiguous buffers are always pickled in-band.
+                return True
+            if size < _SHARED_MEMORY_MIN_SIZE:
+                return True
+            buffers.append(buf)
+            return False
+
+        # NOTE: bytes and bytearray values are always pickled in-band, so we
+        # send results of these types as a buffer and restore the type when
+        # the result is loaded.
+        if isinstance(result, (bytes, bytearray)):
+            value = (type(result), pickle.PickleBuffer(result))
+        else:
+            value = (None, result)
+        data = io.BytesIO()
+        pickler = _ResultPickler(
+            data, protocol=5, buffer_callback=out_of_band
+        )
+        pickler.dump(value)
+
+        shared = cls(data=data.getvalue(), blocks=[])
+        pid = os.getpid()
+        try:
+            for index, buf in enumerate(buffers):
+                raw = buf.raw()
+                name = _shared_block_name(pid, task_id, job_num, index)
+                block = multiprocessing.shared_memory.SharedMemory(
+                    name=name, create=True, size=raw.nbytes
+                )
+                shared.blocks.append((name, raw.nbytes))
+                block.buf[: raw.nbytes] = raw
+                block.close()
+        except BaseException:
+            shared.discard()
+            raise
+        return shared
+
+    def load(self):
+        """
+        Return the job result, whose large buffers refer directly to the
+        contents of the shared memory blocks.
+
+        Each block is removed as soon as it has been opened; its contents
+        remain available until the result is deallocated.
+        """
+        buffers = []
+        try:
+            for name, size in self.blocks:
+                block = _SharedBlock(name=name)
+                block.unlink()
+                buffers.append(block.buf[:size])
+        except BaseException:
+            self.discard()
+            raise
+        (cls, value) = pickle.loads(self.data, buffers=buffers)
+        if cls is not None:
+            value = cls(value)
+        return value
+
+    def discard(self):
+        """Remove the shared memory blocks without loading the result."""
+        for name, _size in self.blocks:
+            _unlink_shared_block(name)
+
+
+def _discard_results(completed):
+    """
+    Remove the shared memory blocks for job results that will not be loaded.
+    """
+    for item in completed:
+        if isinstance(item, tuple) and isinstance(item[1], _SharedResult):
+            item[1].discard()
+
+
+def _run_chunk(config, task, slot, chunk, logger, debug):
+    """
+    Run each job in a chunk, and return the message that reports the outcome
+    of each job, the number of jobs that were started, and whether every job
+    that was started either succeeded or may be run again.
+    """
+    key = chunk[0][0]
+    completed = []
+    failed = []
+    retryable = []
+    timings = [] if task.stats else None
+    # NOTE: jobs that are run in this process share its CPU time, and so we
+    # record the CPU time of the thread that runs each job.
+    cpu_time = time.thread_time if config.local else time.process_time
     status_ok = True
-    logger = multiprocessing.log_to_stderr(config.log_level)
+    stopping = False
     counter = 0
-
-    while True:
+    start = time.perf_counter()
+    for job_num, payload in chunk:
         if config.stop_workers.value:
-            logger.debug('Worker stopping early')
-            status_ok = False
+            if debug:
+                logger.debug('Worker stopping early')
+            stopping = True
             break
+        counter += 1
+        if config.job_slots is not None:
+            # NOTE: record when each job starts, so that the main process
+            # can kill this worker if the job exceeds the job timeout.
+            config.start_times[slot] = time.monotonic()
+            config.job_slots[slot] = job_num
+        if timings is not None:
+            job_start = time.monotonic()
+            cpu_start = cpu_time()
         try:
-            job_num, args = config.in_queue.get(block=False)
-            if job_num < 0:
-                break
-            counter += 1
-            logger.debug(f'Worker received job #{job_num}: {args}')
-            result = config.func(*args)
-            logger.debug(f'Worker finished job #{job_num}')
-            if config.collect_results:
-                config.out_queue.put((job_num, result), block=True)
+            # NOTE: the arguments of jobs that are run in this process are
+            # not pickled.
+            args = payload if config.local else pickle.loads(payload)
+            if debug:
+                logger.debug(f'Worker received job #{job_num}: {args}')
+            result = task.func(*args)
+            if debug:
+                logger.debug(f'Worker finished job #{job_num}')
+            if task.collect_results and task.shared_memory:
+                result = _SharedResult.share(result, task.task_id, job_num)
+        except Exception as e:
+            # NOTE: jobs that raise a retryable exception may be run
+            # again, so the main process decides whether the worker
+            # processes should stop.
+            retry = isinstance(e, task.retry_on)
+            stop = task.fail_early and not retry
+            # NOTE: signal other worker processes to stop before
+            # formatting the stack trace, so that they do not start any
+            # more jobs.
+            if stop:
+                with config.stop_workers.get_lock():
+                    config.stop_workers.value = True
+            if debug:
+                logger.debug('Worker caught an exception')
+            if task.trace:
+                logger.warning(traceback.format_exc())
+            failed.append(job_num)
+            if retry:
+                retryable.append(job_num)
             else:
-                config.out_queue.put(job_num, block=True)
-            logger.debug(f'Worker recorded job #{job_num}')
-        except queue.Empty:
-            logger.debug('Queue is empty')
+                status_ok = False
+            if stop:
+                if debug:
+                    logger.debug('Will stop workers early')
+                stopping = True
+                break
+            continue
+        finally:
+            if config.job_slots is not None:
+                config.job_slots[slot] = -1
+            if timings is not None:
+                timings.append(
+                    (
+                        job_num,
+                        job_start,
+                        time.monotonic() - job_start,
+                        cpu_time() - cpu_start,
+                    )
+                )
+        if task.collect_results:
+            completed.append((job_num, result))
+        else:
+            completed.append(job_num)
+    elapsed = time.perf_counter() - start
+    report = (
+        task.task_id,
+        slot,
+        key,
+        completed,
+        failed,
+        retryable,
+        stopping,
+        elapsed,
+        None if timings is None else (timings, time.monotonic()),
+    )
+    return (report, counter, status_ok)
+
+
+def _worker_logger(config):
+    """
+    Return the logger for a worker, which writes to stderr in worker
+    processes, and is this module's logger for workers in this process.
+    """
+    if config.local:
+        return logging.getLogger(__name__)
+    return multiprocessing.log_to_stderr(config.log_level)
+
+
+def _worker(config, slot):
+    if not config.local:
+        # Ignore the signal that raises KeyboardInterrupt exceptions; the
+        # main loop will handle this exception and ensure each process
+        # terminates.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    status_ok = True
+    logger = _worker_logger(config)
+    # NOTE: the logging level cannot change while the worker is running, so
+    # we check it once, rather than formatting debugging messages (and the
+    # arguments of each job) that would be discarded.
+    debug = logger.isEnabledFor(logging.DEBUG)
+    counter = 0
+
+    # NOTE: the initializer and its arguments are only provided once to each
+    # worker process (and are inherited rather than pickled, if the worker
+    # processes are forked), rather than being pickled for each job.
+    if config.initializer is not None:
+        try:
+            config.initializer(*config.initargs)
         except Exception:
-            logger.debug('Worker caught an exception')
+            # A worker that cannot be initialised cannot run any jobs, so
+            # we signal the other workers to stop.
+            with config.stop_workers.get_lock():
+                config.stop_workers.value = True
+            logger.debug('Worker initializer failed')
             if config.trace:
                 logger.warning(traceback.format_exc())
+            config.out_queue.put(slot, block=True)
+            sys.exit(1)
+
+    # NOTE: block until a chunk of jobs is available, rather than polling the
+    # queue. Polling consumes an entire CPU core for each idle worker, and
+    # contends for the queue's reader lock, which slows down every other
+    # worker.
+    #
+    # Blocking cannot prevent a worker from stopping early, because the main
+    # process adds one sentinel for each worker to the job queue once there
+    # are no more jobs, or as soon as the workers are asked to stop.
+    #
+    # Workers that belong to a Pool only exit when they receive a sentinel,
+    # and receive the job settings for each submission with each chunk.
+    retiring = False
+    while True:
+        # NOTE: wait while the worker processes are using too much memory,
+        # rather than taking another chunk of jobs, unless this worker is
+        # asked to retire.
+        if config.admit is not None:
+            while not config.admit.wait(_MEMORY_CHECK_INTERVAL):
+                if config.retire[slot]:
+                    break
+        if config.retire is not None and config.retire[slot]:
+            retiring = True
+            break
+        msg = config.in_queue.get(block=True)
+        if msg is None:
+            if config.stop_workers.value and not config.persistent:
+                logger.debug('Worker stopping early')
+                status_ok = False
+            break
+        (task, chunk) = msg
+        if task is None:
+            task = config
+
+        # NOTE: record which chunk this worker is running, so that the main
+        # process can identify the jobs that are lost if this worker is
+        # terminated unexpectedly.
+        config.chunk_slots[slot] = chunk[0][0]
+
+        # Run each job in this chunk, and report the outcomes in a single
+        # message once the chunk is finished.
+        (report, n_started, chunk_ok) = _run_chunk(
+            config, task, slot, chunk, logger, debug
+        )
+        counter += n_started
+        status_ok = status_ok and chunk_ok
+        config.out_queue.put(report, block=True)
+        config.chunk_slots[slot] = -1
+        if debug:
+            logger.debug(f'Worker recorded {len(report[3])} completed job(s)')
+        stopping = report[6]
+        if stopping and not config.persistent:
             status_ok = False
-            if config.fail_early:
-                logger.debug('Will stop workers early')
-                # NOTE: signal other worker processes to stop.
-                with config.stop_workers.get_lock():
-                    config.stop_workers.value = True
-                break
+            break
+        if config.max_jobs is not None and counter >= config.max_jobs:
+            retiring = True
+            break
 
+    if retiring:
+        logger.info(f'Worker retiring, {counter} jobs')
+        config.out_queue.put(('retired', slot), block=True)
+        return
     logger.debug('Worker sending sentinel')
-    if config.collect_results:
-        config.out_queue.put((-1, None), block=True)
-    else:
-        config.out_queue.put(-1, block=True)
+    config.out_queue.put(slot, block=True)
     logger.info(f'Worker exiting, {counter} jobs, success = {status_ok}')
-    if not status_ok:
+    if not status_ok and not config.persistent:
         sys.exit(1)
 
 
-def _build_job_queue(jobs):
-    job_q = multiprocessing.Queue()
-    job_table = {}
+_AUTO_CHUNKS_PER_WORKER = 4
+"""
+The number of chunks per worker process that are added to the job queue at a
+time, when the chunk size is adjusted automatically.
+"""
 
-    job_num = 0
-    for args in jobs:
-        if fails_to_pickle(args):
-            raise ValueError(f'Invalid arguments: {args}')
-        try:
-            job_q.put((job_num, args), block=False)
-        except queue.Full as e:
-            raise ValueError(f'Cannot add job {job_num} to the queue') from e
-        job_table[job_num] = args
-        job_num += 1
 
-    return job_q, job_num, job_table
+_IMAP_JOBS_PER_WORKER = 16
+"""
+The default number of jobs per worker process that can be queued, running, or
+waiting to be yielded by :func:`imap` and :func:`imap_unordered`.
+"""
 
 
-def _collect_successful_job_nums(workers, done_q, results, timeout):
+class _StatsRecorder:
     """
-    Collect all of the successful job numbers.
+    Record the time spent in each phase and by each job, and return them as a
+    :class:`Stats` instance.
 
-    :param workers: The worker processes.
-    :param done_q: The queue to which successful job numbers are written.
-    :param results: Whether ``done_q`` includes job results.
-    :param timeout: The optional timeout (in seconds) when polling for job
-        results; set to ``None`` to block until a result is received.
+    :param same_clock: Whether the worker processes run on this host, so
+        that the times they report can be compared with the times recorded
+        by this process. Otherwise, only the durations they measure are
+        recorded.
     """
-    logger = logging.getLogger(__name__)
-    successful_job_nums = set()
-    job_results = {} if results else None
-    killed_workers = set()
-    sentinels = 0
-    # NOTE: to avoid deadlocking when one or more worker processes terminates
-    # without first sending a sentinel, we need to monitor the processes and
-    # record how many have terminated unexpectedly.
-    #
-    # This means we cannot block indefinitely when waiting for job results.
-    # Instead, we must use a finite timeout so that we can monitor the worker
-    # processes on a regular basis.
-    #
-    # We assume that processes with non-zero exit codes have terminated
-    # unexpectedly, and that this occurred before the worker was able to send
-    # its sentinel.
-    while sentinels < (len(workers) - len(killed_workers)):
-        # Detect worker process that have terminated unexpectedly.
-        for worker in workers:
-            ex = worker.exitcode
-            if ex is not None and ex != 0:
-                killed_workers.add(worker)
-        # Retrieve as many successfully-completed jobs as possible.
-        try:
-            if results:
-                (job_num, result) = done_q.get(block=True, timeout=timeout)
-                if job_num >= 0:
-                    job_results[job_num] = result
-            else:
-                job_num = done_q.get(block=True, timeout=timeout)
-        except queue.Empty:
-            continue
-        if job_num < 0:
-            sentinels += 1
-            logger.debug(f'Received {sentinels} sentinel(s)')
-        else:
-            logger.debug(f'Received completed job #{job_num}')
-            successful_job_nums.add(job_num)
 
-    logger.debug(f'Received {len(successful_job_nums)} successful jobs')
-    return (successful_job_nums, job_results)
+    def __init__(self, same_clock=True):
+        self.same_clock = same_clock
+        self.phases = {}
+        self.wall_times = array.array('d')
+        self.cpu_times = array.array('d')
+        self.queue_wait_times = array.array('d')
+        self.transfer_times = array.array('d')
+        self.jobs_per_worker = {}
+        self.queued = {}
 
+    def phase(self, name, start):
+        """Record that a phase, which began at ``start``, has finished."""
+        self.phases[name] = time.perf_counter() - start
 
-def run(
-    func,
-    iterable,
-    n_proc,
-    fail_early=True,
-    trace=True,
-    level=None,
-    results=False,
-    timeout=10,
-):
-    """
-    Perform multiple jobs in parallel by spawning multiple processes.
+    def chunk_queued(self, key):
+        """Record that a chunk of jobs has been added to the job queue."""
+        self.queued[key] = time.monotonic()
 
-    :param func: The function that performs a single job.
-    :param iterable: A sequence of job arguments, represented as tuples and
-        *unpacked* before passing to ``func`` (i.e., ``func(*args)``).
-    :param n_proc: The number of processes to spawn.
-    :param fail_early: Whether to stop running jobs if one fails.
-    :param trace: Whether to print stack traces for jobs that raise an
-        exception.
-    :param level: The logging level for worker processes. By default, only
-        warnings and errors will be shown.
-    :param results: Whether to return the results of each job.
-    :param timeout: The optional timeout (in seconds) when polling for job
-        results. Set this to ``None`` to block until a result is received.
+    def chunk_reported(self, slot, key, timings, sent):
+        """
+        Record the times reported by a worker process for a chunk of jobs.
 
-    :returns: A :class:`Result` instance.
-    :rtype: parq.Result
+        :param slot: The worker process that ran the chunk.
+        :param key: The job number of the first job in the chunk.
+        :param timings: A ``(job_num, start, wall, cpu)`` tuple for each job.
+        :param sent: When the worker process sent these times.
+        """
+        received = time.monotonic()
+        queued = self.queued.pop(key, None)
+        if not self.same_clock:
+            queued = None
+        for _job_num, start, wall, cpu in timings:
+            self.wall_times.append(wall)
+            self.cpu_times.append(cpu)
+            if queued is not None:
+                self.queue_wait_times.append(start - queued)
+        if self.same_clock:
+            self.transfer_times.append(received - sent)
+        count = self.jobs_per_worker.get(slot, 0)
+        self.jobs_per_worker[slot] = count + len(timings)
+
+    def stats(self):
+        """Return the recorded times."""
+        return Stats(
+            phases=dict(self.phases),
+            wall_times=self.wall_times,
+            cpu_times=self.cpu_times,
+            queue_wait_times=self.queue_wait_times,
+            transfer_times=self.transfer_times,
+            jobs_per_worker=dict(sorted(self.jobs_per_worker.items())),
+        )
 
-    .. warning::
 
-       If a worker process is terminated unexpectedly (e.g., by running out
-       of memory) this function **will deadlock** if ``timeout`` is ``None``.
+class _ChunkSizer:
     """
-    # Note: we avoid using multiprocessing.Pool because it does not handle
-    # KeyboardInterrupt exceptions correctly. For details, see:
-    # http://bryceboe.com/2012/02/14/python-multiprocessing-pool-and-keyboardinterrupt-revisited/
-    logger = logging.getLogger(__name__)
-    if level is None:
-        level = logging.WARNING
-    job_q, n_jobs, job_table = _build_job_queue(iterable)
-    done_q = multiprocessing.Queue()
-    stop_workers = multiprocessing.Value(ctypes.c_bool, False)
-    workers = []
-    worker_config = WorkerConfig(
-        func=func,
-        in_queue=job_q,
-        out_queue=done_q,
-        stop_workers=stop_workers,
-        log_level=level,
+    Decide how many jobs to send to a worker process in a single message.
+
+    :param chunksize: Either a fixed positive number of jobs, or ``'auto'`` to
+        adjust the number of jobs so that each chunk takes approximately
+        ``interval`` seconds to complete.
+    :param interval: The target duration (in seconds) of each chunk.
+    :param max_size: The largest number of jobs in a single chunk.
+    :raises ValueError: if ``chunksize`` is not valid.
+    """
+
+    def __init__(self, chunksize, interval=0.1, max_size=None):
+        if chunksize == 'auto':
+            self.adaptive = True
+            self.size = 1
+        elif isinstance(chunksize, int) and chunksize > 0:
+            self.adaptive = False
+            self.size = chunksize
+        else:
+            raise ValueError(f'Invalid chunksize: {chunksize!r}')
+        self.interval = interval
+        self.max_size = max_size
+        self.time_per_job = None
+
+    def record(self, n_jobs, elapsed):
+        """
+        Record how long a chunk of jobs took to complete, and adjust the chunk
+        size accordingly.
+        """
+        if not self.adaptive or n_jobs == 0:
+            return
+        time_per_job = elapsed / n_jobs
+        if self.time_per_job is None:
+            self.time_per_job = time_per_job
+        else:
+            # NOTE: smooth the estimate so that one slow job does not cause
+            # the chunk size to collapse.
+            self.time_per_job = 0.75 * self.time_per_job + 0.25 * time_per_job
+        if self.time_per_job > 0:
+            ideal_size = int(self.interval / self.time_per_job)
+        else:
+            ideal_size = 2 * self.size
+        # Change the chunk size by no more than a factor of two at a time.
+        size = max(self.size // 2, min(2 * self.size, ideal_size))
+        if self.max_size is not None:
+            size = min(size, self.max_size)
+        self.size = max(1, size)
+
+
+_MEMORY_CHECK_INTERVAL = 0.1
+"""
+The time (in seconds) between checking the memory use of the worker
+processes, when it is limited; see :meth:`_JobRunner.check_memory`.
+"""
+
+_CHECKPOINT_SYNC_INTERVAL = 1.0
+"""
+The minimum time (in seconds) between writing the checkpoint file to disk, so
+that recording each chunk of jobs does not wait for the disk.
+"""
+
+_CHECKPOINT_BUFFER_SIZE = 1024 * 1024
+"""The size of the buffer for writing records to the checkpoint file."""
+
+_CHECKPOINT_MAGIC = b'parq-checkpoint-1\n'
+"""The bytes at the start of each checkpoint file, including its version."""
+
+
+class _Checkpoint:
+    """
+    An append-only file that records the job numbers (and, optionally, the
+    results) of the jobs that were completed successfully, so that a run that
+    was interrupted can be resumed without running these jobs again.
+
+    The file starts with ``_CHECKPOINT_MAGIC`` and a pickled header, which
+    records the number of jobs (or ``None``, if the jobs are taken from an
+    iterable as they are needed), so that a file that is not a checkpoint
+    file, or that was written for different jobs, is not resumed.
+
+    Each record is the pickled list of the jobs in a single chunk that were
+    completed successfully, which contains either job numbers or
+    ``(job_num, result)`` tuples. Records are written to a buffer, which is
+    flushed and synchronised to disk at most once every
+    ``_CHECKPOINT_SYNC_INTERVAL`` seconds, and when the checkpoint is closed.
+    A record that was only partially written is ignored, and is removed when
+    the checkpoint file is opened to append new records.
+
+    :param path: The path of the checkpoint file.
+    :param results: Whether to record the result of each job.
+    """
+
+    def __init__(self, path, results=False):
+        self.path = os.fspath(path)
+        self.results = results
+        self.file = None
+        self.last_sync = None
+        self.loaded = False
+        self.job_count = None
+        self.end = None
+
+    def load(self):
+        """
+        Read the jobs that were recorded in the checkpoint file, and return a
+        tuple ``(job_nums, results)``, where ``job_nums`` is a
+        :class:`_JobBitmap` and ``results`` maps job numbers to results.
+
+        When results are being recorded, jobs whose results were not recorded
+        are not included. The file is not modified; the end of the last
+        complete record is retained, so that :meth:`open` can remove any
+        partially-written record that follows it.
+
+        :raises ValueError: if the file is not a checkpoint file, or if a
+            record other than the last record cannot be read.
+        """
+        job_nums = _JobBitmap()
+        job_results = {}
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return (job_nums, job_results)
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                # NOTE: the file was created, but the header was never
+                # written to disk.
+                return (job_nums, job_results)
+            try:
+                if f.read(len(_CHECKPOINT_MAGIC)) != _CHECKPOINT_MAGIC:
+                    raise ValueError('missing header')
+                header = pickle.load(f)
+                self.job_count = header['job_count']
+            except Exception as e:
+                raise ValueError(
+                    f'Not a checkpoint file: {self.path!r}'
+                ) from e
+            self.loaded = True
+            end = f.tell()
+            while end < size:
+                try:
+                    chunk = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError):
+                    # NOTE: the last record was only partially written, and
+                    # so we ignore it.
+                    break
+                except Exception as e:
+                    raise ValueError(
+                        f'Cannot read checkpoint file: {self.path!r}'
+                    ) from e
+                end = f.tell()
+                for job in chunk:
+                    if isinstance(job, tuple):
+                        (job_num, result) = job
+                        job_results[job_num] = result
+                        job_nums.add(job_num)
+                    elif not self.results:
+                        job_nums.add(job)
+            self.end = end
+        return (job_nums, job_results)
+
+    def check_job_count(self, job_count):
+        """
+        Check that the loaded checkpoint file was written for the same
+        number of jobs.
+
+        :raises ValueError: if the number of jobs differs.
+        """
+        if self.job_count is not None and self.job_count != job_count:
+            raise ValueError(
+                f'Cannot resume a checkpoint of {self.job_count} jobs with '
+                f'{job_count} jobs'
+            )
+
+    def open(self, resume, job_count=None):
+        """
+        Open the checkpoint file for writing, and either append records to
+        the existing records (if ``resume`` is true) or remove them. When
+        appending, any partially-written record at the end of the file is
+        removed, so that new records follow the last complete record.
+
+        :param job_count: The number of jobs, if known, which is recorded in
+            the header of a new checkpoint file.
+        """
+        append = resume and self.loaded
+        mode = 'ab' if append else 'wb'
+        self.file = open(self.path, mode, buffering=_CHECKPOINT_BUFFER_SIZE)
+        if append:
+            self.file.truncate(self.end)
+        else:
+            self.file.write(_CHECKPOINT_MAGIC)
+            pickle.dump(
+                {'job_count': job_count},
+                self.file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        self.last_sync = time.monotonic()
+
+    def record(self, completed):
+        """
+        Record the jobs in a chunk that were completed successfully, which
+        are either job numbers or ``(job_num, result)`` tuples.
+        """
+        pickle.dump(completed, self.file, protocol=pickle.HIGHEST_PROTOCOL)
+        if time.monotonic() - self.last_sync >= _CHECKPOINT_SYNC_INTERVAL:
+            self.sync()
+
+    def watch(self, outcomes):
+        """
+        Record the successful jobs in each ``(completed, unsuccessful)``
+        outcome, and yield each outcome.
+        """
+        for outcome in outcomes:
+            if not isinstance(outcome, _Wait) and outcome[0]:
+                self.record(outcome[0])
+            yield outcome
+
+    def sync(self):
+        """Write the recorded jobs to disk."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        """Write the recorded jobs to disk and close the checkpoint file."""
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+
+class _JobFeeder:
+    """
+    Add chunks of jobs to the job queue as worker processes consume them, and
+    keep track of the jobs that are in flight (i.e., that have been added to
+    the job queue but have not yet been completed).
+
+    Once the initial chunks have been added by calling :meth:`fill`, the
+    remaining chunks can be added by a background thread (see :meth:`start`)
+    which waits for jobs to be completed whenever the limits on the number of
+    chunks or jobs in flight are reached.
+
+    :param job_q: The job queue.
+    :param jobs: An iterator over ``(job_num, args)`` tuples.
+    :param sizer: The :class:`_ChunkSizer` that decides the chunk size.
+    :param stop_workers: The flag that signals worker processes to stop.
+    :param max_chunks: The maximum number of chunks in flight, or ``None``.
+    :param max_in_flight: The maximum number of jobs in flight, or ``None``.
+    :param payloads: An optional dictionary that maps job numbers to the
+        pickled arguments for each job; the arguments for all other jobs are
+        pickled when they are added to the queue.
+    :param task: The :class:`_Task` to send with each chunk, if the jobs are
+        being run by a :class:`Pool`.
+    :param keep_args: Whether to retain the arguments of each job that is in
+        flight or was not completed, so that they can be returned by
+        :meth:`unsuccessful_jobs`. Otherwise, only the job numbers are
+        recorded.
+    :param job_table: The sequence of job arguments, if the jobs can be looked
+        up by job number.
+    :param hold_sentinels: Whether to wait until every chunk has been
+        reported before adding the sentinels to the job queue, because chunks
+        may be added back to the job queue (see :meth:`chunk_lost`).
+    :param retries: The number of times that each job may be run again, if it
+        raises a retryable exception or its worker process terminates.
+    :param recorder: The :class:`_StatsRecorder` that records when each chunk
+        was added to the job queue, if any.
+    :param skip: An optional :class:`_JobBitmap` of the jobs that were
+        already completed successfully (see :class:`_Checkpoint`). These jobs
+        are recorded as successful rather than being added to the job queue.
+    :param in_order: Whether ``jobs`` yields the jobs in order of increasing
+        job number.
+    :param pickle_args: Whether to pickle the arguments of each job before
+        adding it to the queue; the arguments of jobs that are run in this
+        process are added to the queue as they are.
+    """
+
+    def __init__(
+        self,
+        job_q,
+        jobs,
+        sizer,
+        stop_workers,
+        max_chunks=None,
+        max_in_flight=None,
+        payloads=None,
+        task=None,
+        keep_args=True,
+        job_table=None,
+        hold_sentinels=False,
+        retries=0,
+        recorder=None,
+        skip=None,
+        in_order=True,
+        pickle_args=True,
+    ):
+        self.job_q = job_q
+        self.task = task
+        self.on_finish = None
+        self.jobs = jobs
+        self.sizer = sizer
+        self.stop_workers = stop_workers
+        self.max_chunks = max_chunks
+        self.max_in_flight = max_in_flight
+        self.payloads = {} if payloads is None else payloads
+        self.keep_args = keep_args
+        self.job_table = job_table
+        self.hold_sentinels = hold_sentinels
+        self.retries = retries
+        self.recorder = recorder
+        self.in_order = in_order
+        self.pickle_args = pickle_args
+        self.attempts = {}
+        self.n_proc = 0
+        self.job_count = 0
+        self.n_in_flight = 0
+        self.in_flight = {}
+        self.chunks = {}
+        self.successful = _JobBitmap()
+        self.unsuccessful = {}
+        self.n_unsuccessful = 0
+        self.n_skipped = 0
+        self.failed_workers = set()
+        self.held = 0
+        self.exhausted = False
+        self.finished = False
+        self.closed = False
+        self.error = None
+        self.cond = threading.Condition()
+        self.thread = None
+        if skip:
+            self.jobs = self._skip(jobs, skip)
+
+    def _skip(self, jobs, skip):
+        """
+        Yield each job that was not already completed, and record the other
+        jobs as successful.
+        """
+        skipped = []
+        for job in jobs:
+            if job[0] in skip:
+                skipped.append(job[0])
+                continue
+            if skipped:
+                self._record_skipped(skipped)
+                skipped = []
+            yield job
+        self._record_skipped(skipped)
+
+    def _record_skipped(self, job_nums):
+        with self.cond:
+            self.successful.update(job_nums)
+            self.job_count += len(job_nums)
+            self.n_skipped += len(job_nums)
+
+    def _space(self):
+        """
+        Return the number of jobs that can be added to the queue without
+        exceeding the limits on the number of chunks and jobs in flight.
+        """
+        if (
+            self.max_chunks is not None
+            and len(self.chunks) >= self.max_chunks
+        ):
+            return 0
+        if self.max_in_flight is None:
+            return self.sizer.size
+        space = self.max_in_flight - self.n_in_flight - self.held
+        return max(0, min(space, self.sizer.size))
+
+    def _wait_for_space(self, block):
+        """
+        Return the number of jobs that can be added to the queue, or zero if
+        no more jobs should be added.
+
+        :param block: Whether to wait until jobs are completed, if the queue
+            is currently full.
+        """
+        with self.cond:
+            while True:
+                if self.closed or self.stop_workers.value:
+                    return 0
+                space = self._space()
+                if space > 0 or not block:
+                    return space
+                self.cond.wait()
+
+    def _add_chunk(self, size):
+        """
+        Add a chunk of up to ``size`` jobs to the queue, and return ``False``
+        if there were no more jobs.
+
+        :raises ValueError: if a job's arguments cannot be pickled, or if the
+            chunk cannot be added to the queue.
+        """
+        chunk = list(itertools.islice(self.jobs, size))
+        if not chunk:
+            self.exhausted = True
+            return False
+        # NOTE: the arguments are sent to the worker processes as pickled
+        # bytes, so that they are only pickled once, and any arguments that
+        # cannot be pickled are reported here.
+        payloads = self.payloads
+        if self.pickle_args:
+            msg_chunk = [
+                (job_num, payloads.pop(job_num, None) or _pickle_args(args))
+                for (job_num, args) in chunk
+            ]
+        else:
+            msg_chunk = chunk
+        # NOTE: record these jobs before adding them to the queue, so that
+        # they can be completed before this method returns.
+        key = chunk[0][0]
+        n_jobs = len(chunk)
+        if self.in_order and chunk[-1][0] == key + n_jobs - 1:
+            # Record consecutive job numbers without creating a list.
+            job_nums = range(key, key + n_jobs)
+        else:
+            job_nums = [job_num for (job_num, _args) in chunk]
+        with self.cond:
+            self.chunks[key] = job_nums
+            if self.keep_args:
+                self.in_flight.update(chunk)
+            self.n_in_flight += n_jobs
+            self.job_count += n_jobs
+            if self.recorder is not None:
+                self.recorder.chunk_queued(key)
+        try:
+            self.job_q.put((self.task, msg_chunk), block=False)
+        except queue.Full as e:
+            raise ValueError(f'Cannot add job {key} to the queue') from e
+        return True
+
+    def fill(self, block=False):
+        """
+        Add chunks of jobs to the job queue until the limits on the number of
+        chunks and jobs in flight are reached.
+
+        :param block: Whether to wait for jobs to be completed, and continue
+            adding chunks until there are no more jobs.
+        :returns: ``True`` if there are no more jobs to add.
+        """
+        while not self.exhausted:
+            space = self._wait_for_space(block)
+            if space == 0 or not self._add_chunk(space):
+                break
+        return self.exhausted
+
+    def start(self):
+        """
+        Add the remaining jobs to the queue in a background thread, followed
+        by one sentinel for each worker.
+        """
+        self.thread = threading.Thread(
+            target=self._feed, name='parq-feeder', daemon=True
+        )
+        self.thread.start()
+
+    def _feed(self):
+        try:
+            self.fill(block=True)
+        except Exception as e:
+            # Record the exception so that it can be raised in the main
+            # thread, and stop the worker processes.
+            self.error = e
+            with self.stop_workers.get_lock():
+                self.stop_workers.value = True
+        finally:
+            self.finish()
+
+    def close(self):
+        """Stop adding jobs to the queue and wait for the thread to finish."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+
+    def wake(self):
+        """Wake the background thread, if it is waiting for free space."""
+        with self.cond:
+            self.cond.notify_all()
+
+    def finish(self):
+        """Add one sentinel for each worker to the job queue."""
+        with self.cond:
+            if self.finished:
+                return
+            while self.hold_sentinels and self.chunks:
+                if self.closed or self.stop_workers.value:
+                    break
+                self.cond.wait()
+            self.finished = True
+        for _ in range(self.n_proc):
+            self.job_q.put(None, block=False)
+        if self.on_finish is not None:
+            self.on_finish()
+
+    @property
+    def stopped(self):
+        """Whether the worker processes were asked to stop early."""
+        return bool(self.stop_workers.value)
+
+    def all_done(self):
+        """
+        Return ``True`` if there are no more jobs to add, and every chunk has
+        been completed or lost.
+        """
+        with self.cond:
+            return self.finished and not self.chunks
+
+    def chunk_done(self, key, completed, elapsed, retryable=()):
+        """
+        Record that a worker process has finished a chunk of jobs, and return
+        the job numbers in this chunk that were not completed successfully.
+
+        :param key: The job number of the first job in the chunk.
+        :param completed: The job numbers that were completed successfully.
+        :param elapsed: The time (in seconds) taken to run the chunk.
+        :param retryable: The job numbers that raised a retryable exception;
+            these jobs are added back to the job queue if they may be run
+            again.
+        :returns: The unsuccessful job numbers, or ``None`` if this chunk was
+            already recorded as lost.
+        """
+        with self.cond:
+            job_nums = self.chunks.pop(key, None)
+            if job_nums is None:
+                # NOTE: this chunk was recorded as lost, because the worker
+                # was terminated after it reported the outcomes, and so we
+                # ignore these outcomes.
+                return None
+            self.successful.update(completed)
+            retry = {
+                job_num for job_num in retryable if self._run_again(job_num)
+            }
+            unsuccessful = []
+            if len(completed) < len(job_nums):
+                for job_num in job_nums:
+                    if job_num in retry:
+                        continue
+                    args = self.in_flight.pop(job_num, None)
+                    if job_num not in self.successful:
+                        if self.keep_args:
+                            self.unsuccessful[job_num] = args
+                        unsuccessful.append(job_num)
+            elif self.keep_args:
+                # NOTE: every job in this chunk was completed, which is the
+                # common case, so there is no need to check each job.
+                for job_num in job_nums:
+                    del self.in_flight[job_num]
+            self.n_in_flight -= len(job_nums) - len(retry)
+            self.n_unsuccessful += len(unsuccessful)
+            self.sizer.record(len(job_nums), elapsed)
+            msg = self._requeue(sorted(retry))
+            self.cond.notify_all()
+        if msg is not None:
+            self.job_q.put(msg, block=False)
+        return unsuccessful
+
+    def chunk_lost(self, key, job_num=None):
+        """
+        Record that a worker process terminated unexpectedly while running a
+        chunk of jobs, and return the job numbers in this chunk that were not
+        completed successfully.
+
+        If the job that the worker process was running is known, the other
+        jobs in this chunk are added back to the job queue, unless the worker
+        processes have been asked to stop. Jobs that were running are also
+        added back to the job queue, if they may be run again.
+
+        :param key: The job number of the first job in the chunk.
+        :param job_num: The job number of the job that the worker process was
+            running, if known.
+        """
+        with self.cond:
+            job_nums = self.chunks.pop(key, None)
+            if job_nums is None:
+                return []
+            if self.stop_workers.value:
+                retry = []
+            elif job_num is not None and job_num in job_nums:
+                retry = [n for n in job_nums if n != job_num]
+                if self._run_again(job_num):
+                    retry.append(job_num)
+            else:
+                retry = [n for n in job_nums if self._run_again(n)]
+            retry_set = set(retry)
+            lost = [n for n in job_nums if n not in retry_set]
+            for n in lost:
+                args = self.in_flight.pop(n, None)
+                if self.keep_args:
+                    self.unsuccessful[n] = args
+            self.n_in_flight -= len(lost)
+            self.n_unsuccessful += len(lost)
+            msg = self._requeue(sorted(retry))
+            self.cond.notify_all()
+        if msg is not None:
+            self.job_q.put(msg, block=False)
+        return lost
+
+    def _run_again(self, job_num):
+        """
+        Return whether an unsuccessful job may be run again, and if so, record
+        another attempt. This must be called while holding ``self.cond``.
+        """
+        if self.stop_workers.value or self.closed:
+            return False
+        attempts = self.attempts.get(job_num, 1)
+        if attempts > self.retries:
+            return False
+        self.attempts[job_num] = attempts + 1
+        return True
+
+    def _requeue(self, job_nums):
+        """
+        Record a new chunk for jobs that will be run again, and return the
+        message that adds this chunk to the job queue, or ``None`` if there
+        are no jobs. This must be called while holding ``self.cond``.
+        """
+        if not job_nums:
+            return None
+        if self.keep_args:
+            jobs = [(n, self.in_flight[n]) for n in job_nums]
+        else:
+            jobs = [(n, self.job_table[n]) for n in job_nums]
+        self.chunks[job_nums[0]] = job_nums
+        if self.recorder is not None:
+            self.recorder.chunk_queued(job_nums[0])
+        if not self.pickle_args:
+            return (self.task, jobs)
+        msg_chunk = [(n, _pickle_args(args)) for (n, args) in jobs]
+        return (self.task, msg_chunk)
+
+    def hold(self, n_jobs):
+        """
+        Record that the results of ``n_jobs`` completed jobs are being held in
+        memory, and count them as jobs in flight.
+        """
+        with self.cond:
+            self.held += n_jobs
+
+    def release(self, n_jobs):
+        """
+        Record that the results of ``n_jobs`` completed jobs are no longer
+        being held in memory.
+        """
+        with self.cond:
+            self.held -= n_jobs
+            self.cond.notify_all()
+
+    def unsuccessful_jobs(self):
+        """
+        Return the arguments of every job that was not completed, including
+        jobs that remain in the queue, ordered by job number.
+        """
+        with self.cond:
+            jobs = dict(self.unsuccessful)
+            jobs.update(self.in_flight)
+        return [jobs[job_num] for job_num in sorted(jobs)]
+
+
+def _build_job_queue(jobs, job_q=None, validate='all', skip=()):
+    if job_q is None:
+        job_q = multiprocessing.Queue()
+    # NOTE: the arguments for each job are retained in a list (or in the
+    # original sequence), rather than in a dictionary, which requires much
+    # less memory when there are very many jobs.
+    if isinstance(jobs, collections.abc.Sequence):
+        job_table = jobs
+    else:
+        job_table = list(jobs)
+    job_num = len(job_table)
+
+    # Pickle the arguments for each job now, so that invalid arguments are
+    # reported before any jobs are run. The pickled arguments are retained,
+    # so that each job's arguments are only pickled once.
+    if validate == 'all':
+        payloads = {
+            job_num: _pickle_args(args)
+            for (job_num, args) in enumerate(job_table)
+            if job_num not in skip
+        }
+    elif validate == 'sample':
+        step = max(1, job_num // _VALIDATE_SAMPLE_SIZE)
+        payloads = {
+            job_num: _pickle_args(job_table[job_num])
+            for job_num in range(0, job_num, step)
+            if job_num not in skip
+        }
+    else:
+        payloads = {}
+
+    return job_q, job_num, job_table, payloads
+
+
+def _job_estimate(estimate, job_num, args):
+    """
+    Return the estimated priority or cost of a job (see :func:`_order_jobs`).
+    """
+    if estimate is None:
+        return 0
+    if isinstance(estimate, collections.abc.Mapping):
+        return estimate.get(job_num, 0)
+    return estimate(*args)
+
+
+def _order_jobs(job_table, priority=None, cost=None):
+    """
+    Yield the job number and arguments of each job in order of decreasing
+    priority, and then in order of decreasing cost, so that the jobs that are
+    expected to take longest are started first. Jobs with the same priority
+    and cost are yielded in order of job number.
+
+    :param job_table: The sequence of job arguments.
+    :param priority: A function that returns the priority of a job, given its
+        arguments, or a mapping from job numbers to priorities.
+    :param cost: A function that returns the expected cost of a job, given
+        its arguments, or a mapping from job numbers to costs.
+    """
+    heap = [
+        (
+            -_job_estimate(priority, job_num, args),
+            -_job_estimate(cost, job_num, args),
+            job_num,
+        )
+        for (job_num, args) in enumerate(job_table)
+    ]
+    heapq.heapify(heap)
+    while heap:
+        job_num = heapq.heappop(heap)[2]
+        yield (job_num, job_table[job_num])
+
+
+_ENGINES = ['queue', 'pipes']
+"""The supported ways of sending jobs to worker processes; see :func:`run`."""
+
+_BACKENDS = ['process', 'thread', 'serial', 'auto']
+"""The supported ways of running jobs; see :func:`run`."""
+
+_PIPE_CHUNKS_PER_WORKER = 16
+"""
+The maximum number of chunks that are sent to each worker process at a time,
+when each worker process has its own job queue.
+"""
+
+
+def _get_context(start_method=None, preload=()):
+    """
+    Return the :mod:`multiprocessing` context for a start method, and set the
+    modules that the fork server imports before it forks each worker process.
+
+    :raises ValueError: if the start method is not supported, or if modules
+        are preloaded for any start method other than ``'forkserver'``.
+    """
+    if (
+        start_method is not None
+        and start_method not in multiprocessing.get_all_start_methods()
+    ):
+        raise ValueError(f'Invalid start_method: {start_method!r}')
+    if start_method is None:
+        # NOTE: the default context provides the same methods as the module.
+        context = multiprocessing
+    else:
+        context = multiprocessing.get_context(start_method)
+    if preload:
+        if context.get_start_method() != 'forkserver':
+            raise ValueError('Modules can only be preloaded by a fork server')
+        # NOTE: the fork server imports the main module by default, and each
+        # worker process requires this module.
+        context.set_forkserver_preload(['__main__', __name__, *preload])
+    return context
+
+
+def _check_func(func, context):
+    """
+    Check that the job function can be sent to the worker processes.
+
+    :raises ValueError: if the function cannot be pickled, and the worker
+        processes are not forked.
+    """
+    if context.get_start_method() == 'fork':
+        return
+    try:
+        pickle.dumps(func)
+    except Exception as e:
+        raise ValueError(f'Invalid function: {func}') from e
+
+
+def _start_process(proc):
+    """
+    Start a worker process, and defer any SIGINT that is received until the
+    worker process has started.
+
+    Python ignores exceptions raised by the handlers that run after forking
+    a process (such as those registered by :mod:`logging`), and so a
+    KeyboardInterrupt raised in one of these handlers would be lost.
+    """
+    handler = signal.getsignal(signal.SIGINT)
+    main_thread = threading.current_thread() is threading.main_thread()
+    if not (main_thread and callable(handler)):
+        proc.start()
+        return
+    received = []
+    signal.signal(signal.SIGINT, lambda signum, frame: received.append(frame))
+    try:
+        proc.start()
+    finally:
+        signal.signal(signal.SIGINT, handler)
+    if received:
+        handler(signal.SIGINT, received[0])
+
+
+class _ThreadValue:
+    """
+    A value that is shared by the threads of this process, which provides the
+    same interface as :func:`multiprocessing.Value`.
+    """
+
+    def __init__(self, value):
+        self.value = value
+        self.lock = threading.Lock()
+
+    def get_lock(self):
+        return self.lock
+
+
+class _ThreadQueue:
+    """
+    A queue that passes objects between the threads of this process without
+    pickling them, which provides the parts of the
+    :class:`multiprocessing.Queue` interface that are used to run jobs.
+
+    As for :class:`multiprocessing.Queue`, the ``_reader`` connection can be
+    waited on (see :func:`multiprocessing.connection.wait`), and is ready
+    while the queue is not empty.
+    """
+
+    def __init__(self):
+        self.items = collections.deque()
+        self.cond = threading.Condition()
+        (self._reader, self.writer) = multiprocessing.Pipe(duplex=False)
+
+    def put(self, obj, block=True):
+        with self.cond:
+            # NOTE: only send a message when the queue becomes non-empty, so
+            # that the reader is ready exactly while there are items.
+            if not self.items:
+                self.writer.send_bytes(b'')
+            self.items.append(obj)
+            self.cond.notify()
+
+    def get(self, block=True):
+        with self.cond:
+            while not self.items:
+                if not block:
+                    raise queue.Empty
+                self.cond.wait()
+            obj = self.items.popleft()
+            if not self.items:
+                self._reader.recv_bytes()
+            return obj
+
+
+class _WorkerThread(threading.Thread):
+    """
+    A worker that runs in a thread of this process, which provides the parts
+    of the :class:`multiprocessing.Process` interface that are used to manage
+    worker processes.
+
+    The :attr:`sentinel` connection is ready once the thread has finished, and
+    :attr:`exitcode` records how it finished, as for a worker process.
+    Threads cannot be terminated, and so :meth:`terminate` and :meth:`kill`
+    have no effect.
+    """
+
+    def __init__(self, target, args, name, daemon=False):
+        # NOTE: a thread that is running a job cannot be stopped, and so
+        # should not prevent the interpreter from exiting.
+        super().__init__(target=target, args=args, name=name, daemon=True)
+        (self.sentinel, self.exited) = multiprocessing.Pipe(duplex=False)
+        self.exitcode = None
+        self.pid = os.getpid()
+
+    def run(self):
+        try:
+            super().run()
+            self.exitcode = 0
+        except SystemExit as e:
+            self.exitcode = 0 if e.code is None else e.code
+        except BaseException:
+            traceback.print_exc()
+            self.exitcode = 1
+        finally:
+            self.exited.close()
+
+    def terminate(self):
+        pass
+
+    def kill(self):
+        pass
+
+
+class _ThreadContext:
+    """
+    Create the queues, shared values, and workers that run jobs in threads of
+    this process, in place of a :mod:`multiprocessing` context.
+    """
+
+    Event = threading.Event
+    Process = _WorkerThread
+    Queue = _ThreadQueue
+
+    @staticmethod
+    def Value(typecode, value):
+        return _ThreadValue(value)
+
+    @staticmethod
+    def RawArray(typecode, size):
+        return [0] * size
+
+
+class _PipeWriter:
+    """
+    Send messages through a pipe, using the same method as a queue, so that
+    worker processes can report their outcomes through either one.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def put(self, obj, block=True):
+        self.conn.send(obj)
+
+
+class _PipeReader:
+    """
+    Receive messages through a connection, using the same method as a queue,
+    so that remote worker processes can receive chunks of jobs through their
+    connection to the main process.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get(self, block=True):
+        return self.conn.recv()
+
+
+class _ConnectionQueue:
+    """
+    Send messages through a connection in a background thread, using the
+    same method as a queue, so that sending a message never blocks the
+    caller (as for :class:`multiprocessing.Queue`).
+
+    Messages that cannot be sent because the connection was closed are
+    discarded; the collector detects that the connection was closed.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.pending = queue.SimpleQueue()
+        self.thread = threading.Thread(
+            target=self._send, name='parq-sender', daemon=True
+        )
+        self.thread.start()
+
+    def put(self, obj, block=True):
+        self.pending.put(obj)
+
+    def _send(self):
+        while True:
+            obj = self.pending.get()
+            if obj is _ConnectionQueue:
+                return
+            try:
+                self.conn.send(obj)
+            except OSError:
+                return
+
+    def close(self):
+        """Stop sending messages once the pending messages have been sent."""
+        self.pending.put(_ConnectionQueue)
+
+
+class _WorkerPipes:
+    """
+    Send chunks of jobs to each worker process through its own job queue, and
+    receive the outcomes through its own pipe, so that the worker processes do
+    not contend for the locks of a single job queue and result queue.
+
+    This provides the ``put`` method of a queue, so that it can be used by a
+    :class:`_JobFeeder`. Each chunk is sent to the worker process with the
+    fewest chunks in flight. The chunks that were sent to a worker process
+    are retained until they are reported, so that they can be sent to another
+    worker process if this worker process exits before running them, and so
+    the sentinels are only sent once every chunk has been reported.
+
+    :param n_proc: The number of worker processes.
+    :param context: The :mod:`multiprocessing` context.
+    """
+
+    def __init__(self, n_proc, context=multiprocessing):
+        self.n_proc = n_proc
+        self.job_qs = [context.Queue() for _ in range(n_proc)]
+        self.readers = []
+        self.in_flight = [{} for _ in range(n_proc)]
+        self.held = []
+        self.exited = set()
+        self.finishing = False
+        self.finished = False
+        self.lock = threading.Lock()
+        self.waker = None
+
+    def resize(self, n_proc):
+        """Reduce the number of worker processes, before they are spawned."""
+        self.n_proc = n_proc
+        for job_q in self.job_qs[n_proc:]:
+            job_q.close()
+        del self.job_qs[n_proc:]
+        del self.in_flight[n_proc:]
+
+    def accepting(self):
+        """Return whether more worker processes may connect."""
+        return False
+
+    def _available_slots(self):
+        """
+        Return the worker processes that chunks may be sent to. This must be
+        called while holding ``self.lock``.
+        """
+        slots = [
+            slot
+            for slot in range(len(self.job_qs))
+            if slot not in self.exited
+        ]
+        return slots or range(len(self.job_qs))
+
+    def put(self, msg, block=False):
+        """
+        Add a chunk of jobs to a worker's job queue, or add a sentinel to
+        every worker's job queue once every chunk has been reported.
+        """
+        if msg is None:
+            with self.lock:
+                self.finishing = True
+            self._send_sentinels()
+            return
+        with self.lock:
+            slot = self._assign(msg)
+        if slot is not None:
+            self.job_qs[slot].put(msg, block=block)
+
+    def _assign(self, msg):
+        """
+        Record that a chunk of jobs is in flight for the worker process with
+        the fewest chunks in flight, and return its slot, or hold this chunk
+        and return ``None`` if no worker process is available. This must be
+        called while holding ``self.lock``.
+        """
+        slots = self._available_slots()
+        if not slots:
+            # NOTE: hold this chunk until a worker process is available.
+            self.held.append(msg)
+            return None
+        slot = min(slots, key=lambda slot: len(self.in_flight[slot]))
+        (_task, chunk) = msg
+        self.in_flight[slot][chunk[0][0]] = msg
+        return slot
+
+    def _send_sentinels(self):
+        with self.lock:
+            if self.held or any(self.in_flight):
+                return
+            if not self.finishing or self.finished:
+                return
+            self.finished = True
+        for job_q in self.job_qs:
+            job_q.put(None)
+
+    def worker_config(self, config, slot):
+        """
+        Return the settings for a worker process, which refer to its own job
+        queue and result pipe.
+
+        The parent process must call :meth:`worker_started` once the worker
+        process has been started.
+        """
+        (reader, writer) = multiprocessing.Pipe(duplex=False)
+        if slot < len(self.readers):
+            # This worker process replaces one that was killed.
+            self.readers[slot] = reader
+        else:
+            self.readers.append(reader)
+        return dataclasses.replace(
+            config, in_queue=self.job_qs[slot], out_queue=_PipeWriter(writer)
+        )
+
+    def worker_started(self, config):
+        """
+        Close this process's copy of a worker's result pipe, so that it is
+        only held open by the worker process.
+        """
+        config.out_queue.conn.close()
+
+    def chunk_done(self, slot, key):
+        """Record that a worker process has reported a chunk of jobs."""
+        with self.lock:
+            self.in_flight[slot].pop(key, None)
+        self._send_sentinels()
+
+    def worker_exited(self, slot, running_key, resend=True, finished=False):
+        """
+        Record that a worker process has exited, and return the keys of the
+        chunks that were sent to this worker but were not reported.
+
+        :param slot: The worker process that exited.
+        :param running_key: The key of the chunk that this worker was
+            running, or a negative number if it was not running a chunk.
+        :param resend: Whether to send the chunks that this worker had not
+            started to the other worker processes. Otherwise, these chunks
+            are also returned.
+        :param finished: Whether this worker sent a sentinel before it
+            exited, in which case it was not running a chunk.
+        """
+        if finished:
+            running_key = -1
+        with self.lock:
+            self.exited.add(slot)
+            chunks = self.in_flight[slot]
+            self.in_flight[slot] = {}
+            if len(self.exited) == self.n_proc:
+                resend = False
+        lost = []
+        for key, msg in sorted(chunks.items()):
+            if resend and key != running_key:
+                self.put(msg)
+            else:
+                lost.append(key)
+        self._send_sentinels()
+        return lost
+
+    def close(self):
+        """Close each job queue and result pipe."""
+        for job_q in self.job_qs:
+            # NOTE: a worker process that exited early may not have received
+            # every chunk, and so we must not wait for them to be sent.
+            job_q.cancel_join_thread()
+            job_q.close()
+        for reader in self.readers:
+            reader.close()
+
+
+_CONNECT_RETRY_INTERVAL = 0.5
+"""
+The time (in seconds) between attempts to connect to the main process, for
+remote worker processes.
+"""
+
+_REMOTE_CHUNKS_PER_WORKER = 2
+"""
+The maximum number of chunks that are sent to each remote worker process at a
+time, so that the chunks are shared by worker processes that connect at
+different times, while each worker process has another chunk to run while
+it reports the outcomes of a chunk.
+"""
+
+
+class _RemoteWorkers(_WorkerPipes):
+    """
+    Send chunks of jobs to remote worker processes, which connect to the main
+    process through a listener, and receive their outcomes through the same
+    connection.
+
+    Each connection is treated as a worker process that was started in
+    :meth:`listen`, and its outcomes are received in the same way as for
+    :class:`_WorkerPipes`. A remote worker process whose connection is
+    closed before it sends a sentinel (e.g., because its host failed) is
+    treated as a worker process that was killed: the chunk it was running is
+    lost, and its other chunks are sent to the other worker processes.
+
+    Chunks are only sent to worker processes that have connected, and at most
+    ``_REMOTE_CHUNKS_PER_WORKER`` chunks are in flight for each worker
+    process; the other chunks are held until a worker process connects or
+    reports a chunk. Connections are accepted until :meth:`close` is called,
+    and worker processes that are not needed (because ``n_proc`` worker
+    processes have already connected, or every chunk has been sent) are told
+    that there are no jobs for them, so that they exit successfully.
+
+    :param n_proc: The number of remote worker processes.
+    :param address: The address that remote worker processes connect to.
+    :param authkey: The key that remote worker processes must provide.
+    """
+
+    def __init__(self, n_proc, address, authkey):
+        self.n_proc = n_proc
+        # NOTE: worker processes are often started at the same time, and so
+        # the listener must queue their connections while it authenticates
+        # each one, rather than refusing them.
+        self.listener = multiprocessing.connection.Listener(
+            address, backlog=max(n_proc, 1), authkey=authkey
+        )
+        self.job_qs = []
+        self.readers = []
+        self.in_flight = []
+        self.held = []
+        self.exited = set()
+        self.finishing = False
+        self.finished = False
+        self.closed = False
+        self.lock = threading.Lock()
+        (self.waker, self.wake_writer) = multiprocessing.Pipe(duplex=False)
+        self.thread = None
+        self.stop_workers = None
+
+    def resize(self, n_proc):
+        """Reduce the number of worker processes, before they connect."""
+        with self.lock:
+            self.n_proc = n_proc
+
+    def accepting(self):
+        """
+        Return whether more worker processes may connect, and are needed to
+        run the remaining chunks.
+        """
+        with self.lock:
+            if self.closed or self.finished:
+                return False
+            return len(self.job_qs) < self.n_proc
+
+    def _stopping(self):
+        """Return whether the worker processes were asked to stop early."""
+        return self.stop_workers is not None and self.stop_workers.value
+
+    def _available_slots(self):
+        # NOTE: remote worker processes cannot see that they were asked to
+        # stop, and so we do not send them any more chunks.
+        if self._stopping():
+            return []
+        return [
+            slot
+            for slot in range(len(self.job_qs))
+            if slot not in self.exited
+            and len(self.in_flight[slot]) < _REMOTE_CHUNKS_PER_WORKER
+        ]
+
+    def _send_sentinels(self):
+        # NOTE: the chunks that are held once the worker processes were asked
+        # to stop will not be sent, and are recorded as unsuccessful.
+        if self._stopping():
+            with self.lock:
+                self.held.clear()
+        super()._send_sentinels()
+
+    def _send_held(self):
+        """Send held chunks to the worker processes that can take them."""
+        sends = []
+        with self.lock:
+            while self.held and self._available_slots():
+                msg = self.held.pop(0)
+                sends.append((self._assign(msg), msg))
+        for slot, msg in sends:
+            self.job_qs[slot].put(msg)
+
+    def chunk_done(self, slot, key):
+        with self.lock:
+            self.in_flight[slot].pop(key, None)
+        self._send_held()
+        self._send_sentinels()
+
+    def listen(self, config):
+        """
+        Accept connections from remote worker processes in a background
+        thread, and send each one its slot number and settings.
+        """
+        self.stop_workers = config.stop_workers
+        # NOTE: the shared objects in the settings only exist on this host.
+        config = dataclasses.replace(
+            config,
+            in_queue=None,
+            out_queue=None,
+            stop_workers=None,
+            chunk_slots=None,
+            job_slots=None,
+            start_times=None,
+        )
+        self.thread = threading.Thread(
+            target=self._accept,
+            args=[config],
+            name='parq-listener',
+            daemon=True,
+        )
+        self.thread.start()
+
+    def _accept(self, config):
+        logger = logging.getLogger(__name__)
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (EOFError, OSError, multiprocessing.AuthenticationError):
+                if self.closed:
+                    return
+                logger.warning('Rejected a worker that did not connect')
+                continue
+            with self.lock:
+                closed = self.closed
+                needed = not self.finished and len(self.job_qs) < self.n_proc
+            if closed:
+                conn.close()
+                return
+            if not needed:
+                logger.info('Remote worker connected, but is not needed')
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+                conn.close()
+                continue
+            slot = len(self.job_qs)
+            try:
+                conn.send((slot, config))
+            except OSError:
+                conn.close()
+                continue
+            logger.info(f'Remote worker {slot} connected')
+            sender = _ConnectionQueue(conn)
+            with self.lock:
+                self.job_qs.append(sender)
+                self.in_flight.append({})
+                finished = self.finished
+            self.readers.append(conn)
+            self._send_held()
+            # NOTE: the sentinels may have been sent since this worker
+            # process was accepted.
+            if finished:
+                sender.put(None)
+            # Wake the collector, so that it receives from this connection.
+            self.wake_writer.send(None)
+
+    def worker_exited(self, slot, running_key, resend=True, finished=False):
+        # NOTE: each worker process runs its chunks in the order that they
+        # were sent, and so the oldest chunk that it has not reported is the
+        # chunk that it was running (if any), unless it sent a sentinel.
+        with self.lock:
+            chunks = self.in_flight[slot]
+            if running_key < 0 and chunks and not finished:
+                running_key = next(iter(chunks))
+        return super().worker_exited(slot, running_key, resend, finished)
+
+    def close(self):
+        """Stop accepting connections, and close each connection."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+        if self.thread is not None and self.thread.is_alive():
+            # NOTE: closing the listener does not wake a thread that is
+            # waiting for a connection, and so we connect to the listener
+            # (without completing the handshake) to wake this thread.
+            try:
+                socket.create_connection(self.listener.address).close()
+            except OSError:
+                pass
+            self.thread.join()
+        self.listener.close()
+        for sender in self.job_qs:
+            sender.close()
+        for reader in self.readers:
+            reader.close()
+        self.waker.close()
+        self.wake_writer.close()
+
+
+class _Wait:
+    """
+    A request to wait until any of the given handles are ready, or until the
+    timeout expires, which is yielded by
+    :func:`_collect_successful_job_nums` when it must not block.
+
+    The caller must set :attr:`ready` to the list of handles that are ready
+    before resuming the collector.
+
+    :param handles: The connections and process sentinels to wait for.
+    :param timeout: The maximum time (in seconds) to wait, or ``None``.
+    """
+
+    __slots__ = ('handles', 'timeout', 'ready')
+
+    def __init__(self, handles, timeout):
+        self.handles = handles
+        self.timeout = timeout
+        self.ready = []
+
+
+def _collect_successful_job_nums(
+    workers,
+    config,
+    feeder,
+    timeout,
+    task=None,
+    pipes=None,
+    expire=None,
+    respawn=None,
+    progress=None,
+    memory=None,
+    recycle=None,
+    run_chunk=None,
+    asynchronous=False,
+):
+    """
+    Collect all of the successful job numbers, and yield the outcomes of each
+    chunk of jobs as they are received.
+
+    Each outcome is a tuple ``(completed, unsuccessful)``, where
+    ``completed`` is a list of job numbers (or ``(job_num, result)`` tuples,
+    if results are being collected) and ``unsuccessful`` is a list of the job
+    numbers that were not completed successfully.
+
+    :param workers: The worker processes.
+    :param config: The :class:`WorkerConfig` for the worker processes.
+    :param feeder: The :class:`_JobFeeder` that adds jobs to the job queue,
+        and records the successful job numbers.
+    :param timeout: The optional timeout (in seconds) when waiting for job
+        results; set to ``None`` to block until a result is received or a
+        worker process exits.
+    :param task: The :class:`_Task` for these jobs, if they are being run by
+        the worker processes of a :class:`Pool`. In this case, the worker
+        processes will not exit once the jobs are finished.
+    :param pipes: The :class:`_WorkerPipes` that send jobs to each worker
+        process and receive their outcomes, if the worker processes do not
+        share a single job queue and result queue.
+    :param expire: An optional function that replaces the worker processes
+        whose jobs have exceeded the job timeout, and returns the outcomes of
+        the jobs that were lost and the time (in seconds) until the next job
+        could exceed the timeout; see :meth:`_JobRunner.expire_jobs`.
+    :param respawn: An optional function that starts a new worker process in
+        place of one that terminated unexpectedly, and returns ``True`` if a
+        new worker process was started; see :meth:`_JobRunner.respawn`.
+    :param progress: An optional function that reports the progress of the
+        jobs, if a report is due, and returns the time (in seconds) until the
+        next report is due; see :meth:`_JobRunner.report_progress`.
+    :param memory: An optional function that checks the memory use of the
+        worker processes, and returns the time (in seconds) until the next
+        check; see :meth:`_JobRunner.check_memory`.
+    :param recycle: An optional function that starts a new worker process in
+        place of one that retired, and returns ``True`` if a new worker
+        process was started; see :meth:`_JobRunner.recycle`.
+    :param run_chunk: An optional function that runs the next chunk of jobs
+        in this thread, and returns the message that reports their outcomes,
+        or ``None`` if there are no more chunks to run; see
+        :meth:`_JobRunner.run_chunk`. In this case, there are no worker
+        processes.
+    :param asynchronous: Whether to yield a :class:`_Wait` request instead of
+        blocking until a message is received or a worker process exits, so
+        that the caller can wait for these events (e.g., in an event loop).
+    """
+    logger = logging.getLogger(__name__)
+    done_q = config.out_queue
+    if task is None:
+        task = config
+    results = task.collect_results
+    shared = results and task.shared_memory
+    finished_workers = set()
+    exited_workers = set()
+    recycled_workers = set()
+
+    def running_job(slot):
+        # Return the job that a worker process was running, if known.
+        if config.job_slots is None or config.job_slots[slot] < 0:
+            return None
+        return config.job_slots[slot]
+
+    def record(msg):
+        # Each worker sends its slot number as a sentinel once it has
+        # finished, and otherwise sends the outcomes of each chunk. The
+        # collector may also be woken by sending None.
+        if msg is None:
+            return None
+        if isinstance(msg, int):
+            finished_workers.add(msg)
+            logger.debug(f'Received {len(finished_workers)} sentinel(s)')
+            return None
+        if len(msg) == 2:
+            # A worker that retires sends its slot number instead of a
+            # sentinel, and is replaced by a new worker that will take the
+            # chunks (and the sentinel) that it would have taken.
+            (_retired, slot) = msg
+            if recycle is not None and recycle(slot):
+                recycled_workers.add(slot)
+                exited_workers.discard(slot)
+            return None
+        (
+            task_id,
+            slot,
+            key,
+            completed,
+            failed,
+            retryable,
+            stopped,
+            elapsed,
+            timings,
+        ) = msg
+        if task_id != task.task_id:
+            # NOTE: ignore outcomes from a previous submission to a pool.
+            _discard_results(completed)
+            return None
+        logger.debug(f'Received {len(completed)} completed job(s)')
+        if results:
+            job_nums = [job_num for (job_num, _result) in completed]
+        else:
+            job_nums = completed
+        # NOTE: jobs that are run again are sent in a new chunk, which may
+        # have the same key as this chunk, so we must record that this chunk
+        # has been reported before recording its outcomes.
+        if pipes is not None:
+            pipes.chunk_done(slot, key)
+        unsuccessful = feeder.chunk_done(key, job_nums, elapsed, retryable)
+        if unsuccessful is None:
+            _discard_results(completed)
+            return None
+        if timings is not None and feeder.recorder is not None:
+            feeder.recorder.chunk_reported(slot, key, *timings)
+        if stopped or not set(failed).isdisjoint(unsuccessful):
+            feeder.failed_workers.add(slot)
+        # NOTE: a job that raised a retryable exception and cannot be run
+        # again is only known to be unsuccessful here. Remote worker
+        # processes also cannot signal the other worker processes to stop,
+        # and so we do so for them.
+        if stopped or (
+            task.fail_early and not set(failed).isdisjoint(unsuccessful)
+        ):
+            with config.stop_workers.get_lock():
+                config.stop_workers.value = True
+        if shared:
+            completed = [
+                (job_num, result.load()) for (job_num, result) in completed
+            ]
+        return (completed, unsuccessful)
+
+    if run_chunk is not None:
+        while True:
+            if progress is not None:
+                progress()
+            msg = run_chunk()
+            if msg is None:
+                break
+            outcome = record(msg)
+            if outcome is not None:
+                yield outcome
+        logger.debug(f'Received {len(feeder.successful)} successful jobs')
+        return
+
+    if pipes is not None:
+        # NOTE: each worker process is the only process that holds the
+        # sending end of its result pipe, so we can wait for messages from
+        # every worker at once, and we know that a worker has exited (and
+        # that we have received every message it sent) once we reach the end
+        # of its pipe.
+        readers = {}
+        closed = set()
+        while True:
+            poll = timeout
+            if expire is not None:
+                (outcomes, wait) = expire()
+                yield from outcomes
+                poll = wait if poll is None else min(poll, wait)
+            if progress is not None:
+                wait = progress()
+                poll = wait if poll is None else min(poll, wait)
+            if memory is not None:
+                wait = memory()
+                poll = wait if poll is None else min(poll, wait)
+            # NOTE: a worker process that replaces one that was killed has a
+            # new result pipe, but we continue to receive messages from the
+            # killed worker until we reach the end of its pipe.
+            for slot, conn in enumerate(pipes.readers):
+                if conn not in readers and conn not in closed:
+                    readers[conn] = slot
+            # NOTE: remote worker processes may connect at any time, and so
+            # we also wait for them to connect, unless the worker processes
+            # have been asked to stop.
+            if not readers and (
+                config.stop_workers.value or not pipes.accepting()
+            ):
+                break
+            if config.stop_workers.value:
+                feeder.wake()
+            handles = list(readers)
+            if pipes.waker is not None:
+                handles.append(pipes.waker)
+            if asynchronous:
+                request = _Wait(handles, poll)
+                yield request
+                ready = request.ready
+            else:
+                ready = multiprocessing.connection.wait(handles, poll)
+            for conn in ready:
+                if conn is pipes.waker:
+                    conn.recv()
+                    continue
+                try:
+                    msg = conn.recv()
+                except (EOFError, OSError):
+                    slot = readers.pop(conn)
+                    closed.add(conn)
+                    if pipes.readers[slot] is not conn:
+                        conn.close()
+                        continue
+                    if slot not in finished_workers:
+                        feeder.failed_workers.add(slot)
+                    running_key = config.chunk_slots[slot]
+                    job_num = running_job(slot)
+                    lost = []
+                    if (
+                        respawn is not None
+                        and slot not in finished_workers
+                        and not config.stop_workers.value
+                    ):
+                        # Record that the chunk this worker was running has
+                        # been lost, and start a new worker that will run its
+                        # other chunks.
+                        if running_key >= 0:
+                            pipes.chunk_done(slot, running_key)
+                            lost = feeder.chunk_lost(running_key, job_num)
+                        respawn(slot)
+                        keys = []
+                    else:
+                        # Record that the chunk this worker was running has
+                        # been lost, and send its other chunks to the other
+                        # workers.
+                        resend = not config.stop_workers.value
+                        keys = pipes.worker_exited(
+                            slot,
+                            running_key,
+                            resend,
+                            finished=slot in finished_workers,
+                        )
+                    for key in keys:
+                        if key == running_key:
+                            lost.extend(feeder.chunk_lost(key, job_num))
+                        else:
+                            lost.extend(feeder.chunk_lost(key))
+                    if lost:
+                        if shared:
+                            _discard_shared_blocks(
+                                workers[slot].pid, task.task_id, lost
+                            )
+                        yield ([], lost)
+                    continue
+                outcome = record(msg)
+                if outcome is not None:
+                    yield outcome
+        logger.debug(f'Received {len(feeder.successful)} successful jobs')
+        return
+
+    def running():
+        if len(finished_workers | exited_workers) == len(workers):
+            return False
+        if config.persistent:
+            return not feeder.all_done()
+        return True
+
+    # NOTE: a worker process may terminate without first sending a sentinel
+    # (e.g., if it is killed), and so we wait until either a message can be
+    # received or a worker process has exited, and react to either one
+    # immediately. This is the same approach as concurrent.futures, which
+    # also waits on the result queue's underlying pipe.
+    #
+    # A worker process that has exited may have sent messages that we have
+    # not yet received, and so once every worker has either sent a sentinel
+    # or exited, we receive any remaining messages.
+    reader = done_q._reader
+    watched = None
+    while running():
+        poll = timeout
+        if expire is not None:
+            (outcomes, wait) = expire()
+            yield from outcomes
+            poll = wait if poll is None else min(poll, wait)
+            # Watch any worker processes that replaced the expired ones.
+            watched = None
+        if progress is not None:
+            wait = progress()
+            poll = wait if poll is None else min(poll, wait)
+        if memory is not None:
+            wait = memory()
+            poll = wait if poll is None else min(poll, wait)
+        if watched is None or recycled_workers:
+            recycled_workers.clear()
+            watched = {
+                worker.sentinel: slot
+                for (slot, worker) in enumerate(workers)
+                if slot not in exited_workers
+            }
+        # Wake the feeder if the workers have been asked to stop early, so
+        # that it adds the sentinels to the job queue.
+        if config.stop_workers.value:
+            feeder.wake()
+        if asynchronous:
+            request = _Wait([reader, *watched], poll)
+            yield request
+            ready = request.ready
+        else:
+            ready = multiprocessing.connection.wait([reader, *watched], poll)
+        for handle in ready:
+            if handle is reader:
+                continue
+            # Record that the chunk this worker was running has been lost.
+            slot = watched.pop(handle)
+            worker = workers[slot]
+            worker.join()
+            key = config.chunk_slots[slot]
+            if key >= 0:
+                lost = feeder.chunk_lost(key, running_job(slot))
+                if lost:
+                    if shared:
+                        _discard_shared_blocks(worker.pid, task.task_id, lost)
+                    yield ([], lost)
+            # NOTE: a worker that exits normally may do so before we receive
+            # its sentinel, so we only replace workers that were terminated
+            # by a signal.
+            if respawn is not None and worker.exitcode < 0 and respawn(slot):
+                watched[workers[slot].sentinel] = slot
+            else:
+                exited_workers.add(slot)
+        if reader not in ready:
+            continue
+        # Receive every message that is available.
+        while True:
+            try:
+                msg = done_q.get(block=False)
+            except queue.Empty:
+                break
+            outcome = record(msg)
+            if outcome is not None:
+                yield outcome
+
+    while not config.persistent:
+        try:
+            msg = done_q.get(block=False)
+        except queue.Empty:
+            break
+        outcome = record(msg)
+        if outcome is not None:
+            yield outcome
+
+    logger.debug(f'Received {len(feeder.successful)} successful jobs')
+
+
+class _JobRunner:
+    """
+    Run jobs in parallel using multiple worker processes.
+
+    This class is responsible for adding jobs to the job queue, spawning the
+    worker processes, collecting the outcome of each job, and waiting for the
+    worker processes to finish. See :func:`run` for a description of the
+    arguments.
+
+    If ``pool`` is provided, the jobs are run by the pool's worker processes
+    and the worker processes are left running once the jobs are finished.
+    In this case, ``initializer`` and ``initargs`` are ignored, because the
+    pool's worker processes have already been initialised.
+
+    :raises ValueError: if any of the arguments are invalid, or if the job
+        queue could not be created.
+    """
+
+    def __init__(
+        self,
+        func,
+        iterable,
+        n_proc,
+        fail_early=True,
+        trace=True,
+        level=None,
+        results=False,
+        chunksize=1,
+        max_in_flight=None,
+        validate='all',
+        shared_memory=False,
+        initializer=None,
+        initargs=(),
+        lazy_jobs=False,
+        engine='queue',
+        job_timeout=None,
+        retries=0,
+        retry_on=(),
+        respawn=False,
+        stats=False,
+        progress=None,
+        progress_interval=1.0,
+        checkpoint=None,
+        resume=False,
+        start_method=None,
+        preload=(),
+        max_worker_rss=None,
+        max_total_rss=None,
+        max_jobs_per_worker=None,
+        priority=None,
+        cost=None,
+        address=None,
+        authkey=None,
+        backend='process',
+        pool=None,
+    ):
+        build_start = time.perf_counter()
+        self.logger = logging.getLogger(__name__)
+        if level is None:
+            level = logging.WARNING
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f'Invalid max_in_flight: {max_in_flight!r}')
+        ordered = priority is not None or cost is not None
+        if ordered and max_in_flight is not None:
+            raise ValueError('Cannot order jobs when max_in_flight is set')
+        if validate not in _VALIDATE_MODES:
+            raise ValueError(f'Invalid validate: {validate!r}')
+        if engine not in _ENGINES or (pool is not None and engine != 'queue'):
+            raise ValueError(f'Invalid engine: {engine!r}')
+        if job_timeout is not None and not job_timeout > 0:
+            raise ValueError(f'Invalid job_timeout: {job_timeout!r}')
+        if retries < 0:
+            raise ValueError(f'Invalid retries: {retries!r}')
+        if not retries:
+            retry_on = ()
+        self.job_timeout = job_timeout
+        self.respawn_workers = respawn
+        if progress_interval <= 0:
+            raise ValueError(
+                f'Invalid progress_interval: {progress_interval!r}'
+            )
+        self.recorder = (
+            _StatsRecorder(same_clock=address is None) if stats else None
+        )
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.next_progress = None
+        if resume and checkpoint is None:
+            raise ValueError('Cannot resume without a checkpoint')
+        self.resume = resume
+        self.resumed_results = {}
+        if checkpoint is None:
+            self.checkpoint = None
+            done = None
+        else:
+            self.checkpoint = _Checkpoint(checkpoint, results)
+            if resume:
+                (done, self.resumed_results) = self.checkpoint.load()
+                self.logger.info(f'Resuming after {len(done)} completed jobs')
+            else:
+                done = None
+        self.run_start = None
+        self.n_replaced = 0
+        self.n_recycled = 0
+        self.terminated = False
+        for name, limit in [
+            ('max_worker_rss', max_worker_rss),
+            ('max_total_rss', max_total_rss),
+        ]:
+            if limit is not None and not limit > 0:
+                raise ValueError(f'Invalid {name}: {limit!r}')
+        self.max_worker_rss = max_worker_rss
+        self.max_total_rss = max_total_rss
+        if max_jobs_per_worker is not None and max_jobs_per_worker < 1:
+            raise ValueError(
+                f'Invalid max_jobs_per_worker: {max_jobs_per_worker!r}'
+            )
+        if backend not in _BACKENDS:
+            raise ValueError(f'Invalid backend: {backend!r}')
+        # NOTE: these options control the worker processes themselves, and
+        # cannot be provided when the jobs are run in this process.
+        process_options = {
+            'engine': engine != 'queue',
+            'job_timeout': job_timeout is not None,
+            'respawn': respawn,
+            'start_method': start_method is not None,
+            'preload': bool(preload),
+            'max_worker_rss': max_worker_rss is not None,
+            'max_total_rss': max_total_rss is not None,
+            'max_jobs_per_worker': max_jobs_per_worker is not None,
+        }
+        if backend == 'auto':
+            # Run the jobs in this thread if no more than one job could run
+            # at a time, which avoids the cost of starting worker processes
+            # and pickling the arguments and results of each job.
+            if max_in_flight is None:
+                if not isinstance(iterable, collections.abc.Sequence):
+                    iterable = list(iterable)
+                serial = min(n_proc, len(iterable)) <= 1
+            else:
+                serial = False
+            if serial and not any(process_options.values()):
+                backend = 'serial'
+            else:
+                backend = 'process'
+        elif backend != 'process':
+            for name, is_set in process_options.items():
+                if is_set:
+                    raise ValueError(
+                        f'Cannot use {name} with the {backend!r} backend'
+                    )
+        if backend == 'serial':
+            n_proc = 1
+        self.backend = backend
+        self.local = backend != 'process'
+        self.iterable = iterable
+        self.lazy_jobs = lazy_jobs
+        self.pool = pool
+        self.remote = address is not None
+        if self.remote and not authkey:
+            raise ValueError('Remote worker processes require an authkey')
+        self.stream = max_in_flight is not None
+        # NOTE: the results of jobs that are run in this process are not
+        # copied, and so there is no need for shared memory.
+        self.shared_memory = bool(
+            results
+            and shared_memory
+            and not self.local
+            and _shared_memory_supported()
+        )
+        self.pipes = None
+        if pool is None:
+            self.task = None
+            self.context = (
+                _ThreadContext()
+                if self.local
+                else _get_context(start_method, preload)
+            )
+            if self.local:
+                # NOTE: the function and the arguments and results of each
+                # job are not pickled when the jobs are run in this process,
+                # and so there are no arguments to validate.
+                job_q = self.context.Queue()
+                validate = 'on_failure'
+            elif self.remote:
+                # NOTE: remote worker processes must unpickle the function,
+                # as for worker processes that are not forked.
+                _check_func(func, multiprocessing.get_context('spawn'))
+                self.pipes = _RemoteWorkers(n_proc, address, authkey)
+                job_q = self.pipes
+            elif engine == 'pipes':
+                _check_func(func, self.context)
+                self.pipes = _WorkerPipes(n_proc, self.context)
+                job_q = self.pipes
+            else:
+                _check_func(func, self.context)
+                job_q = self.context.Queue()
+        else:
+            self.context = pool.context
+            self.task = pool._new_task(
+                func,
+                fail_early,
+                trace,
+                results,
+                self.shared_memory,
+                retry_on,
+                stats,
+            )
+            job_q = pool.config.in_queue
+        if self.stream:
+            # Take jobs from the iterable as they are needed.
+            n_jobs = operator.length_hint(iterable)
+            self.job_table = None
+            jobs = enumerate(iterable)
+            payloads = None
+        else:
+            job_q, n_jobs, self.job_table, payloads = _build_job_queue(
+                iterable, job_q, validate, skip=done or ()
+            )
+            if done is not None:
+                self.checkpoint.check_job_count(n_jobs)
+            if ordered:
+                jobs = _order_jobs(self.job_table, priority, cost)
+            else:
+                jobs = enumerate(self.job_table)
+        if pool is None:
+            context = self.context
+            if self.pipes is None:
+                done_q = context.Queue()
+            else:
+                done_q = None
+            stop_workers = context.Value(ctypes.c_bool, False)
+            chunk_slots = context.RawArray(ctypes.c_longlong, n_proc)
+            self.workers = []
+            self.config = WorkerConfig(
+                func=func,
+                in_queue=job_q,
+                out_queue=done_q,
+                stop_workers=stop_workers,
+                chunk_slots=chunk_slots,
+                log_level=level,
+                fail_early=fail_early,
+                trace=trace,
+                collect_results=results,
+                shared_memory=self.shared_memory,
+                retry_on=retry_on,
+                stats=stats,
+                initializer=initializer,
+                initargs=initargs,
+                max_jobs=max_jobs_per_worker,
+                local=self.local,
+            )
+            # NOTE: record which job each worker is running, so that only
+            # this job is recorded as unsuccessful if the worker is killed.
+            if job_timeout is not None or retries or respawn:
+                self.config.job_slots = context.RawArray(
+                    ctypes.c_longlong, n_proc
+                )
+                self.config.start_times = context.RawArray(
+                    ctypes.c_double, n_proc
+                )
+            # NOTE: record which workers should retire once they have
+            # finished their current chunk, and whether workers may take
+            # another chunk, so that their memory use can be limited.
+            if max_worker_rss is not None or max_total_rss is not None:
+                self.config.retire = context.RawArray(ctypes.c_bool, n_proc)
+            if max_total_rss is not None:
+                self.config.admit = context.Event()
+                self.config.admit.set()
+        else:
+            self.workers = pool.workers
+            self.config = pool.config
+            stop_workers = self.config.stop_workers
+
+        # When the chunk size is adjusted automatically, only add a few chunks
+        # to the queue at a time, so that later chunks can be resized based on
+        # how long the earlier chunks took to complete.
+        if chunksize == 'auto':
+            if self.stream:
+                max_size = max_in_flight // max(n_proc, 1)
+            else:
+                max_size = n_jobs // (
+                    _AUTO_CHUNKS_PER_WORKER * max(n_proc, 1)
+                )
+            sizer = _ChunkSizer(chunksize, max_size=max(1, max_size))
+            max_chunks = _AUTO_CHUNKS_PER_WORKER * n_proc
+        else:
+            sizer = _ChunkSizer(chunksize)
+            max_chunks = None
+        if validate != 'all' and not self.stream and not self.local:
+            # NOTE: the arguments of the jobs that were not checked are
+            # pickled when they are added to the queue, and so we only add a
+            # few chunks before the worker processes are spawned.
+            deferred_chunks = _DEFERRED_CHUNKS_PER_WORKER * n_proc
+            if max_chunks is None or max_chunks > deferred_chunks:
+                max_chunks = deferred_chunks
+        if self.pipes is not None:
+            # NOTE: only send a few chunks to each worker process at a time,
+            # so that the remaining chunks can be sent to whichever worker
+            # processes finish their chunks first.
+            pipe_chunks = _PIPE_CHUNKS_PER_WORKER * n_proc
+            if max_chunks is None or max_chunks > pipe_chunks:
+                max_chunks = pipe_chunks
+        # NOTE: the feeder only needs to retain the arguments of jobs that
+        # cannot be looked up by job number once the jobs are finished.
+        keep_args = self.stream and not isinstance(
+            iterable, collections.abc.Sequence
+        )
+        job_table = iterable if self.stream else self.job_table
+        self.feeder = _JobFeeder(
+            job_q,
+            jobs,
+            sizer,
+            stop_workers,
+            max_chunks=max_chunks,
+            max_in_flight=max_in_flight,
+            payloads=payloads,
+            task=self.task,
+            keep_args=keep_args,
+            job_table=None if keep_args else job_table,
+            hold_sentinels=job_timeout is not None or retries > 0 or respawn,
+            retries=retries,
+            recorder=self.recorder,
+            skip=done,
+            in_order=not ordered,
+            pickle_args=not self.local,
+        )
+        if pool is not None:
+            # NOTE: the pool's workers are only stopped when the pool is
+            # closed, so we wake the collector once all of the chunks have
+            # been added, rather than adding a sentinel for each worker.
+            self.feeder.on_finish = self._wake_collector
+            stop_workers.value = False
+
+        # Add the initial chunks to the queue, so that invalid jobs are
+        # reported before any worker processes are spawned.
+        self.n_jobs_known = self.feeder.fill() or not self.stream
+        if self.recorder is not None:
+            self.recorder.phase('build', build_start)
+        if self.n_jobs_known:
+            # Spawn no more processes than there are jobs.
+            if self.stream:
+                n_jobs = self.feeder.job_count
+            n_remaining = n_jobs - len(self.feeder.successful)
+            if n_proc > n_remaining:
+                n_proc = n_remaining
+        self.n_jobs = n_jobs
+        self.n_proc = n_proc
+        if pool is None:
+            self.feeder.n_proc = n_proc
+        if self.pipes is not None:
+            self.pipes.resize(n_proc)
+
+    def _wake_collector(self):
+        self.config.out_queue.put(None, block=False)
+
+    def start(self):
+        """Start adding the remaining jobs to the queue, and spawn workers."""
+        spawn_start = time.perf_counter()
+        if self.pool is not None:
+            self.logger.debug('Submitting {} jobs'.format(self.n_jobs))
+            self.feeder.start()
+        else:
+            self._spawn_workers()
+        if self.checkpoint is not None:
+            self.checkpoint.open(
+                self.resume, None if self.stream else self.n_jobs
+            )
+        if self.recorder is not None:
+            self.recorder.phase('spawn', spawn_start)
+        self.run_start = time.perf_counter()
+
+    def _spawn_workers(self):
+        """Start adding the remaining jobs to the queue, and spawn workers."""
+        if self.remote:
+            self._listen_for_workers()
+            return
+        if self.backend == 'serial':
+            self._initialize_serial()
+            return
+        if self.n_jobs_known:
+            self.logger.info(
+                'Spawning {} workers for {} jobs'.format(
+                    self.n_proc, self.n_jobs
+                )
+            )
+        else:
+            self.logger.info('Spawning {} workers'.format(self.n_proc))
+        if self.shared_memory:
+            # NOTE: start the resource tracker before spawning the workers,
+            # so that they share it with this process. Otherwise, each worker
+            # would start its own tracker, which would remove the shared
+            # memory blocks that the worker created when it exits.
+            multiprocessing.resource_tracker.ensure_running()
+        self.feeder.start()
+        for i in range(self.n_proc):
+            self._start_worker(i)
+        self.logger.debug('Started all workers')
+
+    def _initialize_serial(self):
+        """
+        Call the initializer in this thread, before running the jobs.
+
+        The jobs are run in this thread by the collector (see
+        :meth:`run_chunk`), which also adds the chunks to the queue, and so
+        the feeder's background thread is not started.
+        """
+        self.logger.info('Running jobs in this thread')
+        config = self.config
+        if config.initializer is None:
+            return
+        try:
+            config.initializer(*config.initargs)
+        except Exception:
+            # NOTE: as for a worker process whose initializer fails, no jobs
+            # are run.
+            self.logger.debug('Initializer failed')
+            if config.trace:
+                self.logger.warning(traceback.format_exc())
+            self.feeder.failed_workers.add(0)
+            self.stop()
+
+    def run_chunk(self):
+        """
+        Run the next chunk of jobs in this thread.
+
+        :returns: The message that reports the outcome of each job (as sent
+            by a worker process), or ``None`` if there are no more chunks to
+            run or the jobs were asked to stop.
+        """
+        config = self.config
+        feeder = self.feeder
+        if config.stop_workers.value:
+            return None
+        try:
+            feeder.fill()
+        except Exception as e:
+            # NOTE: as for the feeder's background thread, record the
+            # exception so that it is raised once the jobs have stopped.
+            feeder.error = e
+            self.stop()
+            return None
+        try:
+            (_task, chunk) = config.in_queue.get(block=False)
+        except queue.Empty:
+            return None
+        logger = _worker_logger(config)
+        config.chunk_slots[0] = chunk[0][0]
+        (report, _n_started, _status_ok) = _run_chunk(
+            config,
+            config,
+            0,
+            chunk,
+            logger,
+            logger.isEnabledFor(logging.DEBUG),
+        )
+        config.chunk_slots[0] = -1
+        return report
+
+    def _listen_for_workers(self):
+        """
+        Start adding the remaining jobs to the queue, and accept connections
+        from remote worker processes.
+        """
+        self.logger.info(
+            'Waiting for {} remote workers at {}'.format(
+                self.n_proc, self.pipes.listener.address
+            )
+        )
+        for slot in range(self.n_proc):
+            self.config.chunk_slots[slot] = -1
+            if self.config.job_slots is not None:
+                self.config.job_slots[slot] = -1
+        self.feeder.start()
+        self.pipes.listen(self.config)
+
+    def _start_worker(self, slot):
+        """Start a worker process for the given slot."""
+        self.config.chunk_slots[slot] = -1
+        if self.config.job_slots is not None:
+            self.config.job_slots[slot] = -1
+        if self.config.retire is not None:
+            self.config.retire[slot] = False
+        if self.pipes is None:
+            config = self.config
+        else:
+            config = self.pipes.worker_config(self.config, slot)
+        proc = self.context.Process(
+            target=_worker,
+            args=[config, slot],
+            name=f'parq-{slot + 1}',
+            daemon=self.pool is not None,
+        )
+        # NOTE: record the worker process before starting it, so that it is
+        # terminated if a KeyboardInterrupt is raised once it has started.
+        if slot < len(self.workers):
+            self.workers[slot] = proc
+        else:
+            self.workers.append(proc)
+        _start_process(proc)
+        if self.pipes is not None:
+            self.pipes.worker_started(config)
+
+    def collect(self, timeout, asynchronous=False):
+        """
+        Yield the outcomes of each chunk of jobs as they are received; see
+        :func:`_collect_successful_job_nums`.
+        """
+        outcomes = _collect_successful_job_nums(
+            self.workers,
+            self.config,
+            self.feeder,
+            timeout,
+            task=self.task,
+            pipes=self.pipes,
+            expire=None if self.job_timeout is None else self.expire_jobs,
+            respawn=self.respawn if self.respawn_workers else None,
+            progress=None if self.progress is None else self.report_progress,
+            memory=None if self.config.retire is None else self.check_memory,
+            recycle=self.recycle,
+            run_chunk=self.run_chunk if self.backend == 'serial' else None,
+            asynchronous=asynchronous,
+        )
+        if self.checkpoint is None:
+            return outcomes
+        return self.checkpoint.watch(outcomes)
+
+    def report_progress(self, final=False):
+        """
+        Pass a :class:`Progress` snapshot to the progress callback if a report
+        is due (or if ``final`` is true), and return the time (in seconds)
+        until the next report is due.
+        """
+        now = time.perf_counter()
+        if self.next_progress is None:
+            self.next_progress = self.run_start + self.progress_interval
+        wait = self.next_progress - now
+        if wait > 0 and not final:
+            return wait
+        self.next_progress = now + self.progress_interval
+        feeder = self.feeder
+        with feeder.cond:
+            completed = len(feeder.successful)
+            failed = feeder.n_unsuccessful
+            skipped = feeder.n_skipped
+        if not self.stream:
+            job_count = self.n_jobs
+        elif feeder.exhausted:
+            job_count = feeder.job_count
+        else:
+            job_count = None
+        elapsed = now - self.run_start
+        # NOTE: the jobs that were completed before the run was resumed are
+        # not included in the rate, and so the remaining time is estimated
+        # from the jobs that were finished in this run.
+        finished = completed + failed - skipped
+        rate = finished / elapsed if elapsed > 0 else 0.0
+        if job_count is not None and rate > 0:
+            eta = (job_count - completed - failed) / rate
+        else:
+            eta = None
+        self.progress(
+            Progress(
+                completed=completed,
+                failed=failed,
+                in_flight=feeder.n_in_flight,
+                job_count=job_count,
+                elapsed=elapsed,
+                rate=rate,
+                eta=eta,
+                worker_rss={
+                    slot: _process_rss(worker.pid)
+                    for (slot, worker) in enumerate(self.workers)
+                    if worker.exitcode is None and not self.local
+                },
+            )
+        )
+        return self.progress_interval
+
+    def check_memory(self):
+        """
+        Ask each worker process whose memory use exceeds ``max_worker_rss``
+        to retire once it has finished its current chunk of jobs, and return
+        the time (in seconds) until the memory use should next be checked.
+
+        If the total memory use of the worker processes exceeds
+        ``max_total_rss``, the largest worker process is also asked to
+        retire, and the other worker processes do not take any more chunks
+        until the total memory use is below this limit. This pause ends once
+        no worker process is running a chunk, so that the jobs can always
+        make progress. No other worker process is asked to retire until
+        every worker process that was asked to retire has exited.
+        """
+        config = self.config
+        total = 0
+        running = False
+        retiring = False
+        largest = None
+        for slot, worker in enumerate(self.workers):
+            if worker.exitcode is not None:
+                continue
+            rss = _process_rss(worker.pid)
+            if rss is None:
+                continue
+            total += rss
+            if config.chunk_slots[slot] >= 0:
+                running = True
+            if config.retire[slot]:
+                retiring = True
+                continue
+            if self.max_worker_rss is not None and rss > self.max_worker_rss:
+                self.logger.info(f'Worker {slot} is using {rss} bytes')
+                config.retire[slot] = True
+                retiring = True
+            elif largest is None or rss > largest[1]:
+                largest = (slot, rss)
+        if self.max_total_rss is None:
+            return _MEMORY_CHECK_INTERVAL
+        over = total > self.max_total_rss and not config.stop_workers.value
+        # NOTE: a worker process that was asked to retire is included in the
+        # total until it exits, and so we wait for it to exit (and pause the
+        # other worker processes) rather than asking another one to retire.
+        if over and largest is not None and not retiring:
+            self.logger.info(f'Workers are using {total} bytes')
+            config.retire[largest[0]] = True
+        if over and running:
+            config.admit.clear()
+        else:
+            config.admit.set()
+        return _MEMORY_CHECK_INTERVAL
+
+    def recycle(self, slot):
+        """
+        Start a new worker process in place of one that retired, unless the
+        worker processes have been asked to stop, and return ``True`` if a new
+        worker process was started.
+        """
+        if self.config.stop_workers.value:
+            return False
+        self.logger.info(f'Starting a new worker in place of worker {slot}')
+        self.n_recycled += 1
+        self._start_worker(slot)
+        return True
+
+    def respawn(self, slot):
+        """
+        Start a new worker process in place of one that has exited, unless the
+        worker processes have been asked to stop, and return ``True`` if a new
+        worker process was started.
+        """
+        if self.config.stop_workers.value:
+            return False
+        self.logger.info(f'Starting a new worker in place of worker {slot}')
+        self.n_replaced += 1
+        self._start_worker(slot)
+        return True
+
+    def expire_jobs(self):
+        """
+        Kill each worker process whose current job has exceeded the job
+        timeout, and start a new worker process in its place.
+
+        :returns: A tuple ``(outcomes, wait)``, where ``outcomes`` is a list
+            of ``(completed, unsuccessful)`` outcomes for the jobs that were
+            lost, and ``wait`` is the time (in seconds) until the next job
+            could exceed the timeout.
+        """
+        config = self.config
+        task = config if self.task is None else self.task
+        outcomes = []
+        wait = self.job_timeout
+        now = time.monotonic()
+        for slot, worker in enumerate(self.workers):
+            job_num = config.job_slots[slot]
+            # NOTE: worker processes that exit unexpectedly are detected by
+            # the collector.
+            if job_num < 0 or worker.exitcode is not None:
+                continue
+            remaining = config.start_times[slot] + self.job_timeout - now
+            if remaining > 0:
+                wait = min(wait, remaining)
+                continue
+            worker.kill()
+            worker.join()
+            key = config.chunk_slots[slot]
+            job_nums = self.feeder.chunks.get(key, []) if key >= 0 else []
+            if self.pipes is not None and key >= 0:
+                self.pipes.chunk_done(slot, key)
+            if config.job_slots[slot] == job_num:
+                if task.trace:
+                    self.logger.warning(
+                        f'Job #{job_num} exceeded the job timeout of '
+                        f'{self.job_timeout} seconds'
+                    )
+                lost = self.feeder.chunk_lost(key, job_num)
+                if lost and task.fail_early:
+                    with config.stop_workers.get_lock():
+                        config.stop_workers.value = True
+            elif key >= 0:
+                # NOTE: the job finished just before the worker was killed,
+                # so the outcomes of this chunk may never be received.
+                lost = self.feeder.chunk_lost(key)
+            else:
+                lost = []
+            if self.shared_memory and job_nums:
+                _discard_shared_blocks(worker.pid, task.task_id, job_nums)
+            if lost:
+                outcomes.append(([], lost))
+            if not self.respawn(slot):
+                # NOTE: the collector will record that this worker exited.
+                config.chunk_slots[slot] = -1
+                config.job_slots[slot] = -1
+        return (outcomes, wait)
+
+    def stop(self):
+        """Ask each worker to stop once it has finished its current job."""
+        with self.config.stop_workers.get_lock():
+            self.config.stop_workers.value = True
+        if self.config.admit is not None:
+            self.config.admit.set()
+        self.feeder.wake()
+
+    def terminate(self):
+        """Force each worker to terminate."""
+        self.terminated = True
+        if self.pool is not None:
+            self.pool.terminate()
+            return
+        if self.local:
+            # NOTE: threads cannot be terminated, and so we ask each worker
+            # thread to stop once it has finished its current job.
+            self.stop()
+            return
+        for worker in self.workers:
+            worker.terminate()
+        if self.remote:
+            # NOTE: remote worker processes exit once their connection is
+            # closed.
+            self.pipes.close()
+
+    def discard_unreported(self, workers):
+        """
+        Remove the shared memory blocks that were created by worker processes
+        that terminated while running a chunk of jobs.
+        """
+        task = self.config if self.task is None else self.task
+        for slot, worker in enumerate(workers):
+            key = self.config.chunk_slots[slot]
+            job_nums = self.feeder.chunks.get(key) if key >= 0 else None
+            if job_nums:
+                _discard_shared_blocks(worker.pid, task.task_id, job_nums)
+
+    def finish(self):
+        """
+        Wait for each worker to finish, and return a :class:`Result` that
+        describes the outcome of each job.
+
+        :raises Exception: if an error occurred while adding jobs to the
+            queue.
+        """
+        recorder = self.recorder
+        if recorder is not None and self.run_start is not None:
+            recorder.phase('run', self.run_start)
+        if self.progress is not None and self.run_start is not None:
+            self.report_progress(final=True)
+        join_start = time.perf_counter()
+        feeder = self.feeder
+        feeder.close()
+        if self.config.admit is not None:
+            self.config.admit.set()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        successful_job_nums = feeder.successful
+        if self.stream:
+            n_jobs = feeder.job_count
+            if isinstance(self.iterable, collections.abc.Sequence):
+                job_table = self.iterable
+            else:
+                job_table = None
+        else:
+            n_jobs = self.n_jobs
+            job_table = self.job_table
+        n_done = len(successful_job_nums)
+        if job_table is None:
+            successful_jobs = None
+            unsuccessful_jobs = feeder.unsuccessful_jobs()
+        elif self.lazy_jobs:
+            successful_jobs = _JobList(
+                job_table, lambda: iter(successful_job_nums), n_done
+            )
+            unsuccessful_jobs = _JobList(
+                job_table,
+                lambda: successful_job_nums.missing(n_jobs),
+                n_jobs - n_done,
+            )
+        else:
+            successful_jobs = [
+                job_table[job_num] for job_num in successful_job_nums
+            ]
+            unsuccessful_jobs = [
+                job_table[job_num]
+                for job_num in successful_job_nums.missing(n_jobs)
+            ]
+        # NOTE: a run that was interrupted is unsuccessful, even if every job
+        # was completed before the interrupt was handled.
+        success = n_done == n_jobs and not self.terminated
+
+        if self.pool is not None:
+            failed_worker_count = self.pool._finish_task(self)
+            failed_worker_count += self.n_replaced
+        else:
+            # Wait for each worker to finish.
+            failed_worker_count = 0
+            for ix, worker in enumerate(self.workers):
+                worker.join()
+                # Note: worker.exitcode should be 0 if it completed
+                # successfully. It will be -N if it was terminated by signal
+                # N. It will apparently be 1 if an exception was raised.
+                if worker.exitcode != 0:
+                    msg = 'Worker {} exit code: {}'
+                    self.logger.info(msg.format(ix, worker.exitcode))
+                    failed_worker_count += 1
+            failed_worker_count += self.n_replaced
+            if self.remote or self.backend == 'serial':
+                failed_worker_count = len(feeder.failed_workers)
+            if self.shared_memory:
+                self.discard_unreported(self.workers)
+            if self.pipes is not None:
+                self.pipes.close()
+
+        if recorder is not None:
+            recorder.phase('join', join_start)
+
+        # Report any error that occurred while adding jobs to the queue.
+        if feeder.error is not None:
+            raise feeder.error
+
+        return Result(
+            success=success,
+            job_count=n_jobs,
+            successful_jobs=successful_jobs,
+            unsuccessful_jobs=unsuccessful_jobs,
+            failed_worker_count=failed_worker_count,
+            attempts=dict(feeder.attempts),
+            stats=None if recorder is None else recorder.stats(),
+            _successful_job_nums=successful_job_nums,
+        )
+
+
+class Pool:
+    """
+    A pool of worker processes that can run jobs for many submissions,
+    avoiding the cost of spawning new worker processes for each submission.
+
+    Use :meth:`run` to run jobs with the same arguments and :class:`Result`
+    semantics as :func:`run`.
+    Pools should be used as context managers, so that the worker processes
+    are stopped when the pool is no longer needed; otherwise, call
+    :meth:`close` to stop the worker processes.
+
+    :param n_proc: The number of processes to spawn.
+    :param level: The logging level for worker processes. By default, only
+        warnings and errors will be shown.
+    :param initializer: An optional function that is called once by each
+        worker process, before it runs any jobs (see :func:`run`).
+    :param initargs: The arguments for ``initializer``.
+    :param start_method: How the worker processes are started (see
+        :func:`run`).
+    :param preload: The modules that the fork server imports before it
+        starts the worker processes (see :func:`run`).
+
+    .. note::
+
+       Because the worker processes are spawned before any jobs are
+       submitted, the job function (``func``) must be able to be pickled.
+       This means that it must be defined at the top level of a module.
+
+    >>> import operator
+    >>> import parq
+    >>> with parq.Pool(n_proc=2) as pool:
+    ...     for n in range(1, 4):
+    ...         job_inputs = [(i, n) for i in range(10)]
+    ...         result = pool.run(operator.mul, job_inputs, results=True)
+    ...         assert result.job_results == {i: i * n for i in range(10)}
+    """
+
+    def __init__(
+        self,
+        n_proc,
+        level=None,
+        initializer=None,
+        initargs=(),
+        start_method=None,
+        preload=(),
+    ):
+        if n_proc < 1:
+            raise ValueError(f'Invalid n_proc: {n_proc!r}')
+        self.context = _get_context(start_method, preload)
+        if level is None:
+            level = logging.WARNING
+        self.n_proc = n_proc
+        self.level = level
+        self.initializer = initializer
+        self.initargs = initargs
+        self.logger = logging.getLogger(__name__)
+        self.config = None
+        self.workers = []
+        self.task_count = 0
+        self.closed = False
+
+    def __enter__(self):
+        self._spawn()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is KeyboardInterrupt:
+            self.terminate()
+        else:
+            self.close()
+
+    def _spawn(self):
+        """Spawn the worker processes, if they are not already running."""
+        if self.closed:
+            raise ValueError('Pool is closed')
+        if self.workers:
+            return
+        context = self.context
+        self.config = WorkerConfig(
+            func=None,
+            in_queue=context.Queue(),
+            out_queue=context.Queue(),
+            stop_workers=context.Value(ctypes.c_bool, False),
+            chunk_slots=context.RawArray(ctypes.c_longlong, self.n_proc),
+            log_level=self.level,
+            persistent=True,
+            initializer=self.initializer,
+            initargs=self.initargs,
+            job_slots=context.RawArray(ctypes.c_longlong, self.n_proc),
+            start_times=context.RawArray(ctypes.c_double, self.n_proc),
+        )
+        if _shared_memory_supported():
+            # NOTE: the workers must share this process's resource tracker,
+            # in case any submission returns results through shared memory.
+            multiprocessing.resource_tracker.ensure_running()
+        self.logger.info('Spawning {} pool workers'.format(self.n_proc))
+        for i in range(self.n_proc):
+            self.config.chunk_slots[i] = -1
+            self.config.job_slots[i] = -1
+            # NOTE: pool workers are daemonic, so that they are terminated
+            # when the main process exits without closing the pool.
+            proc = context.Process(
+                target=_worker,
+                args=[self.config, i],
+                name=f'parq-{i + 1}',
+                daemon=True,
+            )
+            self.workers.append(proc)
+            _start_process(proc)
+
+    def _new_task(
+        self, func, fail_early, trace, results, shared_memory, retry_on, stats
+    ):
+        """Return the job settings for a new submission."""
+        try:
+            pickle.dumps(func)
+        except Exception as e:
+            raise ValueError(f'Invalid function: {func}') from e
+        self._spawn()
+        self.task_count += 1
+        return _Task(
+            func=func,
+            task_id=self.task_count,
+            fail_early=fail_early,
+            trace=trace,
+            collect_results=results,
+            shared_memory=shared_memory,
+            retry_on=retry_on,
+            stats=stats,
+        )
+
+    def _finish_task(self, runner):
+        """
+        Record that a submission has finished, and return the number of
+        worker processes that failed.
+
+        If any worker process has exited, or if any of the submitted jobs
+        were not collected, the worker processes are terminated and new
+        worker processes will be spawned for the next submission.
+        """
+        n_exited = sum(worker.exitcode is not None for worker in self.workers)
+        if n_exited > 0 or runner.feeder.chunks:
+            self.logger.info('Restarting pool workers')
+            workers = self.workers
+            self.terminate()
+            if runner.shared_memory:
+                runner.discard_unreported(workers)
+        if runner.feeder.stopped:
+            # NOTE: when jobs stop early, each worker process that is
+            # spawned by parq.run() exits with a non-zero exit code.
+            return min(self.n_proc, runner.n_jobs)
+        return len(runner.feeder.failed_workers) + n_exited
+
+    def run(
+        self,
+        func,
+        iterable,
+        fail_early=True,
+        trace=True,
+        results=False,
+        timeout=10,
+        chunksize=1,
+        max_in_flight=None,
+        validate='all',
+        shared_memory=False,
+        lazy_jobs=False,
+        job_timeout=None,
+        retries=0,
+        retry_on=(),
+        respawn=False,
+        stats=False,
+        progress=None,
+        progress_interval=1.0,
+        checkpoint=None,
+        resume=False,
+        spill=None,
+        priority=None,
+        cost=None,
+    ):
+        """
+        Perform multiple jobs in parallel, using the pool's worker processes.
+
+        See :func:`run` for a description of the arguments.
+
+        :returns: A :class:`Result` instance.
+        :rtype: parq.Result
+        """
+        runner = _JobRunner(
+            func,
+            iterable,
+            self.n_proc,
+            fail_early=fail_early,
+            trace=trace,
+            results=results,
+            chunksize=chunksize,
+            max_in_flight=max_in_flight,
+            validate=validate,
+            shared_memory=shared_memory,
+            lazy_jobs=lazy_jobs,
+            job_timeout=job_timeout,
+            retries=retries,
+            retry_on=retry_on,
+            respawn=respawn,
+            stats=stats,
+            progress=progress,
+            progress_interval=progress_interval,
+            checkpoint=checkpoint,
+            resume=resume,
+            priority=priority,
+            cost=cost,
+            pool=self,
+        )
+        return _run_jobs(runner, results, timeout, spill)
+
+    def terminate(self):
+        """
+        Force each worker process to terminate; new worker processes will be
+        spawned if more jobs are submitted.
+        """
+        for worker in self.workers:
+            worker.terminate()
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+
+    def close(self):
+        """Stop each worker process once it has finished its current job."""
+        if self.workers:
+            for _ in self.workers:
+                self.config.in_queue.put(None)
+            for worker in self.workers:
+                worker.join()
+        self.workers = []
+        self.closed = True
+
+
+def _job_results(runner, results, spill):
+    """
+    Return the mapping that will hold the results of each job, which is
+    either a dictionary or a :class:`_ResultStore`, or ``None`` if results
+    are not being collected.
+    """
+    if not results:
+        return None
+    if spill is None or spill is False:
+        return runner.resumed_results
+    job_results = _ResultStore(None if spill is True else spill)
+    job_results.update(runner.resumed_results.items())
+    runner.resumed_results = {}
+    return job_results
+
+
+def _run_jobs(runner, results, timeout, spill=None):
+    """
+    Run the jobs for a :class:`_JobRunner` and return a :class:`Result`.
+
+    :param spill: Whether to write the results to a file rather than holding
+        them in memory, or the path of this file (see :func:`run`).
+    """
+    logger = logging.getLogger(__name__)
+    job_results = _job_results(runner, results, spill)
+
+    try:
+        # Start the worker processes.
+        runner.start()
+
+        # Wait for each worker to finish. Without this loop, we jump straight
+        # to the finally clause and the KeyboardInterrupt handler (below) is
+        # never triggered.
+        for completed, _unsuccessful in runner.collect(timeout):
+            if results:
+                job_results.update(completed)
+
+        logger.debug('Joined all workers')
+    except KeyboardInterrupt:
+        # Force each worker to terminate.
+        msg = 'Received CTRL-C, terminating {} workers'
+        logger.info(msg.format(runner.n_proc))
+        runner.terminate()
+    except Exception:
+        traceback.print_exc()
+    finally:
+        result = runner.finish()
+        if isinstance(job_results, _ResultStore):
+            job_results.flush()
+
+    result.job_results = job_results
+    return result
+
+
+def run(
+    func,
+    iterable,
+    n_proc,
+    fail_early=True,
+    trace=True,
+    level=None,
+    results=False,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    shared_memory=False,
+    initializer=None,
+    initargs=(),
+    lazy_jobs=False,
+    engine='queue',
+    job_timeout=None,
+    retries=0,
+    retry_on=(),
+    respawn=False,
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    checkpoint=None,
+    resume=False,
+    spill=None,
+    start_method=None,
+    preload=(),
+    max_worker_rss=None,
+    max_total_rss=None,
+    max_jobs_per_worker=None,
+    priority=None,
+    cost=None,
+    backend='process',
+):
+    """
+    Perform multiple jobs in parallel by spawning multiple processes.
+
+    :param func: The function that performs a single job.
+    :param iterable: A sequence of job arguments, represented as tuples and
+        *unpacked* before passing to ``func`` (i.e., ``func(*args)``).
+    :param n_proc: The number of processes to spawn.
+    :param fail_early: Whether to stop running jobs if one fails.
+    :param trace: Whether to print stack traces for jobs that raise an
+        exception.
+    :param level: The logging level for worker processes. By default, only
+        warnings and errors will be shown.
+    :param results: Whether to return the results of each job.
+    :param timeout: The optional timeout (in seconds) when waiting for job
+        results. Set this to ``None`` to block until a result is received or
+        a worker process exits.
+    :param chunksize: The number of jobs to send to a worker process in a
+        single message. Set this to ``'auto'`` to adjust the number of jobs
+        based on how long each job takes to complete. Larger chunks reduce
+        the communication overhead for very short jobs.
+    :param max_in_flight: The maximum number of jobs that have been taken from
+        ``iterable`` but not yet completed. By default, all of the jobs are
+        taken from ``iterable`` before any worker processes are spawned. If
+        this is set, jobs are taken from ``iterable`` as they are needed, and
+        ``iterable`` may be an unbounded generator.
+    :param validate: When to check that each job's arguments can be pickled
+        (i.e., sent to a worker process). The default, ``'all'``, checks the
+        arguments of every job before any jobs are run. Use ``'sample'`` to
+        check the arguments of a small number of jobs before any jobs are
+        run, or ``'on_failure'`` to only check arguments when they are added
+        to the job queue. With these settings, only a few chunks of jobs are
+        added to the job queue before the worker processes are spawned, and
+        the remaining jobs are added (and their arguments are pickled) while
+        the jobs are running. When ``max_in_flight`` is set, arguments are
+        always checked when they are added to the job queue. The arguments of
+        each job are only pickled once, regardless of this setting.
+    :param shared_memory: Whether to return the results of each job through
+        shared memory blocks, rather than through the result queue. Each
+        buffer of at least 64 KiB in a job's result (such as a NumPy array,
+        or a ``bytes``, ``bytearray``, or ``memoryview`` value) is copied
+        into its own shared memory block, and NumPy arrays and
+        ``memoryview`` values are returned without copying them again. This
+        is only supported on POSIX platforms, and has no effect if
+        ``results`` is false.
+    :param initializer: An optional function that is called once by each
+        worker process, before it runs any jobs. Use this to provide large,
+        read-only data (such as a lookup table) to every job, rather than
+        including this data in the arguments of each job. If the worker
+        processes are forked, ``initializer`` and ``initargs`` are inherited
+        by each worker process rather than being pickled. If
+        ``initializer`` raises an exception, no more jobs will be run.
+    :param initargs: The arguments for ``initializer``.
+    :param lazy_jobs: Whether the ``successful_jobs`` and
+        ``unsuccessful_jobs`` fields of the returned :class:`Result` should
+        be sequences that look up the arguments of each job as they are
+        accessed, rather than lists. This avoids copying the arguments of
+        every job when there are very many jobs.
+    :param engine: How jobs are sent to the worker processes. The default,
+        ``'queue'``, uses a single job queue and a single result queue that
+        are shared by every worker process. Use ``'pipes'`` to give each
+        worker process its own job queue and result pipe, which avoids
+        contention between the worker processes when there are many worker
+        processes and short jobs. Each chunk of jobs is then sent to the
+        worker process with the fewest chunks in progress.
+    :param job_timeout: The maximum time (in seconds) that a single job may
+        run. If a job exceeds this limit, the worker process that is running
+        it is killed and replaced by a new worker process, and the job is
+        recorded as unsuccessful (and stops the remaining jobs, if
+        ``fail_early`` is true). The other jobs in the same chunk are run
+        again, so jobs should be safe to repeat when ``chunksize`` is greater
+        than one. By default, jobs may run indefinitely.
+    :param retries: The number of times that each job may be run again, if it
+        raises a retryable exception (see ``retry_on``), if it exceeds
+        ``job_timeout``, or if its worker process terminates unexpectedly.
+        The number of times that each job was run is recorded in the
+        ``attempts`` field of the returned :class:`Result`.
+    :param retry_on: The exception type (or tuple of exception types) that
+        are retryable. A job that raises a retryable exception only stops the
+        remaining jobs (if ``fail_early`` is true) once it cannot be run
+        again.
+    :param respawn: Whether to start a new worker process in place of each
+        worker process that is terminated by a signal (e.g., when it runs out
+        of memory), so that the remaining jobs are run by ``n_proc`` worker
+        processes.
+    :param stats: Whether to record the time spent in each phase and by each
+        job, and return these times in the ``stats`` field of the returned
+        :class:`Result` (see :class:`Stats`). This adds a small cost to each
+        job, and requires memory for several numbers per job.
+    :param progress: An optional function that is called with a
+        :class:`Progress` snapshot every ``progress_interval`` seconds while
+        the jobs are running, and once more when the jobs have finished. This
+        is called by the main process, and adds no cost to each job.
+    :param progress_interval: The time (in seconds) between calls to
+        ``progress``.
+    :param checkpoint: The path of an optional checkpoint file, which records
+        the job numbers of the jobs that were completed successfully (and
+        their results, if ``results`` is true) as they are completed. The
+        checkpoint file is written to disk about once per second, and when
+        the jobs have finished or are interrupted.
+    :param resume: Whether to resume a run that was interrupted, by skipping
+        the jobs that were recorded in the ``checkpoint`` file. These jobs
+        are recorded as successful in the returned :class:`Result` (and their
+        recorded results are included, if ``results`` is true). The jobs must
+        be the same, and in the same order, as for the interrupted run; a
+        ``ValueError`` is raised if the ``checkpoint`` file is not a
+        checkpoint file, or if it was written for a different number of
+        jobs. Otherwise, any existing ``checkpoint`` file is replaced.
+    :param spill: Whether to write the result of each job to a file as it is
+        received, rather than holding every result in memory. Set this to
+        ``True`` to use a temporary file, or to the path of the file. The
+        ``job_results`` field of the returned :class:`Result` is then a
+        read-only mapping that loads each result from this file when it is
+        accessed. This file remains open until :meth:`Result.close` is
+        called, or the :class:`Result` is used as a context manager. This has
+        no effect if ``results`` is false.
+    :param start_method: How the worker processes are started: ``'fork'``,
+        ``'spawn'``, or ``'forkserver'`` (see :mod:`multiprocessing`). By
+        default, the default start method of :mod:`multiprocessing` is used.
+        Unless the worker processes are forked, ``func`` must be able to be
+        pickled (i.e., defined at the top level of a module).
+    :param preload: The names of modules that the fork server imports before
+        it starts any worker processes, when ``start_method`` is
+        ``'forkserver'``. Each worker process is forked from the fork server,
+        and so does not need to import these modules itself. The fork server
+        is shared by every run, and these modules are only imported when it
+        is started by the first run that uses it.
+    :param max_worker_rss: The maximum memory use (resident set size, in
+        bytes) of each worker process. A worker process that exceeds this
+        limit is replaced by a new worker process once it has finished its
+        current chunk of jobs. The memory use of each worker process is
+        checked several times per second, and only on platforms that provide
+        ``/proc`` (e.g., Linux).
+    :param max_total_rss: The maximum total memory use (resident set size,
+        in bytes) of the worker processes. When the worker processes exceed
+        this limit, the largest worker process is replaced once it has
+        finished its current chunk of jobs, and the other worker processes do
+        not start any more chunks until the total memory use is below this
+        limit, or until no worker process is running a chunk.
+    :param max_jobs_per_worker: The maximum number of jobs that each worker
+        process runs. A worker process that has run this many jobs exits
+        once it has finished its current chunk of jobs, and is replaced by a
+        new worker process, so that memory leaked by ``func`` does not
+        accumulate for the whole run.
+    :param priority: The priority of each job, as a function that is passed
+        the arguments of a job (as for ``func``) and returns a number, or as
+        a mapping from job numbers to numbers (jobs that are not in the
+        mapping have a priority of zero). Jobs with a higher priority are
+        sent to the worker processes first.
+    :param cost: The expected cost (e.g., duration) of each job, as a
+        function or a mapping (as for ``priority``). Jobs with the same
+        priority are sent to the worker processes in order of decreasing
+        cost, so that the longest jobs are not left until last. A mapping of
+        the durations of each job in a previous run is a good estimate. Use
+        a ``chunksize`` of 1, so that the long jobs are run by different
+        worker processes.
+    :param backend: Where the jobs are run. The default, ``'process'``, runs
+        the jobs in ``n_proc`` worker processes. Use ``'thread'`` to run the
+        jobs in ``n_proc`` threads of this process, which suits jobs that
+        wait for I/O or release the GIL (e.g., NumPy operations and
+        compression), because the function and the arguments and results of
+        each job are not pickled. Use ``'serial'`` to run the jobs one at a
+        time in the calling thread, which suits debugging and very small
+        inputs. Use ``'auto'`` to run the jobs in the calling thread if no
+        more than one job could run at a time (i.e., if there is only one
+        job or ``n_proc`` is 1), and in worker processes otherwise. The
+        ``'thread'`` and ``'serial'`` backends do not support ``engine``,
+        ``job_timeout``, ``respawn``, ``start_method``, ``preload``,
+        ``max_worker_rss``, ``max_total_rss``, or ``max_jobs_per_worker``,
+        and the messages of each job are logged by this module's logger
+        regardless of ``level``. Threads cannot be terminated, and so a
+        KeyboardInterrupt waits for the jobs that are running to finish.
+
+    :raises ValueError: if any job's arguments cannot be pickled, if
+        ``resume`` is true and ``checkpoint`` is not set or cannot be
+        resumed, if ``priority``
+        or ``cost`` is set and ``max_in_flight`` is set, or if ``backend`` is
+        ``'thread'`` or ``'serial'`` and an option that it does not support
+        is set.
+
+    :returns: A :class:`Result` instance.
+    :rtype: parq.Result
+
+    .. note::
+
+       When ``max_in_flight`` is set, the arguments of successful jobs are
+       only retained if ``iterable`` is a sequence (such as a list). If
+       ``iterable`` is any other iterable, such as a generator,
+       ``successful_jobs`` will be ``None``.
+    """
+    # Note: we avoid using multiprocessing.Pool because it does not handle
+    # KeyboardInterrupt exceptions correctly. For details, see:
+    # http://bryceboe.com/2012/02/14/python-multiprocessing-pool-and-keyboardinterrupt-revisited/
+    runner = _JobRunner(
+        func,
+        iterable,
+        n_proc,
         fail_early=fail_early,
         trace=trace,
-        collect_results=results,
+        level=level,
+        results=results,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        shared_memory=shared_memory,
+        initializer=initializer,
+        initargs=initargs,
+        lazy_jobs=lazy_jobs,
+        engine=engine,
+        job_timeout=job_timeout,
+        retries=retries,
+        retry_on=retry_on,
+        respawn=respawn,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        checkpoint=checkpoint,
+        resume=resume,
+        start_method=start_method,
+        preload=preload,
+        max_worker_rss=max_worker_rss,
+        max_total_rss=max_total_rss,
+        max_jobs_per_worker=max_jobs_per_worker,
+        priority=priority,
+        cost=cost,
+        backend=backend,
+    )
+    return _run_jobs(runner, results, timeout, spill)
+
+
+def _imap_runner(
+    func, iterable, n_proc, chunksize=1, max_in_flight=None, **options
+):
+    """
+    Create the :class:`_JobRunner` for :func:`imap` and related functions;
+    any other ``options`` are passed to the :class:`_JobRunner`.
+    """
+    if max_in_flight is None:
+        if isinstance(chunksize, int):
+            per_worker = max(_IMAP_JOBS_PER_WORKER, 2 * chunksize)
+        else:
+            per_worker = _IMAP_JOBS_PER_WORKER
+        max_in_flight = per_worker * max(n_proc, 1)
+    return _JobRunner(
+        func,
+        iterable,
+        n_proc,
+        results=True,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        **options,
     )
-    successful_job_nums = set()
-    job_results = None
 
-    # Add a sentinel value for each worker to consume.
-    for _ in range(n_proc):
-        job_q.put((-1, None), block=False)
+
+class _ResultOrder:
+    """
+    Hold the results of completed jobs until they can be yielded in the
+    order that the jobs were submitted.
+
+    :param feeder: The :class:`_JobFeeder`, which counts the results that
+        are being held as jobs in flight.
+    """
+
+    def __init__(self, feeder):
+        self.feeder = feeder
+        self.buffer = {}
+        self.skipped = set()
+        self.next_num = 0
+
+    def add(self, completed, unsuccessful):
+        """
+        Record the outcomes of a chunk of jobs, and yield each result that
+        can now be yielded in order.
+        """
+        buffer = self.buffer
+        skipped = self.skipped
+        buffer.update(completed)
+        self.feeder.hold(len(completed))
+        skipped.update(unsuccessful)
+        while True:
+            next_num = self.next_num
+            if next_num in buffer:
+                yield (next_num, buffer.pop(next_num))
+                self.feeder.release(1)
+            elif next_num in skipped:
+                skipped.remove(next_num)
+            else:
+                break
+            self.next_num = next_num + 1
+
+    def remaining(self):
+        """
+        Yield any remaining results, in order; these will only exist if
+        some jobs were never run.
+        """
+        buffer = self.buffer
+        for job_num in sorted(buffer):
+            yield (job_num, buffer.pop(job_num))
+
+
+def _imap_results(runner, ordered, timeout, asynchronous=False):
+    """
+    Run the jobs for a :class:`_JobRunner`, and yield a ``(job_num, result)``
+    tuple for each successful job, in the order that the jobs were submitted
+    if ``ordered`` is true. Once exhausted, this returns the :class:`Result`.
+
+    If ``asynchronous`` is true, this also yields each :class:`_Wait` request
+    from :meth:`_JobRunner.collect`, which the caller must complete before
+    resuming this generator (see :func:`_collect_async`).
+    """
+    logger = logging.getLogger(__name__)
+    order = _ResultOrder(runner.feeder) if ordered else None
 
     try:
-        # Start the worker processes.
-        if n_proc > n_jobs:
-            # Spawn no more processes than there are jobs
-            n_proc = n_jobs
-        logger.info('Spawning {} workers for {} jobs'.format(n_proc, n_jobs))
-        for i in range(n_proc):
-            proc = multiprocessing.Process(
-                target=_worker, args=[worker_config], name=f'parq-{i + 1}'
-            )
-            workers.append(proc)
-            proc.start()
-        logger.debug('Started all workers')
+        runner.start()
+        for outcome in runner.collect(timeout, asynchronous=asynchronous):
+            if isinstance(outcome, _Wait):
+                yield outcome
+                continue
+            (completed, unsuccessful) = outcome
+            if order is None:
+                yield from completed
+            else:
+                yield from order.add(completed, unsuccessful)
+        if order is not None:
+            yield from order.remaining()
+    except BaseException:
+        # Force each worker to terminate if the caller stopped iterating
+        # before all of the results were received, or if an exception was
+        # raised (such as KeyboardInterrupt, or the task being cancelled
+        # again while the worker processes were stopping).
+        logger.debug('Terminating {} workers'.format(runner.n_proc))
+        runner.terminate()
+        raise
+    finally:
+        result = runner.finish()
+    return result
 
-        # Wait for each worker to finish. Without this loop, we jump straight
-        # to the finally clause and the KeyboardInterrupt handler (below) is
-        # never triggered.
-        successful_job_nums, job_results = _collect_successful_job_nums(
-            workers, done_q, results, timeout
-        )
 
-        logger.debug('Joined all workers')
-    except KeyboardInterrupt:
-        # Force each worker to terminate.
-        logger.info('Received CTRL-C, terminating {} workers'.format(n_proc))
-        for worker in workers:
-            worker.terminate()
+def _imap(func, iterable, n_proc, ordered, timeout=10, **options):
+    """
+    Yield the results for :func:`imap` and :func:`imap_unordered`; any other
+    ``options`` are passed to :func:`_imap_runner`.
+    """
+    runner = _imap_runner(func, iterable, n_proc, **options)
+    return (yield from _imap_results(runner, ordered, timeout))
+
+
+def imap(
+    func,
+    iterable,
+    n_proc,
+    fail_early=True,
+    trace=True,
+    level=None,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    shared_memory=False,
+    initializer=None,
+    initargs=(),
+    engine='queue',
+    job_timeout=None,
+    retries=0,
+    retry_on=(),
+    respawn=False,
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    start_method=None,
+    preload=(),
+    max_worker_rss=None,
+    max_total_rss=None,
+    max_jobs_per_worker=None,
+):
+    """
+    Perform multiple jobs in parallel by spawning multiple processes, and
+    yield the result of each successful job in the order that the jobs were
+    submitted.
+
+    Jobs are taken from ``iterable`` as they are needed, and results are only
+    held in memory until they can be yielded in order; at most
+    ``max_in_flight`` jobs are queued, running, or waiting to be yielded.
+
+    :param func: The function that performs a single job.
+    :param iterable: An iterable of job arguments, represented as tuples and
+        *unpacked* before passing to ``func`` (i.e., ``func(*args)``).
+    :param n_proc: The number of processes to spawn.
+    :param fail_early: Whether to stop running jobs if one fails.
+    :param trace: Whether to print stack traces for jobs that raise an
+        exception.
+    :param level: The logging level for worker processes. By default, only
+        warnings and errors will be shown.
+    :param timeout: The optional timeout (in seconds) when waiting for job
+        results. Set this to ``None`` to block until a result is received or
+        a worker process exits.
+    :param chunksize: The number of jobs to send to a worker process in a
+        single message (see :func:`run`).
+    :param max_in_flight: The maximum number of jobs that are queued,
+        running, or waiting to be yielded. By default, this is proportional
+        to ``n_proc``.
+    :param validate: This is accepted for consistency with :func:`run`; the
+        arguments of each job are checked when they are added to the job
+        queue.
+    :param shared_memory: Whether to return the results of each job through
+        shared memory blocks (see :func:`run`).
+    :param initializer: An optional function that is called once by each
+        worker process, before it runs any jobs (see :func:`run`).
+    :param initargs: The arguments for ``initializer``.
+    :param engine: How jobs are sent to the worker processes (see
+        :func:`run`).
+    :param job_timeout: The maximum time (in seconds) that a single job may
+        run (see :func:`run`).
+    :param retries: The number of times that each job may be run again (see
+        :func:`run`).
+    :param retry_on: The exception types that are retryable (see
+        :func:`run`).
+    :param respawn: Whether to start a new worker process in place of each
+        worker process that is terminated by a signal (see :func:`run`).
+    :param stats: Whether to record the time spent in each phase and by each
+        job (see :func:`run`).
+    :param progress: An optional function that is called with a
+        :class:`Progress` snapshot while the jobs are running (see
+        :func:`run`).
+    :param progress_interval: The time (in seconds) between calls to
+        ``progress``.
+    :param start_method: How the worker processes are started (see
+        :func:`run`).
+    :param preload: The modules that the fork server imports before it
+        starts the worker processes (see :func:`run`).
+    :param max_worker_rss: The maximum memory use of each worker process
+        (see :func:`run`).
+    :param max_total_rss: The maximum total memory use of the worker
+        processes (see :func:`run`).
+    :param max_jobs_per_worker: The maximum number of jobs that each worker
+        process runs (see :func:`run`).
+
+    :returns: A generator that yields a ``(job_num, result)`` tuple for each
+        successful job. Unsuccessful jobs are skipped. Once exhausted, the
+        generator returns a :class:`Result` instance (which can be obtained
+        with ``yield from``) whose ``job_results`` field is ``None``.
+
+    >>> import parq
+    >>> def double_input(x):
+    ...     return 2 * x
+    >>> job_inputs = [(i,) for i in range(10)]
+    >>> for job_num, result in parq.imap(double_input, job_inputs, n_proc=4):
+    ...     assert result == 2 * job_num
+    """
+    return _imap(
+        func,
+        iterable,
+        n_proc,
+        True,
+        fail_early=fail_early,
+        trace=trace,
+        level=level,
+        timeout=timeout,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        shared_memory=shared_memory,
+        initializer=initializer,
+        initargs=initargs,
+        engine=engine,
+        job_timeout=job_timeout,
+        retries=retries,
+        retry_on=retry_on,
+        respawn=respawn,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        start_method=start_method,
+        preload=preload,
+        max_worker_rss=max_worker_rss,
+        max_total_rss=max_total_rss,
+        max_jobs_per_worker=max_jobs_per_worker,
+    )
+
+
+def imap_unordered(
+    func,
+    iterable,
+    n_proc,
+    fail_early=True,
+    trace=True,
+    level=None,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    shared_memory=False,
+    initializer=None,
+    initargs=(),
+    engine='queue',
+    job_timeout=None,
+    retries=0,
+    retry_on=(),
+    respawn=False,
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    start_method=None,
+    preload=(),
+    max_worker_rss=None,
+    max_total_rss=None,
+    max_jobs_per_worker=None,
+):
+    """
+    Perform multiple jobs in parallel by spawning multiple processes, and
+    yield the result of each successful job as soon as it is received.
+
+    This accepts the same arguments as :func:`imap`, and also returns a
+    generator that yields a ``(job_num, result)`` tuple for each successful
+    job, but results are yielded in the order that the jobs are completed.
+
+    >>> import parq
+    >>> def double_input(x):
+    ...     return 2 * x
+    >>> job_inputs = [(i,) for i in range(10)]
+    >>> results = parq.imap_unordered(double_input, job_inputs, n_proc=4)
+    >>> assert dict(results) == {i: 2 * i for i in range(10)}
+    """
+    return _imap(
+        func,
+        iterable,
+        n_proc,
+        False,
+        fail_early=fail_early,
+        trace=trace,
+        level=level,
+        timeout=timeout,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        shared_memory=shared_memory,
+        initializer=initializer,
+        initargs=initargs,
+        engine=engine,
+        job_timeout=job_timeout,
+        retries=retries,
+        retry_on=retry_on,
+        respawn=respawn,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        start_method=start_method,
+        preload=preload,
+        max_worker_rss=max_worker_rss,
+        max_total_rss=max_total_rss,
+        max_jobs_per_worker=max_jobs_per_worker,
+    )
+
+
+async def _wait_async(request):
+    """
+    Wait until any of the handles in a :class:`_Wait` request are ready, or
+    until its timeout expires, without blocking the running event loop, and
+    record the handles that are ready.
+    """
+    loop = asyncio.get_running_loop()
+    woken = loop.create_future()
+
+    def wake():
+        if not woken.done():
+            woken.set_result(None)
+
+    fds = [
+        handle if isinstance(handle, int) else handle.fileno()
+        for handle in request.handles
+    ]
+    timer = None
+    if request.timeout is not None:
+        timer = loop.call_later(request.timeout, wake)
+    try:
+        for fd in fds:
+            loop.add_reader(fd, wake)
+        await woken
+    finally:
+        for fd in fds:
+            loop.remove_reader(fd)
+        if timer is not None:
+            timer.cancel()
+    request.ready = multiprocessing.connection.wait(request.handles, 0)
+
+
+async def _collect_async(outcomes, stop):
+    """
+    Yield each item from ``outcomes`` other than the :class:`_Wait` requests,
+    which are completed by waiting in the running event loop; ``outcomes``
+    is a generator such as :meth:`_JobRunner.collect` with
+    ``asynchronous=True``.
+
+    If the task is cancelled, ``stop`` is called to ask the worker processes
+    to stop once they have finished their current jobs, and the cancellation
+    is raised once ``outcomes`` is exhausted. If the task is cancelled again,
+    the cancellation is raised immediately.
+    """
+    cancelled = None
+    for outcome in outcomes:
+        if isinstance(outcome, _Wait):
+            try:
+                await _wait_async(outcome)
+            except asyncio.CancelledError as e:
+                if cancelled is not None:
+                    raise
+                cancelled = e
+                stop()
+        elif cancelled is None:
+            yield outcome
+    if cancelled is not None:
+        raise cancelled
+
+
+async def _run_jobs_async(runner, results, timeout, spill=None):
+    """
+    Run the jobs for a :class:`_JobRunner` in the running event loop, and
+    return a :class:`Result`; see :func:`_run_jobs`.
+    """
+    job_results = _job_results(runner, results, spill)
+
+    try:
+        runner.start()
+        outcomes = runner.collect(timeout, asynchronous=True)
+        async for completed, _unsuccessful in _collect_async(
+            outcomes, runner.stop
+        ):
+            if results:
+                job_results.update(completed)
+    except asyncio.CancelledError:
+        runner.terminate()
+        raise
     except Exception:
         traceback.print_exc()
     finally:
-        successful_jobs = [
-            job_table[job_num] for job_num in successful_job_nums
-        ]
-        unsuccessful_jobs = [
-            args
-            for (job_num, args) in job_table.items()
-            if job_num not in successful_job_nums
-        ]
-        n_done = len(successful_jobs)
-        success = n_done == n_jobs
+        result = runner.finish()
+        if isinstance(job_results, _ResultStore):
+            job_results.flush()
 
-        # Wait for each worker to finish.
-        failed_worker_count = 0
-        for ix, worker in enumerate(workers):
-            worker.join()
-            # Note: worker.exitcode should be 0 if it completed successfully.
-            # It will be -N if it was terminated by signal N.
-            # It will apparently be 1 if an exception was raised.
-            # all_good = all_good and worker.exitcode == 0
-            if worker.exitcode != 0:
-                msg = 'Worker {} exit code: {}'
-                logger.info(msg.format(ix, worker.exitcode))
-                failed_worker_count += 1
-
-    return Result(
-        success=success,
-        job_count=n_jobs,
-        successful_jobs=successful_jobs,
-        unsuccessful_jobs=unsuccessful_jobs,
-        failed_worker_count=failed_worker_count,
-        job_results=job_results,
+    result.job_results = job_results
+    return result
+
+
+async def run_async(
+    func,
+    iterable,
+    n_proc,
+    fail_early=True,
+    trace=True,
+    level=None,
+    results=False,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    shared_memory=False,
+    initializer=None,
+    initargs=(),
+    lazy_jobs=False,
+    engine='queue',
+    job_timeout=None,
+    retries=0,
+    retry_on=(),
+    respawn=False,
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    checkpoint=None,
+    resume=False,
+    spill=None,
+    start_method=None,
+    preload=(),
+    max_worker_rss=None,
+    max_total_rss=None,
+    max_jobs_per_worker=None,
+    priority=None,
+    cost=None,
+):
+    """
+    Perform multiple jobs in parallel by spawning multiple processes, without
+    blocking the running event loop.
+
+    This accepts the same arguments as :func:`run`, and returns the same
+    :class:`Result`, but waits for the outcome of each job with the running
+    event loop. If the task is cancelled, the worker processes are asked to
+    stop once they have finished their current jobs, and the cancellation is
+    raised once every worker process has stopped; if the task is cancelled
+    again while waiting for the worker processes to stop, they are
+    terminated immediately.
+
+    .. note::
+
+       The arguments of each job are checked (see ``validate``) and the
+       worker processes are spawned before the first ``await``, which blocks
+       the event loop for this time.
+
+    >>> import asyncio
+    >>> import parq
+    >>> def double_input(x):
+    ...     return 2 * x
+    >>> job_inputs = [(i,) for i in range(10)]
+    >>> result = asyncio.run(
+    ...     parq.run_async(double_input, job_inputs, n_proc=4, results=True)
+    ... )
+    >>> assert result.job_results == {i: 2 * i for i in range(10)}
+    """
+    runner = _JobRunner(
+        func,
+        iterable,
+        n_proc,
+        fail_early=fail_early,
+        trace=trace,
+        level=level,
+        results=results,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        shared_memory=shared_memory,
+        initializer=initializer,
+        initargs=initargs,
+        lazy_jobs=lazy_jobs,
+        engine=engine,
+        job_timeout=job_timeout,
+        retries=retries,
+        retry_on=retry_on,
+        respawn=respawn,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        checkpoint=checkpoint,
+        resume=resume,
+        start_method=start_method,
+        preload=preload,
+        max_worker_rss=max_worker_rss,
+        max_total_rss=max_total_rss,
+        max_jobs_per_worker=max_jobs_per_worker,
+        priority=priority,
+        cost=cost,
+    )
+    return await _run_jobs_async(runner, results, timeout, spill)
+
+
+async def _imap_async(func, iterable, n_proc, ordered, timeout=10, **options):
+    """
+    Yield the results for :func:`imap_async` and :func:`imap_unordered_async`
+    without blocking the running event loop; see :func:`_imap`.
+    """
+    runner = _imap_runner(func, iterable, n_proc, **options)
+    results = _imap_results(runner, ordered, timeout, asynchronous=True)
+    try:
+        async for job_result in _collect_async(results, runner.stop):
+            yield job_result
+    finally:
+        # NOTE: this terminates the worker processes if the caller stopped
+        # iterating before all of the results were received.
+        results.close()
+
+
+def imap_async(
+    func,
+    iterable,
+    n_proc,
+    fail_early=True,
+    trace=True,
+    level=None,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    shared_memory=False,
+    initializer=None,
+    initargs=(),
+    engine='queue',
+    job_timeout=None,
+    retries=0,
+    retry_on=(),
+    respawn=False,
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    start_method=None,
+    preload=(),
+    max_worker_rss=None,
+    max_total_rss=None,
+    max_jobs_per_worker=None,
+):
+    """
+    Perform multiple jobs in parallel by spawning multiple processes, and
+    asynchronously yield the result of each successful job in the order that
+    the jobs were submitted.
+
+    This accepts the same arguments as :func:`imap`, but returns an
+    asynchronous iterator that yields a ``(job_num, result)`` tuple for each
+    successful job, and waits for these results with the running event loop.
+    Cancelling the task stops the worker processes (see :func:`run_async`).
+    The :class:`Result` is not available.
+
+    >>> import asyncio
+    >>> import parq
+    >>> def double_input(x):
+    ...     return 2 * x
+    >>> async def main():
+    ...     job_inputs = [(i,) for i in range(10)]
+    ...     results = parq.imap_async(double_input, job_inputs, n_proc=4)
+    ...     return [result async for (_job_num, result) in results]
+    >>> asyncio.run(main())
+    [0, 2, 4, 6, 8, 10, 12, 14, 16, 18]
+    """
+    return _imap_async(
+        func,
+        iterable,
+        n_proc,
+        True,
+        fail_early=fail_early,
+        trace=trace,
+        level=level,
+        timeout=timeout,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        shared_memory=shared_memory,
+        initializer=initializer,
+        initargs=initargs,
+        engine=engine,
+        job_timeout=job_timeout,
+        retries=retries,
+        retry_on=retry_on,
+        respawn=respawn,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        start_method=start_method,
+        preload=preload,
+        max_worker_rss=max_worker_rss,
+        max_total_rss=max_total_rss,
+        max_jobs_per_worker=max_jobs_per_worker,
+    )
+
+
+def imap_unordered_async(
+    func,
+    iterable,
+    n_proc,
+    fail_early=True,
+    trace=True,
+    level=None,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    shared_memory=False,
+    initializer=None,
+    initargs=(),
+    engine='queue',
+    job_timeout=None,
+    retries=0,
+    retry_on=(),
+    respawn=False,
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    start_method=None,
+    preload=(),
+    max_worker_rss=None,
+    max_total_rss=None,
+    max_jobs_per_worker=None,
+):
+    """
+    Perform multiple jobs in parallel by spawning multiple processes, and
+    asynchronously yield the result of each successful job as soon as it is
+    received.
+
+    This accepts the same arguments as :func:`imap`, and also returns an
+    asynchronous iterator that yields a ``(job_num, result)`` tuple for each
+    successful job (see :func:`imap_async`), but results are yielded in the
+    order that the jobs are completed.
+    """
+    return _imap_async(
+        func,
+        iterable,
+        n_proc,
+        False,
+        fail_early=fail_early,
+        trace=trace,
+        level=level,
+        timeout=timeout,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        shared_memory=shared_memory,
+        initializer=initializer,
+        initargs=initargs,
+        engine=engine,
+        job_timeout=job_timeout,
+        retries=retries,
+        retry_on=retry_on,
+        respawn=respawn,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        start_method=start_method,
+        preload=preload,
+        max_worker_rss=max_worker_rss,
+        max_total_rss=max_total_rss,
+        max_jobs_per_worker=max_jobs_per_worker,
+    )
+
+
+def run_remote(
+    func,
+    iterable,
+    n_proc,
+    address,
+    authkey,
+    fail_early=True,
+    trace=True,
+    level=None,
+    results=False,
+    timeout=10,
+    chunksize=1,
+    max_in_flight=None,
+    validate='all',
+    initializer=None,
+    initargs=(),
+    lazy_jobs=False,
+    retries=0,
+    retry_on=(),
+    stats=False,
+    progress=None,
+    progress_interval=1.0,
+    checkpoint=None,
+    resume=False,
+    spill=None,
+    priority=None,
+    cost=None,
+):
+    """
+    Perform multiple jobs in parallel, using worker processes on other hosts
+    that connect to this process (see :func:`run_worker`).
+
+    This accepts the same arguments as :func:`run`, and returns the same
+    :class:`Result`, except that the worker processes are not spawned by this
+    process. Instead, this process listens for connections from ``n_proc``
+    remote worker processes, and sends chunks of jobs to each worker process
+    as soon as it connects. A remote worker process whose connection is
+    closed before it has finished (e.g., because its host failed) is treated
+    as a worker process that was killed: the chunk that it was running is
+    recorded as unsuccessful (unless its jobs can be run again, see
+    ``retries``) and its other chunks are sent to the other worker
+    processes. If a job fails and ``fail_early`` is true, no more chunks are
+    sent, and each remote worker process stops once it has run the chunks
+    that were already sent to it.
+
+    The job function, its arguments, and their results are pickled, and so
+    ``func`` (and ``initializer``) must be defined at the top level of a
+    module that each remote worker process can import.
+
+    :param address: The ``(host, port)`` address that remote worker processes
+        connect to.
+    :param authkey: The secret key (a byte string) that remote worker
+        processes must provide. Because job arguments are unpickled by the
+        worker processes, and job results by this process, only allow hosts
+        that you trust to connect.
+
+    :raises ValueError: if ``authkey`` is not provided, or for any of the
+        reasons that :func:`run` raises a ``ValueError``.
+
+    .. note::
+
+       This function waits until every job has finished, and so will wait
+       indefinitely if fewer remote worker processes connect than are needed
+       to run the jobs.
+    """
+    runner = _JobRunner(
+        func,
+        iterable,
+        n_proc,
+        fail_early=fail_early,
+        trace=trace,
+        level=level,
+        results=results,
+        chunksize=chunksize,
+        max_in_flight=max_in_flight,
+        validate=validate,
+        initializer=initializer,
+        initargs=initargs,
+        lazy_jobs=lazy_jobs,
+        retries=retries,
+        retry_on=retry_on,
+        stats=stats,
+        progress=progress,
+        progress_interval=progress_interval,
+        checkpoint=checkpoint,
+        resume=resume,
+        priority=priority,
+        cost=cost,
+        address=address,
+        authkey=authkey,
+    )
+    return _run_jobs(runner, results, timeout, spill)
+
+
+def _connect(address, authkey, connect_timeout):
+    """
+    Connect to the main process, trying again until ``connect_timeout``
+    seconds have passed, and return the connection.
+
+    :raises OSError: if the connection could not be established.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return multiprocessing.connection.Client(address, authkey=authkey)
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(_CONNECT_RETRY_INTERVAL)
+
+
+def _remote_worker(address, authkey, connect_timeout):
+    """
+    Connect to the main process and run the chunks of jobs that it sends,
+    until it sends a sentinel or closes the connection.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        conn = _connect(address, authkey, connect_timeout)
+    except OSError as e:
+        logger.warning(f'Could not connect to {address}: {e}')
+        sys.exit(1)
+    try:
+        msg = conn.recv()
+        if msg is None:
+            logger.info('No jobs for this worker')
+            return
+        (slot, config) = msg
+        config = dataclasses.replace(
+            config,
+            in_queue=_PipeReader(conn),
+            out_queue=_PipeWriter(conn),
+            stop_workers=multiprocessing.Value(ctypes.c_bool, False),
+            chunk_slots=[-1] * (slot + 1),
+        )
+        _worker(config, slot)
+    except (EOFError, OSError):
+        logger.warning('Lost the connection to the main process')
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+def run_worker(address, authkey, n_proc=1, connect_timeout=60.0):
+    """
+    Start worker processes that connect to another process and run the jobs
+    that it sends (see :func:`run_remote`), and wait for them to finish.
+
+    :param address: The ``(host, port)`` address of the process that is
+        running the jobs.
+    :param authkey: The secret key (a byte string) for this process.
+    :param n_proc: The number of worker processes to start.
+    :param connect_timeout: The time (in seconds) that each worker process
+        tries to connect for, so that worker processes can be started before
+        the jobs.
+
+    :returns: ``True`` if every worker process finished successfully. Worker
+        processes that connect but are not needed (e.g., because every job
+        has been sent to other worker processes) finish successfully, while
+        worker processes that cannot connect within ``connect_timeout``
+        (e.g., because the jobs finished before they started) do not.
+    """
+    workers = [
+        multiprocessing.Process(
+            target=_remote_worker,
+            args=[address, authkey, connect_timeout],
+            name=f'parq-remote-{i + 1}',
+        )
+        for i in range(n_proc)
+    ]
+    for worker in workers:
+        _start_process(worker)
+    for worker in workers:
+        worker.join()
+    return all(worker.exitcode == 0 for worker in workers)
+
+
+def worker_main(args=None):
+    """
+    Start worker processes that run jobs for :func:`run_remote`; this is the
+    ``parq-worker`` command.
+
+    The secret key is read from the ``PARQ_AUTHKEY`` environment variable,
+    rather than from the command line, where other users could see it.
+    The job function is imported from the current directory or the
+    ``PYTHONPATH``.
+    """
+    parser = argparse.ArgumentParser(
+        prog='parq-worker',
+        description='Run jobs for a parq.run_remote() process.',
+    )
+    parser.add_argument('address', help='the HOST:PORT to connect to')
+    parser.add_argument(
+        '-n',
+        '--processes',
+        type=int,
+        default=os.cpu_count(),
+        help='the number of worker processes',
+    )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=60.0,
+        help='how long to try to connect for (in seconds)',
+    )
+    opts = parser.parse_args(args)
+    (host, _sep, port) = opts.address.rpartition(':')
+    if not host or not port.isdigit():
+        parser.error(f'invalid address: {opts.address}')
+    authkey = os.environ.get('PARQ_AUTHKEY')
+    if not authkey:
+        parser.error('the PARQ_AUTHKEY environment variable is not set')
+    # NOTE: import the job function from the current directory, as for
+    # ``python -m``.
+    sys.path.insert(0, os.getcwd())
+    success = run_worker(
+        (host, int(port)),
+        authkey.encode(),
+        n_proc=opts.processes,
+        connect_timeout=opts.connect_timeout,
     )
+    return 0 if success else 1
@@ -0,0 +1,153 @@
+"""Test cases for running jobs without blocking an event loop."""
+
+import asyncio
+import multiprocessing
+import parq
+import pytest
+import time
+
+
+def double(x):
+    return 2 * x
+
+
+def slow_double(x):
+    time.sleep(0.05)
+    return 2 * x
+
+
+def fail_at_five(x):
+    if x == 5:
+        raise ValueError('Job 5 failed')
+    return x
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_run_async(engine):
+    """
+    Ensure that the results of each job are returned, and that the event
+    loop continues to run other tasks while the jobs are running.
+    """
+    job_count = 40
+    values = [(i,) for i in range(job_count)]
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        ticker = asyncio.create_task(tick())
+        result = await parq.run_async(
+            slow_double, values, n_proc=2, results=True, engine=engine
+        )
+        ticker.cancel()
+        return result
+
+    result = asyncio.run(main())
+    assert result
+    assert result.job_results == {i: 2 * i for i in range(job_count)}
+    # NOTE: the jobs take at least one second to complete.
+    assert len(ticks) > 20
+
+
+def test_run_async_fail_early():
+    """
+    Ensure that the worker processes stop early when a job fails.
+    """
+    values = [(i,) for i in range(100)]
+
+    result = asyncio.run(
+        parq.run_async(fail_at_five, values, n_proc=2, trace=False)
+    )
+    assert not result
+    assert 5 in result.unsuccessful_job_nums()
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_run_async_cancel(engine):
+    """
+    Ensure that cancelling the task stops the worker processes once they
+    have finished their current jobs.
+    """
+    values = [(i,) for i in range(200)]
+
+    async def main():
+        task = asyncio.create_task(
+            parq.run_async(slow_double, values, n_proc=2, engine=engine)
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < 2
+    assert multiprocessing.active_children() == []
+
+
+def test_imap_async():
+    """
+    Ensure that the results are yielded in order, or as they are received.
+    """
+    job_count = 50
+    values = [(i,) for i in range(job_count)]
+
+    async def collect(results):
+        return [job_result async for job_result in results]
+
+    results = asyncio.run(collect(parq.imap_async(double, values, n_proc=3)))
+    assert results == [(i, 2 * i) for i in range(job_count)]
+
+    results = asyncio.run(
+        collect(parq.imap_unordered_async(double, values, n_proc=3))
+    )
+    assert dict(results) == {i: 2 * i for i in range(job_count)}
+
+
+def test_imap_async_stop_early():
+    """
+    Ensure that the worker processes are terminated if the caller stops
+    iterating before all of the results were received.
+    """
+    values = [(i,) for i in range(200)]
+
+    async def main():
+        results = parq.imap_async(slow_double, values, n_proc=2)
+        async for job_num, _result in results:
+            if job_num == 3:
+                break
+        await results.aclose()
+
+    asyncio.run(main())
+    assert multiprocessing.active_children() == []
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_imap_async_cancel(ordered):
+    """
+    Ensure that cancelling a task that is iterating over the results stops
+    the worker processes once they have finished their current jobs.
+    """
+    values = [(i,) for i in range(200)]
+    imap = parq.imap_async if ordered else parq.imap_unordered_async
+    received = []
+
+    async def consume():
+        async for job_result in imap(slow_double, values, n_proc=2):
+            received.append(job_result)
+
+    async def main():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < 2
+    assert 0 < len(received) < len(values)
+    assert multiprocessing.active_children() == []
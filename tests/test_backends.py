@@ -0,0 +1,214 @@
+"""Test cases for running jobs in threads and in the calling thread."""
+
+import os
+import parq
+import pytest
+import threading
+
+
+LOCAL_BACKENDS = ['thread', 'serial']
+
+
+def square(x):
+    return x * x
+
+
+def fail_at_five(x):
+    if x == 5:
+        raise ValueError(f'Job {x} failed')
+    return x
+
+
+def thread_name(x):
+    return threading.current_thread().name
+
+
+def fail_to_initialize():
+    raise ValueError('Cannot initialise')
+
+
+@pytest.mark.parametrize('backend', parq._BACKENDS)
+@pytest.mark.parametrize('chunksize', [1, 4])
+def test_backend_results(backend, chunksize):
+    """
+    Ensure that every backend runs every job and returns the results.
+    """
+    job_count = 40
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        square,
+        values,
+        n_proc=3,
+        results=True,
+        chunksize=chunksize,
+        backend=backend,
+    )
+    assert result
+    assert result.failed_worker_count == 0
+    assert result.successful_jobs == values
+    assert result.job_results == {i: i * i for i in range(job_count)}
+
+
+@pytest.mark.parametrize('backend', parq._BACKENDS)
+def test_backend_fail_early(backend):
+    """
+    Ensure that every backend stops running jobs once a job fails, and
+    records the jobs that were not run as unsuccessful.
+    """
+    values = [(i,) for i in range(20)]
+
+    result = parq.run(
+        fail_at_five, values, n_proc=1, trace=False, backend=backend
+    )
+    assert not result
+    assert list(result.successful_job_nums()) == list(range(5))
+    assert list(result.unsuccessful_job_nums()) == list(range(5, 20))
+    assert result.failed_worker_count == 1
+
+
+@pytest.mark.parametrize('backend', LOCAL_BACKENDS)
+def test_backend_no_pickling(backend):
+    """
+    Ensure that jobs that are run in this process may have arguments and
+    results that cannot be pickled, and that these are not copied.
+    """
+    lock = threading.Lock()
+    values = [(lock,) for _ in range(6)]
+
+    result = parq.run(
+        lambda x: (x, threading.Lock()),
+        values,
+        n_proc=2,
+        results=True,
+        backend=backend,
+    )
+    assert result
+    assert all(arg is lock for (arg, _) in result.job_results.values())
+
+
+@pytest.mark.parametrize('backend', LOCAL_BACKENDS)
+def test_backend_retries(backend):
+    """
+    Ensure that jobs that raise a retryable exception are run again.
+    """
+    attempts = {}
+
+    def flaky(x):
+        attempts[x] = attempts.get(x, 0) + 1
+        if x % 3 == 0 and attempts[x] == 1:
+            raise OSError(f'Job {x} failed')
+        return x
+
+    values = [(i,) for i in range(9)]
+
+    result = parq.run(
+        flaky,
+        values,
+        n_proc=2,
+        trace=False,
+        retries=1,
+        retry_on=OSError,
+        backend=backend,
+    )
+    assert result
+    assert result.attempts == {0: 2, 3: 2, 6: 2}
+
+
+@pytest.mark.parametrize('backend', LOCAL_BACKENDS)
+def test_backend_max_in_flight(backend):
+    """
+    Ensure that jobs can be taken from an unbounded iterable as they are
+    needed.
+    """
+    values = ((i,) for i in range(50))
+
+    result = parq.run(
+        square,
+        values,
+        n_proc=2,
+        results=True,
+        max_in_flight=4,
+        backend=backend,
+    )
+    assert result
+    assert result.job_results == {i: i * i for i in range(50)}
+
+
+def test_thread_backend_threads():
+    """
+    Ensure that the thread backend runs the jobs in ``n_proc`` threads.
+    """
+    values = [(i,) for i in range(40)]
+
+    result = parq.run(
+        thread_name, values, n_proc=4, results=True, backend='thread'
+    )
+    assert result
+    assert set(result.job_results.values()) <= {
+        'parq-1',
+        'parq-2',
+        'parq-3',
+        'parq-4',
+    }
+
+
+@pytest.mark.parametrize(
+    'backend,n_proc,job_count,pid',
+    [
+        ('serial', 4, 10, os.getpid()),
+        ('auto', 4, 1, os.getpid()),
+        ('auto', 1, 10, os.getpid()),
+        ('auto', 4, 10, None),
+    ],
+)
+def test_backend_calling_thread(backend, n_proc, job_count, pid):
+    """
+    Ensure that the serial backend runs the jobs in the calling thread, and
+    that the auto backend only does so when at most one job can run at a
+    time.
+    """
+    values = [() for _ in range(job_count)]
+
+    result = parq.run(
+        os.getpid, values, n_proc=n_proc, results=True, backend=backend
+    )
+    assert result
+    pids = set(result.job_results.values())
+    if pid is None:
+        assert os.getpid() not in pids
+    else:
+        assert pids == {pid}
+
+
+@pytest.mark.parametrize('backend', LOCAL_BACKENDS)
+def test_backend_initializer_fails(backend):
+    """
+    Ensure that no jobs are run if the initializer raises an exception.
+    """
+    values = [(i,) for i in range(10)]
+
+    result = parq.run(
+        square,
+        values,
+        n_proc=2,
+        trace=False,
+        initializer=fail_to_initialize,
+        backend=backend,
+    )
+    assert not result
+    assert result.num_successful() == 0
+    assert result.failed_worker_count > 0
+
+
+def test_invalid_backend():
+    """
+    Ensure that an unknown backend, or an option that the backend does not
+    support, raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid backend'):
+        parq.run(square, [(1,)], n_proc=1, backend='fibers')
+    with pytest.raises(ValueError, match='Cannot use job_timeout'):
+        parq.run(square, [(1,)], n_proc=1, backend='thread', job_timeout=1)
+    with pytest.raises(ValueError, match='Cannot use engine'):
+        parq.run(square, [(1,)], n_proc=1, backend='serial', engine='pipes')
@@ -0,0 +1,210 @@
+"""Test cases for resuming runs from a checkpoint file."""
+
+import os
+import parq
+import pickle
+import pytest
+
+
+def double_unless(x, fail, marker_dir):
+    # Record that this job was run.
+    open(os.path.join(marker_dir, str(x)), 'w').close()
+    if x in fail:
+        raise ValueError(f'Job {x} failed')
+    return 2 * x
+
+
+def run_jobs(tmp_path, fail, job_count=20, **kwargs):
+    marker_dir = tmp_path / 'markers'
+    marker_dir.mkdir(exist_ok=True)
+    for marker in marker_dir.iterdir():
+        marker.unlink()
+    values = [(i, fail, str(marker_dir)) for i in range(job_count)]
+    result = parq.run(
+        double_unless,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        checkpoint=tmp_path / 'checkpoint',
+        **kwargs,
+    )
+    ran = sorted(int(marker.name) for marker in marker_dir.iterdir())
+    return (result, ran)
+
+
+@pytest.mark.parametrize('results', [False, True])
+def test_resume_skips_completed_jobs(tmp_path, results):
+    """
+    Ensure that only the jobs that were not completed are run when a run is
+    resumed, and that the other jobs are recorded as successful.
+    """
+    (result, ran) = run_jobs(tmp_path, {3, 11}, results=results)
+    assert list(result.unsuccessful_job_nums()) == [3, 11]
+    assert ran == list(range(20))
+
+    (result, ran) = run_jobs(tmp_path, set(), results=results, resume=True)
+    assert result
+    assert ran == [3, 11]
+    assert result.num_successful() == 20
+    if results:
+        assert result.job_results == {i: 2 * i for i in range(20)}
+
+    (result, ran) = run_jobs(tmp_path, set(), results=results, resume=True)
+    assert result
+    assert ran == []
+
+
+def test_resume_requires_results(tmp_path):
+    """
+    Ensure that jobs are run again if their results are needed, but were not
+    recorded in the checkpoint file.
+    """
+    (result, ran) = run_jobs(tmp_path, set())
+    assert result
+
+    (result, ran) = run_jobs(tmp_path, set(), results=True, resume=True)
+    assert result
+    assert ran == list(range(20))
+    assert result.job_results == {i: 2 * i for i in range(20)}
+
+
+def test_checkpoint_replaced(tmp_path):
+    """
+    Ensure that an existing checkpoint file is replaced if the run is not
+    being resumed.
+    """
+    run_jobs(tmp_path, set())
+    (result, ran) = run_jobs(tmp_path, {0})
+    assert ran == list(range(20))
+
+    (result, ran) = run_jobs(tmp_path, set(), resume=True)
+    assert result
+    assert ran == [0]
+
+
+def test_resume_partial_record(tmp_path):
+    """
+    Ensure that a record that was only partially written is ignored, and
+    that new records are written after the last complete record.
+    """
+    run_jobs(tmp_path, {5})
+    with open(tmp_path / 'checkpoint', 'ab') as f:
+        f.write(b'\x80\x05\x95')
+
+    (result, ran) = run_jobs(tmp_path, {7}, resume=True)
+    assert ran == [5]
+
+    (result, ran) = run_jobs(tmp_path, set(), resume=True)
+    assert result
+    assert ran == []
+
+
+def test_resume_partial_first_record(tmp_path):
+    """
+    Ensure that a partially-written first record is removed without removing
+    the header of the checkpoint file.
+    """
+    run_jobs(tmp_path, set())
+    path = tmp_path / 'checkpoint'
+    with open(path, 'rb') as f:
+        f.read(len(parq._CHECKPOINT_MAGIC))
+        pickle.load(f)
+        header_size = f.tell()
+    with open(path, 'r+b') as f:
+        f.truncate(header_size + 3)
+
+    (result, ran) = run_jobs(tmp_path, set(), resume=True)
+    assert result
+    assert ran == list(range(20))
+
+    (result, ran) = run_jobs(tmp_path, set(), resume=True)
+    assert result
+    assert ran == []
+
+
+def test_resume_unreadable_record(tmp_path):
+    """
+    Ensure that a record that cannot be read for any other reason raises a
+    ValueError, and that the checkpoint file is not modified.
+    """
+    run_jobs(tmp_path, {5})
+    path = tmp_path / 'checkpoint'
+    with open(path, 'ab') as f:
+        f.write(b'\x80\x04cno_such_module\nname\n.')
+    contents = path.read_bytes()
+
+    with pytest.raises(ValueError, match='Cannot read checkpoint file'):
+        run_jobs(tmp_path, set(), resume=True)
+    assert path.read_bytes() == contents
+
+
+def test_resume_not_a_checkpoint(tmp_path):
+    """
+    Ensure that resuming from a file that is not a checkpoint file raises a
+    ValueError, and that the file is not modified.
+    """
+    path = tmp_path / 'checkpoint'
+    contents = b'job,value\n' + b''.join(
+        f'{i},{2 * i}\n'.encode() for i in range(1000)
+    )
+    path.write_bytes(contents)
+
+    with pytest.raises(ValueError, match='Not a checkpoint file'):
+        run_jobs(tmp_path, set(), resume=True)
+    assert path.read_bytes() == contents
+
+
+def test_resume_different_job_count(tmp_path):
+    """
+    Ensure that resuming from a checkpoint file that was written for a
+    different number of jobs raises a ValueError, and that the file is not
+    modified, even if its last record was only partially written.
+    """
+    run_jobs(tmp_path, {3})
+    path = tmp_path / 'checkpoint'
+    with open(path, 'ab') as f:
+        f.write(b'\x80\x05\x95')
+    contents = path.read_bytes()
+
+    with pytest.raises(ValueError, match='checkpoint of 20 jobs with 25'):
+        run_jobs(tmp_path, set(), job_count=25, resume=True)
+    assert path.read_bytes() == contents
+
+    (result, ran) = run_jobs(tmp_path, set(), resume=True)
+    assert result
+    assert ran == [3]
+
+
+def test_resume_stream(tmp_path):
+    """
+    Ensure that jobs taken from a generator can be skipped when a run is
+    resumed.
+    """
+    marker_dir = tmp_path / 'markers'
+    marker_dir.mkdir()
+    kwargs = {
+        'n_proc': 2,
+        'fail_early': False,
+        'trace': False,
+        'max_in_flight': 4,
+        'checkpoint': tmp_path / 'checkpoint',
+    }
+
+    values = ((i, {2, 9}, str(marker_dir)) for i in range(12))
+    result = parq.run(double_unless, values, **kwargs)
+    assert not result
+
+    values = ((i, set(), str(marker_dir)) for i in range(12))
+    result = parq.run(double_unless, values, resume=True, **kwargs)
+    assert result
+    assert result.job_count == 12
+    assert result.num_successful() == 12
+
+
+def test_resume_without_checkpoint():
+    """
+    Ensure that resuming a run without a checkpoint file raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Cannot resume'):
+        parq.run(double_unless, [(1, set(), '.')], n_proc=1, resume=True)
@@ -0,0 +1,80 @@
+"""Test cases for sending multiple jobs to a worker in a single message."""
+
+import logging
+import parq
+import pytest
+
+
+def test_chunks_results():
+    """
+    Ensure that each job result is recorded when jobs are sent in chunks.
+    """
+    values = [(i,) for i in range(100)]
+
+    def func(x):
+        return 2 * x
+
+    for chunksize in [1, 7, 100, 'auto']:
+        result = parq.run(func, values, 3, results=True, chunksize=chunksize)
+        assert result
+        assert result.num_successful() == 100
+        assert result.job_results == {i: 2 * i for i in range(100)}
+
+
+def test_chunks_failure_late():
+    """
+    Ensure that a failing job only causes that job to be unsuccessful, and
+    that the other jobs in the same chunk are run.
+    """
+
+    def func(x):
+        if x == 3:
+            raise ValueError('x == 3')
+        return x
+
+    values = [(i,) for i in range(20)]
+    result = parq.run(
+        func,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        results=True,
+        chunksize=5,
+        level=logging.ERROR,
+    )
+    assert not result.success
+    assert result.unsuccessful_jobs == [(3,)]
+    assert result.num_successful() == 19
+    assert sorted(result.job_results) == [i for i in range(20) if i != 3]
+
+
+def test_chunks_failure_early():
+    """
+    Ensure that a failing job stops the remaining jobs in the same chunk.
+    """
+
+    def func(x):
+        if x == 3:
+            raise ValueError('x == 3')
+
+    values = [(i,) for i in range(20)]
+    result = parq.run(func, values, n_proc=1, trace=False, chunksize=5)
+    assert not result.success
+    assert result.failed_worker_count == 1
+    assert sorted(result.successful_jobs) == [(0,), (1,), (2,)]
+    assert result.num_unsuccessful() == 17
+
+
+def test_chunks_invalid_size():
+    """
+    Ensure that invalid chunk sizes are reported.
+    """
+
+    def func(x):
+        pass
+
+    values = [(i,) for i in range(10)]
+    for chunksize in [0, -1, 2.5, 'fixed']:
+        with pytest.raises(ValueError, match='Invalid chunksize'):
+            parq.run(func, values, n_proc=2, chunksize=chunksize)
@@ -0,0 +1,122 @@
+"""Test cases for the engines that send jobs to worker processes."""
+
+import os
+import parq
+import pytest
+import time
+
+
+def double(x):
+    return 2 * x
+
+
+def fail_at_five(x):
+    if x == 5:
+        raise ValueError('Job 5 failed')
+    return x
+
+
+@pytest.mark.parametrize('chunksize', [1, 3, 'auto'])
+def test_pipes_results(chunksize):
+    """
+    Ensure that every job is run when each worker process has its own job
+    queue and result pipe.
+    """
+    job_count = 200
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        double,
+        values,
+        n_proc=4,
+        results=True,
+        chunksize=chunksize,
+        engine='pipes',
+    )
+    assert result
+    assert result.failed_worker_count == 0
+    assert result.job_results == {i: 2 * i for i in range(job_count)}
+
+
+def test_pipes_fail_early():
+    """
+    Ensure that the worker processes stop early when a job fails.
+    """
+    values = [(i,) for i in range(100)]
+
+    result = parq.run(
+        fail_at_five, values, n_proc=2, trace=False, engine='pipes'
+    )
+    assert not result
+    assert 5 not in result.successful_job_nums()
+    assert result.num_unsuccessful() >= 1
+    assert result.failed_worker_count == 2
+
+
+def test_pipes_fail_late():
+    """
+    Ensure that the remaining jobs are run when a job fails, if the worker
+    processes do not stop early.
+    """
+    values = [(i,) for i in range(100)]
+
+    result = parq.run(
+        fail_at_five,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        engine='pipes',
+    )
+    assert not result
+    assert list(result.unsuccessful_job_nums()) == [5]
+    assert result.failed_worker_count == 1
+
+
+def test_pipes_kill_worker():
+    """
+    Ensure that only the chunk that a worker process was running is recorded
+    as unsuccessful if the worker process is killed, and that its other
+    chunks are sent to the other worker processes.
+    """
+    n_jobs = 16
+    kill_at = 7
+
+    def func(kill):
+        # NOTE: make each job take a non-zero amount of time to complete.
+        time.sleep(0.01)
+        if kill:
+            os.kill(os.getpid(), 9)
+
+    values = [(i == kill_at,) for i in range(n_jobs)]
+    result = parq.run(func, values, n_proc=2, timeout=1, engine='pipes')
+
+    assert not result
+    assert list(result.unsuccessful_job_nums()) == [kill_at]
+    assert result.failed_worker_count == 1
+
+
+def test_pipes_stream_and_imap():
+    """
+    Ensure that jobs can be taken from a generator, and results yielded as
+    they are received, when each worker process has its own pipes.
+    """
+    job_count = 100
+    values = ((i,) for i in range(job_count))
+    result = parq.run(
+        double, values, n_proc=3, max_in_flight=10, engine='pipes'
+    )
+    assert result
+    assert result.num_successful() == job_count
+
+    values = [(i,) for i in range(job_count)]
+    results = list(parq.imap(double, values, n_proc=3, engine='pipes'))
+    assert results == [(i, 2 * i) for i in range(job_count)]
+
+
+def test_invalid_engine():
+    """
+    Ensure that an unknown engine raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid engine'):
+        parq.run(double, [(1,)], n_proc=1, engine='sockets')
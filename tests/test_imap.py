@@ -0,0 +1,101 @@
+"""Test cases for parq.imap and parq.imap_unordered."""
+
+import parq
+import time
+
+
+def test_imap_ordered():
+    """
+    Ensure that parq.imap yields results in the order that jobs were
+    submitted, even when later jobs are completed first.
+    """
+
+    def func(x):
+        time.sleep(0.001 * (x % 5))
+        return 2 * x
+
+    values = [(i,) for i in range(50)]
+    results = list(parq.imap(func, values, n_proc=4))
+    assert results == [(i, 2 * i) for i in range(50)]
+
+
+def test_imap_unordered():
+    """
+    Ensure that parq.imap_unordered yields the result of every job.
+    """
+
+    def func(x):
+        return 2 * x
+
+    values = ((i,) for i in range(50))
+    results = dict(parq.imap_unordered(func, values, n_proc=4, chunksize=3))
+    assert results == {i: 2 * i for i in range(50)}
+
+
+def test_imap_failure_result():
+    """
+    Ensure that unsuccessful jobs are skipped, and that the generator returns
+    a Result instance once it is exhausted.
+    """
+
+    def func(x):
+        if x == 3:
+            raise ValueError('x == 3')
+        return x
+
+    values = [(i,) for i in range(10)]
+    received = []
+
+    def consume():
+        gen = parq.imap(func, values, n_proc=2, fail_early=False, trace=False)
+        result = yield from gen
+        received.append(result)
+
+    results = list(consume())
+    assert results == [(i, i) for i in range(10) if i != 3]
+    result = received[0]
+    assert not result.success
+    assert result.unsuccessful_jobs == [(3,)]
+    assert result.job_results is None
+
+
+def test_imap_bounded_buffer():
+    """
+    Ensure that only a bounded number of jobs are taken from the iterable
+    while the results wait to be yielded in order.
+    """
+    consumed = []
+    max_in_flight = 6
+
+    def values():
+        for i in range(100):
+            consumed.append(i)
+            yield (i,)
+
+    def func(x):
+        if x == 0:
+            time.sleep(0.5)
+        return x
+
+    gen = parq.imap(func, values(), n_proc=2, max_in_flight=max_in_flight)
+    assert next(gen) == (0, 0)
+    assert len(consumed) <= max_in_flight + 1
+    assert list(gen) == [(i, i) for i in range(1, 100)]
+
+
+def test_imap_stop_early():
+    """
+    Ensure that the worker processes are terminated if the caller stops
+    iterating before all of the results have been received.
+    """
+
+    def func(x):
+        time.sleep(0.01)
+        return x
+
+    values = ((i,) for i in range(1000))
+    gen = parq.imap_unordered(func, values, n_proc=2)
+    next(gen)
+    start = time.perf_counter()
+    gen.close()
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,89 @@
+"""Test cases for initialising each worker process."""
+
+import parq
+
+
+TABLE = None
+
+
+def load_table(size, scale):
+    global TABLE
+    TABLE = [scale * i for i in range(size)]
+
+
+def look_up(x):
+    return TABLE[x]
+
+
+def test_initializer_run():
+    """
+    Ensure that each worker process is initialised before it runs any jobs.
+    """
+    job_count = 20
+    n_proc = 2
+
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        look_up,
+        values,
+        n_proc,
+        results=True,
+        initializer=load_table,
+        initargs=(job_count, 3),
+    )
+    assert result
+    assert result.job_results == {i: 3 * i for i in range(job_count)}
+    # The initializer should not be called by the main process.
+    assert TABLE is None
+
+
+def test_initializer_imap():
+    """
+    Ensure that each worker process is initialised before it runs any jobs
+    for :func:`parq.imap`.
+    """
+    job_count = 20
+    values = [(i,) for i in range(job_count)]
+
+    results = parq.imap(
+        look_up,
+        values,
+        n_proc=2,
+        initializer=load_table,
+        initargs=(job_count, 2),
+    )
+    assert dict(results) == {i: 2 * i for i in range(job_count)}
+
+
+def test_initializer_pool():
+    """
+    Ensure that each worker process in a pool is only initialised once.
+    """
+    job_count = 20
+    values = [(i,) for i in range(job_count)]
+
+    with parq.Pool(2, initializer=load_table, initargs=(job_count, 5)) as p:
+        for _ in range(3):
+            result = p.run(look_up, values, results=True)
+            assert result
+            assert result.job_results == {i: 5 * i for i in range(job_count)}
+
+
+def test_initializer_fails():
+    """
+    Ensure that no jobs are run if the initializer raises an exception.
+    """
+    n_proc = 2
+    values = [(i,) for i in range(20)]
+
+    def fail():
+        raise ValueError('Cannot initialise worker')
+
+    result = parq.run(
+        look_up, values, n_proc, trace=False, initializer=fail, timeout=1
+    )
+    assert not result
+    assert result.num_successful() == 0
+    assert result.num_unsuccessful() == len(values)
+    assert result.failed_worker_count == n_proc
@@ -1,5 +1,25 @@
 import pytest
 import parq
+import time
+
+
+PICKLED = []
+"""The job numbers whose arguments were pickled by the main process."""
+
+
+class Recorded:
+    """An argument that records when it is pickled."""
+
+    def __init__(self, job_num):
+        self.job_num = job_num
+
+    def __reduce__(self):
+        PICKLED.append(self.job_num)
+        return (Recorded, (self.job_num,))
+
+
+def wait_briefly(arg):
+    time.sleep(0.005)
 
 
 def test_invalid_args_exception():
@@ -27,3 +47,79 @@ def test_invalid_args_exception():
     values = [({'x': {'y': {'z': cannot_pickle}}},) for i in range(4)]
     with pytest.raises(ValueError, match='Invalid arguments:'):
         parq.run(func, values, n_proc=n_proc)
+
+
+@pytest.mark.parametrize('validate', ['sample', 'on_failure'])
+def test_invalid_args_deferred_validation(validate):
+    """
+    Test that arguments that cannot be pickled are still reported when they
+    are not checked before the jobs are run.
+    """
+
+    def func(*args):
+        pass
+
+    def cannot_pickle():
+        pass
+
+    values = [(i,) for i in range(50)] + [(50, cannot_pickle)]
+    with pytest.raises(ValueError, match='Invalid arguments:'):
+        parq.run(func, values, n_proc=2, validate=validate)
+
+
+@pytest.mark.parametrize('validate', ['all', 'sample', 'on_failure'])
+def test_valid_args_each_validation_mode(validate):
+    """
+    Test that every job is run successfully with each validation mode.
+    """
+
+    def func(x, params):
+        assert params['x'] == x
+
+    values = [(i, {'x': i}) for i in range(40)]
+    result = parq.run(func, values, n_proc=2, validate=validate)
+    assert result
+    assert result.num_successful() == len(values)
+
+
+def test_invalid_validate_mode():
+    """
+    Test that an unknown validation mode raises a ValueError.
+    """
+
+    def func(x):
+        pass
+
+    with pytest.raises(ValueError, match='Invalid validate'):
+        parq.run(func, [(1,)], n_proc=1, validate='never')
+
+
+@pytest.mark.parametrize('validate', ['all', 'sample', 'on_failure'])
+def test_deferred_validation_pickles_later(validate):
+    """
+    Test that the arguments of jobs that are not checked before the jobs are
+    run are only pickled once the worker processes have started.
+    """
+    job_count = 200
+    values = [(Recorded(i),) for i in range(job_count)]
+    PICKLED.clear()
+    pickled_at_start = []
+
+    def progress(report):
+        if not pickled_at_start:
+            pickled_at_start.append(len(PICKLED))
+
+    result = parq.run(
+        wait_briefly,
+        values,
+        n_proc=2,
+        validate=validate,
+        progress=progress,
+        progress_interval=0.01,
+    )
+    assert result
+    assert sorted(PICKLED) == list(range(job_count))
+    if validate == 'all':
+        assert pickled_at_start == [job_count]
+    else:
+        assert pickled_at_start[0] < job_count // 2
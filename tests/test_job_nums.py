@@ -0,0 +1,100 @@
+"""Test cases for recording the job numbers of successful jobs."""
+
+import parq
+import pytest
+
+
+def fail_if_multiple_of_five(x):
+    if x % 5 == 0:
+        raise ValueError(f'Job {x} failed')
+
+
+def test_job_nums():
+    """
+    Ensure that the successful and unsuccessful job numbers are reported in
+    ascending order.
+    """
+    job_count = 40
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        fail_if_multiple_of_five,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        chunksize=3,
+    )
+    assert not result
+    failed = [i for i in range(job_count) if i % 5 == 0]
+    passed = [i for i in range(job_count) if i % 5 != 0]
+    assert list(result.unsuccessful_job_nums()) == failed
+    assert list(result.successful_job_nums()) == passed
+    assert result.successful_jobs == [(i,) for i in passed]
+    assert result.unsuccessful_jobs == [(i,) for i in failed]
+    assert result.num_successful() == len(passed)
+    assert result.num_unsuccessful() == len(failed)
+
+
+def test_lazy_jobs():
+    """
+    Ensure that the arguments of successful and unsuccessful jobs can be
+    looked up as they are accessed.
+    """
+    job_count = 40
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        fail_if_multiple_of_five,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        lazy_jobs=True,
+    )
+    assert not result
+    passed = [(i,) for i in range(job_count) if i % 5 != 0]
+    failed = [(i,) for i in range(job_count) if i % 5 == 0]
+    assert not isinstance(result.successful_jobs, list)
+    assert len(result.successful_jobs) == len(passed)
+    assert len(result.unsuccessful_jobs) == len(failed)
+    assert result.successful_jobs == passed
+    assert list(result.unsuccessful_jobs) == failed
+    assert result.successful_jobs[0] == passed[0]
+    assert result.successful_jobs[-1] == passed[-1]
+    assert result.unsuccessful_jobs[1:3] == failed[1:3]
+    with pytest.raises(IndexError):
+        result.unsuccessful_jobs[len(failed)]
+
+
+def test_job_nums_generator():
+    """
+    Ensure that the job numbers are recorded when the job arguments are not
+    retained.
+    """
+    job_count = 40
+    values = ((i,) for i in range(job_count))
+
+    result = parq.run(
+        fail_if_multiple_of_five,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        max_in_flight=8,
+    )
+    assert result.successful_jobs is None
+    assert list(result.unsuccessful_job_nums()) == list(range(0, 40, 5))
+    assert result.num_successful() == 32
+
+
+def test_job_nums_not_recorded():
+    """
+    Ensure that a Result that was created without the job numbers reports
+    that they are unavailable.
+    """
+    result = parq.Result(True, 0, [], [], 0)
+    with pytest.raises(ValueError, match='not recorded'):
+        result.successful_job_nums()
+    with pytest.raises(ValueError, match='not recorded'):
+        result.unsuccessful_job_nums()
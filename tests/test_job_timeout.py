@@ -0,0 +1,104 @@
+"""Test cases for killing worker processes whose jobs exceed a timeout."""
+
+import parq
+import pytest
+import time
+
+
+def sleep_at(x, slow):
+    if x in slow:
+        time.sleep(60)
+    return x
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+@pytest.mark.parametrize('chunksize', [1, 4])
+def test_job_timeout(engine, chunksize):
+    """
+    Ensure that a job that exceeds the job timeout is recorded as
+    unsuccessful, and that every other job is run by the remaining worker
+    processes and the worker process that replaced the killed one.
+    """
+    job_count = 20
+    slow = {3, 14}
+    values = [(i, slow) for i in range(job_count)]
+
+    start = time.perf_counter()
+    result = parq.run(
+        sleep_at,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        results=True,
+        chunksize=chunksize,
+        engine=engine,
+        job_timeout=0.5,
+    )
+    assert time.perf_counter() - start < 10
+    assert not result
+    assert list(result.unsuccessful_job_nums()) == sorted(slow)
+    assert result.unsuccessful_jobs == [(i, slow) for i in sorted(slow)]
+    assert result.job_results == {
+        i: i for i in range(job_count) if i not in slow
+    }
+    assert result.failed_worker_count == len(slow)
+
+
+def test_job_timeout_fail_early():
+    """
+    Ensure that a job that exceeds the job timeout stops the remaining jobs,
+    if the worker processes stop early.
+    """
+    values = [(i, {0}) for i in range(20)]
+
+    result = parq.run(
+        sleep_at, values, n_proc=1, trace=False, job_timeout=0.5
+    )
+    assert not result
+    assert 0 in result.unsuccessful_job_nums()
+    assert result.failed_worker_count == 1
+
+
+def test_job_timeout_imap():
+    """
+    Ensure that the results of the other jobs are yielded in order when a job
+    exceeds the job timeout.
+    """
+    values = [(i, {5}) for i in range(12)]
+
+    results = parq.imap(
+        sleep_at,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        job_timeout=0.5,
+    )
+    assert list(results) == [(i, i) for i in range(12) if i != 5]
+
+
+def test_job_timeout_pool():
+    """
+    Ensure that a pool replaces a worker process whose job exceeded the job
+    timeout, and that the pool can run more jobs afterwards.
+    """
+    with parq.Pool(2) as pool:
+        values = [(i, {2}) for i in range(10)]
+        result = pool.run(
+            sleep_at, values, fail_early=False, trace=False, job_timeout=0.5
+        )
+        assert list(result.unsuccessful_job_nums()) == [2]
+
+        values = [(i, set()) for i in range(10)]
+        result = pool.run(sleep_at, values, results=True, job_timeout=0.5)
+        assert result
+        assert result.job_results == {i: i for i in range(10)}
+
+
+def test_invalid_job_timeout():
+    """
+    Ensure that a job timeout that is not positive raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid job_timeout'):
+        parq.run(sleep_at, [(1, set())], n_proc=1, job_timeout=0)
@@ -2,6 +2,7 @@
 
 import os
 import parq
+import pytest
 import time
 
 
@@ -65,3 +66,33 @@ def test_kill_worker_all():
     assert len(result.successful_jobs) <= kill_from
     assert len(result.unsuccessful_jobs) >= (n_jobs - kill_from)
     assert result.failed_worker_count == n_proc
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_kill_worker_no_timeout(engine):
+    """
+    Kill all worker processes when waiting for job results without a
+    timeout, and ensure that the worker processes are detected as soon as
+    they exit.
+    """
+
+    def func(kill):
+        time.sleep(0.01)
+        if kill:
+            os.kill(os.getpid(), 9)
+
+    n_proc = 2
+    n_jobs = 16
+    kill_from = 7
+
+    values = [(i >= kill_from,) for i in range(n_jobs)]
+
+    start = time.perf_counter()
+    result = parq.run(
+        func, values, n_proc=n_proc, timeout=None, engine=engine
+    )
+    assert time.perf_counter() - start < 5
+
+    assert not result.success
+    assert len(result.unsuccessful_jobs) >= (n_jobs - kill_from)
+    assert result.failed_worker_count == n_proc
@@ -0,0 +1,60 @@
+"""Test cases for replacing worker processes after a number of jobs."""
+
+import collections
+import os
+import parq
+import pytest
+
+
+def worker_pid(x):
+    return os.getpid()
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+@pytest.mark.parametrize('chunksize', [1, 3])
+def test_max_jobs_per_worker(engine, chunksize):
+    """
+    Ensure that each worker process runs at most the maximum number of jobs
+    (plus the remainder of its last chunk), and that every job is run by the
+    worker processes that replace them.
+    """
+    job_count = 60
+    max_jobs = 5
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        worker_pid,
+        values,
+        n_proc=2,
+        results=True,
+        chunksize=chunksize,
+        engine=engine,
+        max_jobs_per_worker=max_jobs,
+    )
+    assert result
+    assert result.failed_worker_count == 0
+    assert sorted(result.job_results) == list(range(job_count))
+    jobs_per_pid = collections.Counter(result.job_results.values())
+    assert max(jobs_per_pid.values()) <= max_jobs + chunksize - 1
+    assert len(jobs_per_pid) >= job_count // (max_jobs + chunksize - 1)
+    assert os.getpid() not in jobs_per_pid
+
+
+def test_max_jobs_per_worker_imap():
+    """
+    Ensure that the results are yielded in order when worker processes are
+    replaced.
+    """
+    values = [(i,) for i in range(30)]
+
+    results = parq.imap(worker_pid, values, n_proc=3, max_jobs_per_worker=2)
+    assert [job_num for (job_num, _) in results] == list(range(30))
+
+
+def test_invalid_max_jobs_per_worker():
+    """
+    Ensure that a maximum number of jobs that is not positive raises a
+    ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid max_jobs_per_worker'):
+        parq.run(worker_pid, [(1,)], n_proc=1, max_jobs_per_worker=0)
@@ -0,0 +1,127 @@
+"""Test cases for limiting the memory use of the worker processes."""
+
+import os
+import parq
+import pytest
+import sys
+import time
+
+
+MIB = 1024 * 1024
+
+LEAKED = []
+"""The memory that each job leaks, which is retained by its worker."""
+
+
+def leak(size):
+    LEAKED.append(bytearray(size))
+    time.sleep(0.05)
+    return os.getpid()
+
+
+requires_proc = pytest.mark.skipif(
+    not sys.platform.startswith('linux'), reason='Requires /proc'
+)
+
+
+@requires_proc
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_max_worker_rss(engine):
+    """
+    Ensure that worker processes that exceed the memory limit are replaced,
+    and that every job is completed.
+    """
+    job_count = 30
+    values = [(16 * MIB,) for _ in range(job_count)]
+
+    result = parq.run(
+        leak,
+        values,
+        n_proc=2,
+        results=True,
+        engine=engine,
+        max_worker_rss=80 * MIB,
+    )
+    assert result
+    assert result.num_successful() == job_count
+    assert result.failed_worker_count == 0
+    assert len(set(result.job_results.values())) > 2
+
+
+@requires_proc
+def test_max_total_rss():
+    """
+    Ensure that the largest worker process is replaced when the worker
+    processes exceed the total memory limit, and that every job is
+    completed.
+    """
+    job_count = 30
+    values = [(16 * MIB,) for _ in range(job_count)]
+
+    result = parq.run(
+        leak, values, n_proc=3, results=True, max_total_rss=160 * MIB
+    )
+    assert result
+    assert result.num_successful() == job_count
+    assert result.failed_worker_count == 0
+    assert len(set(result.job_results.values())) > 3
+
+
+def worker_rss():
+    return parq._process_rss(os.getpid())
+
+
+def leak_once(size, duration):
+    LEAKED.append(bytearray(size))
+    # NOTE: touch each page, so that it is included in the resident set.
+    LEAKED[-1][::4096] = b'x' * len(range(0, size, 4096))
+    time.sleep(duration)
+    return os.getpid()
+
+
+@requires_proc
+def test_max_total_rss_single_overage():
+    """
+    Ensure that a single worker process that takes the total memory use over
+    the limit is the only worker process that is replaced, rather than
+    every worker process being replaced while it exits.
+    """
+    n_proc = 4
+    result = parq.run(
+        worker_rss, [() for _ in range(n_proc)], n_proc, results=True
+    )
+    baseline = n_proc * max(result.job_results.values())
+    values = [(80 * MIB if i == 0 else 0, 0.2) for i in range(12)]
+
+    result = parq.run(
+        leak_once,
+        values,
+        n_proc,
+        results=True,
+        max_total_rss=baseline + 40 * MIB,
+    )
+    assert result
+    assert result.failed_worker_count == 0
+    assert len(set(result.job_results.values())) <= n_proc + 1
+
+
+@requires_proc
+def test_memory_limits_imap():
+    """
+    Ensure that the results are yielded in order when worker processes are
+    replaced.
+    """
+    values = [(16 * MIB,) for _ in range(20)]
+
+    results = parq.imap(leak, values, n_proc=2, max_worker_rss=80 * MIB)
+    assert [job_num for (job_num, _pid) in results] == list(range(20))
+
+
+def test_invalid_memory_limits():
+    """
+    Ensure that memory limits that are not positive raise a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid max_worker_rss'):
+        parq.run(leak, [(1,)], n_proc=1, max_worker_rss=0)
+    with pytest.raises(ValueError, match='Invalid max_total_rss'):
+        parq.run(leak, [(1,)], n_proc=1, max_total_rss=-1)
@@ -0,0 +1,119 @@
+"""Test cases for ordering jobs by priority and expected cost."""
+
+import parq
+import pytest
+import time
+
+
+def start_time(x):
+    return time.monotonic_ns()
+
+
+def fail_at_twos(x):
+    if x % 6 == 2:
+        raise ValueError(f'Job {x} failed')
+    return x
+
+
+def run_order(result):
+    # Return the job numbers in the order that the jobs were started.
+    return sorted(result.job_results, key=result.job_results.get)
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_cost_order(engine):
+    """
+    Ensure that the jobs with the highest expected cost are run first, and
+    that jobs with the same cost are run in order of job number.
+    """
+    values = [(i,) for i in range(10)]
+
+    result = parq.run(
+        start_time,
+        values,
+        n_proc=1,
+        results=True,
+        engine=engine,
+        cost=lambda x: x % 3,
+    )
+    assert result
+    assert run_order(result) == [2, 5, 8, 1, 4, 7, 0, 3, 6, 9]
+
+
+def test_priority_before_cost():
+    """
+    Ensure that jobs are ordered by priority before cost, and that priorities
+    and costs can be provided as mappings from job numbers.
+    """
+    values = [(i,) for i in range(6)]
+
+    result = parq.run(
+        start_time,
+        values,
+        n_proc=1,
+        results=True,
+        priority={4: 1, 5: 1},
+        cost={0: 2.5, 3: 1.0, 5: 0.5},
+    )
+    assert result
+    assert run_order(result) == [5, 4, 0, 3, 1, 2]
+
+
+def test_ordered_chunks():
+    """
+    Ensure that the outcomes of chunks of jobs that are not in order of job
+    number are recorded correctly, including chunks whose first and last job
+    numbers are as for a chunk of consecutive jobs.
+    """
+    job_count = 60
+    values = [(i,) for i in range(job_count)]
+    # Run the jobs in the order 0, 4, 2, 1, 5, 3, 6, 10, 8, ...
+    order = [
+        block + offset
+        for block in range(0, job_count, 6)
+        for offset in [0, 4, 2, 1, 5, 3]
+    ]
+    cost = {job_num: -index for (index, job_num) in enumerate(order)}
+    failed = [i for i in range(job_count) if i % 6 == 2]
+    snapshots = []
+
+    result = parq.run(
+        fail_at_twos,
+        values,
+        n_proc=1,
+        fail_early=False,
+        trace=False,
+        results=True,
+        chunksize=3,
+        progress=snapshots.append,
+        cost=cost,
+    )
+    assert not result
+    assert snapshots[-1].failed == len(failed)
+    assert list(result.unsuccessful_job_nums()) == failed
+    assert result.job_results == {
+        i: i for i in range(job_count) if i not in failed
+    }
+
+
+def test_pool_cost_order():
+    """
+    Ensure that jobs submitted to a pool are ordered by expected cost.
+    """
+    values = [(i,) for i in range(5)]
+
+    with parq.Pool(1) as pool:
+        result = pool.run(start_time, values, results=True, cost=lambda x: x)
+        assert result
+        assert run_order(result) == [4, 3, 2, 1, 0]
+
+
+def test_order_with_max_in_flight():
+    """
+    Ensure that ordering jobs that are taken from the iterable as they are
+    needed raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Cannot order jobs'):
+        parq.run(
+            start_time, [(1,)], n_proc=1, max_in_flight=4, cost=lambda x: x
+        )
@@ -0,0 +1,56 @@
+"""Test cases for the overhead of running each job."""
+
+import logging
+import parq
+import time
+
+
+OVERHEAD_BUDGET = 20e-6
+"""The maximum overhead (in seconds) of running each job."""
+
+
+class Unprintable:
+    """A job argument that cannot be formatted as a string."""
+
+    def __str__(self):
+        raise ValueError('Cannot format this argument')
+
+    __repr__ = __str__
+
+
+def accept(arg):
+    pass
+
+
+def no_op():
+    pass
+
+
+def test_arguments_not_formatted():
+    """
+    Ensure that the arguments of each job are only formatted for debugging
+    messages when these messages are logged.
+    """
+    values = [(Unprintable(),) for _ in range(10)]
+
+    result = parq.run(accept, values, n_proc=2)
+    assert result
+
+    result = parq.run(
+        accept, values, n_proc=2, trace=False, level=logging.DEBUG
+    )
+    assert not result
+
+
+def test_overhead_budget():
+    """
+    Ensure that the overhead of running one million jobs that do nothing is
+    within the budget.
+    """
+    n_jobs = 1_000_000
+
+    start = time.perf_counter()
+    result = parq.run(no_op, [()] * n_jobs, n_proc=1, chunksize=1000)
+    elapsed = time.perf_counter() - start
+    assert result
+    assert elapsed / n_jobs < OVERHEAD_BUDGET
@@ -0,0 +1,158 @@
+"""Test cases for parq.Pool."""
+
+import logging
+import multiprocessing
+import os
+import parq
+import pytest
+import signal
+import sys
+import time
+
+
+def double(x):
+    return 2 * x
+
+
+def fail_at_three(x):
+    if x == 3:
+        raise ValueError('x == 3')
+    return x
+
+
+def kill_if(kill):
+    # NOTE: make each job take a non-zero amount of time to complete.
+    time.sleep(0.01)
+    if kill:
+        os.kill(os.getpid(), 9)
+
+
+def interrupt_at_five(n, pid):
+    if n == 5:
+        os.kill(pid, signal.SIGINT)
+
+
+def test_pool_many_submissions():
+    """
+    Ensure that a pool can run many submissions with the same workers.
+    """
+    with parq.Pool(n_proc=3) as pool:
+        pids = [worker.pid for worker in pool.workers]
+        for n in range(1, 20):
+            values = [(i,) for i in range(n)]
+            result = pool.run(double, values, results=True, chunksize=2)
+            assert result
+            assert result.job_count == n
+            assert result.num_successful() == n
+            assert result.job_results == {i: 2 * i for i in range(n)}
+        assert [worker.pid for worker in pool.workers] == pids
+    assert pool.workers == []
+
+
+def test_pool_fail_early_scope():
+    """
+    Ensure that a failing job only stops the jobs in the same submission.
+    """
+    values = [(i,) for i in range(50)]
+    with parq.Pool(n_proc=2) as pool:
+        result = pool.run(fail_at_three, values, trace=False)
+        assert not result.success
+        assert (3,) in result.unsuccessful_jobs
+        assert result.failed_worker_count == 2
+
+        result = pool.run(double, values, trace=False)
+        assert result.success
+        assert result.num_successful() == 50
+        assert result.failed_worker_count == 0
+
+        result = pool.run(
+            fail_at_three, values, fail_early=False, trace=False
+        )
+        assert not result.success
+        assert result.unsuccessful_jobs == [(3,)]
+        assert result.failed_worker_count == 1
+
+
+def test_pool_killed_worker():
+    """
+    Ensure that the pool replaces its workers if a worker is killed.
+    """
+    values = [(i == 7,) for i in range(16)]
+    with parq.Pool(n_proc=2) as pool:
+        result = pool.run(kill_if, values, timeout=1)
+        assert not result.success
+        assert result.unsuccessful_jobs == [(True,)]
+        assert result.failed_worker_count == 1
+
+        values = [(False,) for i in range(16)]
+        result = pool.run(kill_if, values, timeout=1)
+        assert result.success
+        assert len(pool.workers) == 2
+
+
+def test_pool_stream():
+    """
+    Ensure that a pool can take jobs from a generator.
+    """
+    with parq.Pool(n_proc=2) as pool:
+        values = ((i,) for i in range(100))
+        result = pool.run(double, values, results=True, max_in_flight=5)
+        assert result
+        assert result.job_results == {i: 2 * i for i in range(100)}
+
+
+def test_pool_invalid_function():
+    """
+    Ensure that job functions that cannot be pickled are reported.
+    """
+
+    def func(x):
+        pass
+
+    with parq.Pool(n_proc=2) as pool:
+        with pytest.raises(ValueError, match='Invalid function:'):
+            pool.run(func, [(1,), (2,)])
+
+
+def test_pool_closed():
+    """
+    Ensure that jobs cannot be submitted to a closed pool.
+    """
+    pool = parq.Pool(n_proc=2)
+    assert pool.run(double, [(1,), (2,)])
+    pool.close()
+    with pytest.raises(ValueError, match='Pool is closed'):
+        pool.run(double, [(1,), (2,)])
+
+
+def test_pool_ctrl_c_handled():
+    """
+    Test that Pool.run() handles Ctrl+C events as expected.
+    """
+
+    def run_pool(count):
+        logger = multiprocessing.log_to_stderr()
+        logger.setLevel(logging.WARNING)
+
+        pid = os.getpid()
+        values = [(i, pid) for i in range(count)]
+        with parq.Pool(n_proc=3) as pool:
+            success = pool.run(interrupt_at_five, values)
+            # Ensure that the pool can be used after Ctrl+C.
+            assert pool.run(double, [(i,) for i in range(10)])
+        if success:
+            sys.exit(0)
+        else:
+            sys.exit(42)
+
+    # Ensure that Ctrl+C causes the workers to fail.
+    proc = multiprocessing.Process(target=run_pool, args=[20])
+    proc.start()
+    proc.join()
+    assert proc.exitcode == 42
+
+    # Ensure that without Ctrl+C the workers succeed.
+    proc = multiprocessing.Process(target=run_pool, args=[4])
+    proc.start()
+    proc.join()
+    assert proc.exitcode == 0
@@ -0,0 +1,161 @@
+"""Test cases for reporting the progress of running jobs."""
+
+import parq
+import pytest
+import time
+
+
+def slow_double(x):
+    time.sleep(0.01)
+    return 2 * x
+
+
+def fail_at_five(x):
+    if x == 5:
+        raise ValueError('Job 5 failed')
+    return x
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_progress_reports(engine):
+    """
+    Ensure that the progress callback is called while the jobs are running,
+    and that the final report accounts for every job.
+    """
+    job_count = 50
+    values = [(i,) for i in range(job_count)]
+    reports = []
+
+    result = parq.run(
+        slow_double,
+        values,
+        n_proc=2,
+        engine=engine,
+        progress=reports.append,
+        progress_interval=0.05,
+    )
+    assert result
+    assert len(reports) >= 2
+    assert all(isinstance(r, parq.Progress) for r in reports)
+    completed = [r.completed for r in reports]
+    assert completed == sorted(completed)
+
+    final = reports[-1]
+    assert final.completed == job_count
+    assert final.failed == 0
+    assert final.in_flight == 0
+    assert final.job_count == job_count
+    assert final.rate > 0
+    assert final.eta == 0
+
+
+def test_progress_failures():
+    """
+    Ensure that the final report counts the jobs that failed.
+    """
+    values = [(i,) for i in range(10)]
+    reports = []
+
+    result = parq.run(
+        fail_at_five,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        progress=reports.append,
+    )
+    assert not result
+    assert reports[-1].completed == 9
+    assert reports[-1].failed == 1
+
+
+def test_progress_resume(tmp_path):
+    """
+    Ensure that jobs that were completed before a run was resumed are
+    counted as completed, but are not included in the rate.
+    """
+    job_count = 100
+    values = [(i,) for i in range(job_count)]
+    checkpoint = tmp_path / 'checkpoint'
+    # NOTE: the jobs with no arguments to slow_double are unsuccessful.
+    partial = values[:90] + [()] * 10
+    parq.run(
+        slow_double,
+        partial,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        checkpoint=checkpoint,
+    )
+    reports = []
+
+    result = parq.run(
+        slow_double,
+        values,
+        n_proc=2,
+        checkpoint=checkpoint,
+        resume=True,
+        progress=reports.append,
+        progress_interval=0.02,
+    )
+    assert result
+    assert all(r.completed >= 90 for r in reports)
+    # NOTE: each job takes at least 10ms, and so two worker processes can
+    # finish at most 200 jobs per second.
+    assert all(r.rate <= 200 for r in reports)
+    final = reports[-1]
+    assert final.completed == job_count
+    assert final.eta == 0
+
+
+def test_progress_stream():
+    """
+    Ensure that the number of jobs is reported once every job has been taken
+    from a generator.
+    """
+    values = ((i,) for i in range(30))
+    reports = []
+
+    result = parq.run(
+        slow_double,
+        values,
+        n_proc=2,
+        max_in_flight=4,
+        progress=reports.append,
+        progress_interval=0.02,
+    )
+    assert result
+    assert reports[-1].job_count == 30
+    assert reports[-1].completed == 30
+
+
+def test_progress_worker_rss():
+    """
+    Ensure that the memory use of each running worker process is reported.
+    """
+    values = [(i,) for i in range(40)]
+    reports = []
+
+    parq.run(
+        slow_double,
+        values,
+        n_proc=2,
+        progress=reports.append,
+        progress_interval=0.05,
+    )
+    sizes = [
+        rss for r in reports[:-1] for rss in r.worker_rss.values() if rss
+    ]
+    if not sizes:
+        pytest.skip('Cannot measure the memory use of worker processes')
+    assert all(rss > 0 for rss in sizes)
+
+
+def test_invalid_progress_interval():
+    """
+    Ensure that a progress interval that is not positive raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid progress_interval'):
+        parq.run(
+            slow_double, [(1,)], n_proc=1, progress=print, progress_interval=0
+        )
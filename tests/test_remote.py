@@ -0,0 +1,235 @@
+"""Test cases for running jobs with worker processes on other hosts."""
+
+import multiprocessing
+import os
+import parq
+import pytest
+import socket
+import sys
+import time
+
+
+AUTHKEY = b'parq-test'
+
+
+def double(x):
+    return 2 * x
+
+
+def slow_pid(x):
+    # NOTE: make the jobs take long enough for every remote worker process
+    # to connect before the run is complete.
+    time.sleep(0.02)
+    return os.getpid()
+
+
+def fail_at_three(x):
+    time.sleep(0.02)
+    if x == 3:
+        raise ValueError('Job 3 failed')
+    return x
+
+
+def kill_first_attempt(x, marker_dir):
+    # NOTE: make each job take a non-zero amount of time to complete.
+    time.sleep(0.01)
+    marker = os.path.join(marker_dir, str(x))
+    if x == 7 and not os.path.exists(marker):
+        open(marker, 'w').close()
+        os.kill(os.getpid(), 9)
+    return x
+
+
+def free_address():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()
+
+
+def run_host(address, n_proc, connect_timeout):
+    # NOTE: report whether every worker process on this host succeeded.
+    success = parq.run_worker(
+        address, AUTHKEY, n_proc=n_proc, connect_timeout=connect_timeout
+    )
+    sys.exit(0 if success else 1)
+
+
+def run_command(args):
+    sys.exit(parq.worker_main(args))
+
+
+def start_hosts(address, n_hosts, n_proc, connect_timeout=10):
+    """
+    Start processes that stand in for other hosts, each of which starts
+    worker processes that connect to the given address.
+    """
+    hosts = [
+        multiprocessing.Process(
+            target=run_host, args=[address, n_proc, connect_timeout]
+        )
+        for _ in range(n_hosts)
+    ]
+    for host in hosts:
+        host.start()
+    return hosts
+
+
+def join_hosts(hosts):
+    for host in hosts:
+        host.join(timeout=20)
+        assert host.exitcode == 0
+
+
+def test_remote_results():
+    """
+    Ensure that every job is run by the remote worker processes, and that
+    the results are returned.
+    """
+    address = free_address()
+    hosts = start_hosts(address, n_hosts=2, n_proc=2)
+    job_count = 100
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run_remote(
+        slow_pid, values, 4, address, AUTHKEY, results=True, chunksize=2
+    )
+    join_hosts(hosts)
+    assert result
+    assert result.failed_worker_count == 0
+    assert sorted(result.job_results) == list(range(job_count))
+    assert len(set(result.job_results.values())) == 4
+
+
+def test_remote_stats():
+    """
+    Ensure that only the times measured by the remote worker processes are
+    recorded, since their clocks cannot be compared with this process.
+    """
+    address = free_address()
+    hosts = start_hosts(address, n_hosts=1, n_proc=2)
+    job_count = 20
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run_remote(
+        slow_pid, values, 2, address, AUTHKEY, stats=True, chunksize=2
+    )
+    join_hosts(hosts)
+    assert result
+    stats = result.stats
+    assert len(stats.wall_times) == job_count
+    assert len(stats.cpu_times) == job_count
+    assert all(wall >= 0.02 for wall in stats.wall_times)
+    assert len(stats.queue_wait_times) == 0
+    assert len(stats.transfer_times) == 0
+    assert sum(stats.jobs_per_worker.values()) == job_count
+
+
+def test_remote_surplus_workers():
+    """
+    Ensure that remote worker processes that connect once every worker
+    process that is needed has connected exit successfully.
+    """
+    address = free_address()
+    hosts = start_hosts(address, n_hosts=3, n_proc=1)
+    values = [(i,) for i in range(50)]
+
+    result = parq.run_remote(
+        slow_pid, values, 1, address, AUTHKEY, results=True
+    )
+    join_hosts(hosts)
+    assert result
+    assert len(set(result.job_results.values())) == 1
+
+
+def test_remote_fail_early():
+    """
+    Ensure that the remote worker processes stop once a job fails, and that
+    only the chunks that were already sent to them are run.
+    """
+    address = free_address()
+    # NOTE: the jobs may fail before the second host connects.
+    hosts = start_hosts(address, n_hosts=2, n_proc=1, connect_timeout=2)
+    job_count = 40
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run_remote(
+        fail_at_three, values, 2, address, AUTHKEY, trace=False
+    )
+    for host in hosts:
+        host.join(timeout=20)
+    assert not result
+    assert 3 in result.unsuccessful_job_nums()
+    assert result.failed_worker_count == 1
+    # NOTE: each remote worker process has at most two chunks in flight.
+    assert result.num_successful() <= 3 + 2 * 2
+    assert result.num_unsuccessful() == job_count - result.num_successful()
+
+
+def test_remote_host_failure(tmp_path):
+    """
+    Ensure that a remote worker process whose connection is closed is
+    treated as a worker process that was killed, and that its jobs are run
+    by the other remote worker processes.
+    """
+    address = free_address()
+    hosts = start_hosts(address, n_hosts=3, n_proc=1, connect_timeout=2)
+    n_jobs = 16
+    values = [(i, str(tmp_path)) for i in range(n_jobs)]
+
+    result = parq.run_remote(
+        kill_first_attempt, values, 3, address, AUTHKEY, retries=1
+    )
+    for host in hosts:
+        host.join(timeout=20)
+    assert result
+    assert result.num_successful() == n_jobs
+    assert result.attempts == {7: 2}
+    assert result.failed_worker_count == 1
+
+
+def test_remote_host_failure_without_retry(tmp_path):
+    """
+    Ensure that only the job whose remote worker process was killed is
+    unsuccessful.
+    """
+    address = free_address()
+    hosts = start_hosts(address, n_hosts=2, n_proc=1, connect_timeout=2)
+    n_jobs = 16
+    values = [(i, str(tmp_path)) for i in range(n_jobs)]
+
+    result = parq.run_remote(
+        kill_first_attempt, values, 2, address, AUTHKEY, fail_early=False
+    )
+    for host in hosts:
+        host.join(timeout=20)
+    assert not result
+    assert list(result.unsuccessful_job_nums()) == [7]
+    assert result.failed_worker_count == 1
+
+
+def test_worker_command(monkeypatch):
+    """
+    Ensure that the worker command connects to the given address, using the
+    authkey in the environment.
+    """
+    (host, port) = free_address()
+    monkeypatch.setenv('PARQ_AUTHKEY', AUTHKEY.decode())
+    args = [f'{host}:{port}', '--processes', '2']
+    worker = multiprocessing.Process(target=run_command, args=[args])
+    worker.start()
+    values = [(i,) for i in range(50)]
+
+    result = parq.run_remote(
+        slow_pid, values, 2, (host, port), AUTHKEY, results=True
+    )
+    join_hosts([worker])
+    assert result
+    assert len(set(result.job_results.values())) == 2
+
+
+def test_remote_requires_authkey():
+    """
+    Ensure that a remote run without an authkey raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='require an authkey'):
+        parq.run_remote(double, [(1,)], 1, free_address(), None)
@@ -0,0 +1,171 @@
+"""Test cases for running failed jobs again."""
+
+import os
+import parq
+import pytest
+import time
+
+
+class TransientError(Exception):
+    pass
+
+
+def fail_first_attempt(x, marker_dir):
+    # Raise a retryable exception the first time that each odd job is run.
+    marker = os.path.join(marker_dir, str(x))
+    if x % 2 == 1 and not os.path.exists(marker):
+        open(marker, 'w').close()
+        raise TransientError(f'Job {x} failed')
+    return x
+
+
+def always_fail(x):
+    raise TransientError(f'Job {x} failed')
+
+
+def kill_first_attempt(x, marker_dir):
+    # NOTE: make each job take a non-zero amount of time to complete.
+    time.sleep(0.01)
+    marker = os.path.join(marker_dir, str(x))
+    if x == 7 and not os.path.exists(marker):
+        open(marker, 'w').close()
+        os.kill(os.getpid(), 9)
+    return x
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_retry_exceptions(tmp_path, engine):
+    """
+    Ensure that jobs that raise a retryable exception are run again, and that
+    the number of attempts is recorded.
+    """
+    job_count = 10
+    values = [(i, str(tmp_path)) for i in range(job_count)]
+
+    result = parq.run(
+        fail_first_attempt,
+        values,
+        n_proc=2,
+        trace=False,
+        results=True,
+        retries=1,
+        retry_on=TransientError,
+        engine=engine,
+    )
+    assert result
+    assert result.job_results == {i: i for i in range(job_count)}
+    assert result.attempts == {i: 2 for i in range(1, job_count, 2)}
+    assert result.failed_worker_count == 0
+
+
+def test_retries_exhausted():
+    """
+    Ensure that a job is recorded as unsuccessful once it cannot be run
+    again, and that only then are the remaining jobs stopped.
+    """
+    values = [(i,) for i in range(5)]
+
+    result = parq.run(
+        always_fail,
+        values,
+        n_proc=1,
+        trace=False,
+        retries=2,
+        retry_on=TransientError,
+        chunksize=5,
+    )
+    assert not result
+    assert result.attempts[0] == 3
+    assert 0 in result.unsuccessful_job_nums()
+
+
+def test_no_retry_on_other_exceptions(tmp_path):
+    """
+    Ensure that jobs that raise other exceptions are not run again.
+    """
+    values = [(i, str(tmp_path)) for i in range(10)]
+
+    result = parq.run(
+        fail_first_attempt,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        retries=1,
+        retry_on=KeyError,
+    )
+    assert not result
+    assert list(result.unsuccessful_job_nums()) == list(range(1, 10, 2))
+    assert result.attempts == {}
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_respawn_and_retry(tmp_path, engine):
+    """
+    Ensure that a job whose worker process was killed is run again by a new
+    worker process, and that every other job is completed.
+    """
+    n_jobs = 16
+    values = [(i, str(tmp_path)) for i in range(n_jobs)]
+
+    result = parq.run(
+        kill_first_attempt,
+        values,
+        n_proc=2,
+        timeout=1,
+        retries=1,
+        respawn=True,
+        chunksize=4,
+        engine=engine,
+    )
+    assert result
+    assert result.num_successful() == n_jobs
+    assert result.attempts == {7: 2}
+    assert result.failed_worker_count == 1
+
+
+def test_respawn_without_retry(tmp_path):
+    """
+    Ensure that only the job whose worker process was killed is unsuccessful,
+    when a new worker process runs the other jobs.
+    """
+    n_jobs = 16
+    values = [(i, str(tmp_path)) for i in range(n_jobs)]
+
+    result = parq.run(
+        kill_first_attempt,
+        values,
+        n_proc=1,
+        timeout=1,
+        respawn=True,
+        chunksize=4,
+    )
+    assert not result
+    assert list(result.unsuccessful_job_nums()) == [7]
+    assert result.failed_worker_count == 1
+
+
+def test_pool_retries(tmp_path):
+    """
+    Ensure that jobs submitted to a pool are run again.
+    """
+    values = [(i, str(tmp_path)) for i in range(10)]
+
+    with parq.Pool(2) as pool:
+        result = pool.run(
+            fail_first_attempt,
+            values,
+            trace=False,
+            retries=1,
+            retry_on=TransientError,
+        )
+        assert result
+        assert result.attempts == {i: 2 for i in range(1, 10, 2)}
+
+
+def test_invalid_retries():
+    """
+    Ensure that a negative number of retries raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid retries'):
+        parq.run(always_fail, [(1,)], n_proc=1, retries=-1)
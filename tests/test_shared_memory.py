@@ -0,0 +1,187 @@
+"""Test cases for returning job results through shared memory."""
+
+import array
+import os
+import parq
+import pytest
+import time
+
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir('/dev/shm'),
+    reason='requires POSIX shared memory in /dev/shm',
+)
+
+
+def shared_blocks():
+    """Return the names of the shared memory blocks created by parq."""
+    return {
+        name for name in os.listdir('/dev/shm') if name.startswith('parq_')
+    }
+
+
+def large_bytes(x):
+    return bytes([x % 256]) * 100_000
+
+
+def test_shared_block_close():
+    """
+    Ensure that closing a shared memory block whose contents are still in
+    use closes its file descriptor, and leaves its contents mapped.
+    """
+    block = parq._SharedBlock(create=True, size=1024)
+    try:
+        block.buf[:4] = b'parq'
+        view = block.buf[:4]
+        block.close()
+        assert block._fd == -1
+        assert bytes(view) == b'parq'
+        del view
+    finally:
+        block.unlink()
+
+
+def test_shared_memory_bytes():
+    """
+    Ensure that large ``bytes`` and ``bytearray`` results are returned
+    through shared memory, and that every shared memory block is removed.
+    """
+    job_count = 50
+    n_proc = 2
+
+    values = [(i,) for i in range(job_count)]
+
+    def func(x):
+        if x % 2 == 0:
+            return large_bytes(x)
+        return bytearray(large_bytes(x))
+
+    result = parq.run(func, values, n_proc, results=True, shared_memory=True)
+    assert result
+
+    for i in range(job_count):
+        output = result.job_results[i]
+        assert type(output) is (bytes if i % 2 == 0 else bytearray)
+        assert output == large_bytes(i)
+    assert not shared_blocks()
+
+
+def test_shared_memory_mixed_results():
+    """
+    Ensure that results which contain large buffers, small buffers, and other
+    values are returned correctly.
+    """
+    job_count = 20
+    n_proc = 2
+
+    values = [(i,) for i in range(job_count)]
+
+    def func(x):
+        data = array.array('d', [x] * 20_000)
+        return {
+            'job': x,
+            'small': b'abc',
+            'view': memoryview(data),
+            'matrix': memoryview(data).cast('B').cast('d', [100, 200]),
+        }
+
+    result = parq.run(
+        func, values, n_proc, results=True, chunksize=4, shared_memory=True
+    )
+    assert result
+
+    for i in range(job_count):
+        output = result.job_results[i]
+        assert output['job'] == i
+        assert output['small'] == b'abc'
+        view = output['view']
+        assert isinstance(view, memoryview)
+        assert view.format == 'd'
+        assert view.tolist() == [i] * 20_000
+        assert output['matrix'].shape == (100, 200)
+    del result, output, view
+    assert not shared_blocks()
+
+
+def test_shared_memory_numpy():
+    """
+    Ensure that NumPy arrays are returned without copying them out of shared
+    memory.
+    """
+    np = pytest.importorskip('numpy')
+    job_count = 10
+    n_proc = 2
+
+    values = [(i,) for i in range(job_count)]
+
+    def func(x):
+        return np.full((100, 100), x, dtype=float)
+
+    result = parq.run(func, values, n_proc, results=True, shared_memory=True)
+    assert result
+
+    for i in range(job_count):
+        output = result.job_results[i]
+        assert output.shape == (100, 100)
+        assert not output.flags.owndata
+        assert np.all(output == i)
+    assert not shared_blocks()
+
+
+def test_shared_memory_worker_killed():
+    """
+    Ensure that the shared memory blocks created by a worker process are
+    removed if the worker is killed before reporting the results.
+    """
+    n_proc = 2
+    n_jobs = 16
+    kill_at = 7
+
+    values = [(i, i == kill_at) for i in range(n_jobs)]
+
+    def func(x, kill):
+        # NOTE: make each job take a non-zero amount of time to complete.
+        time.sleep(0.01)
+        if kill:
+            os.kill(os.getpid(), 9)
+        return large_bytes(x)
+
+    result = parq.run(
+        func,
+        values,
+        n_proc=n_proc,
+        timeout=1,
+        results=True,
+        chunksize=4,
+        shared_memory=True,
+    )
+
+    assert not result.success
+    assert result.failed_worker_count == 1
+    assert len(result.unsuccessful_jobs) == 4
+    for job_num, output in result.job_results.items():
+        assert output == large_bytes(job_num)
+    assert not shared_blocks()
+
+
+def test_shared_memory_imap_and_pool():
+    """
+    Ensure that results are returned through shared memory by
+    :func:`parq.imap` and by :class:`parq.Pool`.
+    """
+    values = [(i,) for i in range(20)]
+
+    for job_num, output in parq.imap(
+        large_bytes, values, n_proc=2, shared_memory=True
+    ):
+        assert output == large_bytes(job_num)
+
+    with parq.Pool(n_proc=2) as pool:
+        for _ in range(3):
+            result = pool.run(
+                large_bytes, values, results=True, shared_memory=True
+            )
+            assert result
+            for job_num, output in result.job_results.items():
+                assert output == large_bytes(job_num)
+    assert not shared_blocks()
@@ -0,0 +1,145 @@
+"""Test cases for writing job results to a file."""
+
+import collections.abc
+import parq
+import pytest
+
+
+def square(x):
+    return x * x
+
+
+def fail_at_five(x):
+    if x == 5:
+        raise ValueError('Job 5 failed')
+    return [x] * 3
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+def test_spill_temporary_file(engine):
+    """
+    Ensure that the results of each job can be loaded from a temporary file.
+    """
+    job_count = 100
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        square,
+        values,
+        n_proc=2,
+        results=True,
+        chunksize=7,
+        engine=engine,
+        spill=True,
+    )
+    assert result
+    assert not isinstance(result.job_results, dict)
+    assert isinstance(result.job_results, collections.abc.Mapping)
+    assert len(result.job_results) == job_count
+    assert result.job_results[42] == 42 * 42
+    assert list(result.job_results) == list(range(job_count))
+    assert result.job_results == {i: i * i for i in range(job_count)}
+
+
+def test_spill_path(tmp_path):
+    """
+    Ensure that the results are written to the given file, and that only the
+    results of successful jobs are recorded.
+    """
+    path = tmp_path / 'results'
+    values = [(i,) for i in range(10)]
+
+    result = parq.run(
+        fail_at_five,
+        values,
+        n_proc=2,
+        fail_early=False,
+        trace=False,
+        results=True,
+        spill=path,
+    )
+    assert not result
+    assert path.stat().st_size > 0
+    assert 5 not in result.job_results
+    with pytest.raises(KeyError):
+        result.job_results[5]
+    assert result.job_results.get(5) is None
+    assert 'a' not in result.job_results
+    with pytest.raises(KeyError):
+        result.job_results['a']
+    assert result.job_results.get(None) is None
+    assert result.job_results[9] == [9, 9, 9]
+    assert dict(result.job_results) == {
+        i: [i] * 3 for i in range(10) if i != 5
+    }
+
+
+def test_spill_close(tmp_path):
+    """
+    Ensure that the results file is closed when the result is used as a
+    context manager, and that closing a result that holds its results in
+    memory has no effect.
+    """
+    path = tmp_path / 'results'
+    values = [(i,) for i in range(10)]
+
+    with parq.run(square, values, n_proc=2, results=True, spill=path) as res:
+        assert res.job_results[3] == 9
+    assert res.job_results.file.closed
+    with pytest.raises(ValueError):
+        res.job_results[3]
+    # NOTE: the results file is retained once it is closed.
+    assert path.stat().st_size > 0
+
+    result = parq.run(square, values, n_proc=2, results=True)
+    result.close()
+    assert result.job_results[3] == 9
+
+
+def test_spill_without_results():
+    """
+    Ensure that spilling results has no effect if results are not collected.
+    """
+    result = parq.run(square, [(i,) for i in range(5)], n_proc=2, spill=True)
+    assert result
+    assert result.job_results is None
+
+
+def test_spill_resume(tmp_path):
+    """
+    Ensure that the results recorded in a checkpoint file are included when
+    the results are written to a file.
+    """
+    values = [(i,) for i in range(20)]
+    kwargs = {'n_proc': 2, 'results': True, 'spill': True}
+    checkpoint = tmp_path / 'checkpoint'
+
+    # NOTE: the jobs with no arguments to square are unsuccessful.
+    partial = values[:10] + [(None,)] * 10
+    result = parq.run(
+        square,
+        partial,
+        checkpoint=checkpoint,
+        fail_early=False,
+        trace=False,
+        **kwargs,
+    )
+    assert result.num_successful() == 10
+    result = parq.run(
+        square, values, checkpoint=checkpoint, resume=True, **kwargs
+    )
+    assert result
+    assert result.job_results == {i: i * i for i in range(20)}
+
+
+def test_pool_spill():
+    """
+    Ensure that the results of jobs submitted to a pool can be written to a
+    file.
+    """
+    with parq.Pool(2) as pool:
+        result = pool.run(
+            square, [(i,) for i in range(10)], results=True, spill=True
+        )
+        assert result
+        assert result.job_results == {i: i * i for i in range(10)}
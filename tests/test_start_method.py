@@ -0,0 +1,101 @@
+"""Test cases for the ways that worker processes can be started."""
+
+import multiprocessing
+import multiprocessing.forkserver
+import parq
+import pytest
+import sys
+
+
+START_METHODS = [
+    method
+    for method in ['spawn', 'forkserver']
+    if method in multiprocessing.get_all_start_methods()
+]
+
+
+def double(x):
+    return 2 * x
+
+
+def is_imported(name):
+    return name in sys.modules
+
+
+@pytest.mark.skipif(
+    'forkserver' not in START_METHODS, reason='Requires a fork server'
+)
+def test_forkserver_preload():
+    """
+    Ensure that the modules are imported by the fork server, so that each
+    worker process does not need to import them.
+    """
+    # NOTE: the fork server only imports the modules when it is started.
+    multiprocessing.forkserver._forkserver._stop()
+    values = [('colorsys',), ('parq',)]
+
+    result = parq.run(
+        is_imported,
+        values,
+        n_proc=2,
+        results=True,
+        start_method='forkserver',
+        preload=['colorsys'],
+    )
+    assert result
+    assert result.job_results == {0: True, 1: True}
+
+
+@pytest.mark.parametrize('engine', parq._ENGINES)
+@pytest.mark.parametrize('start_method', START_METHODS)
+def test_start_method(start_method, engine):
+    """
+    Ensure that every job is run by worker processes that are started with
+    each start method.
+    """
+    job_count = 20
+    values = [(i,) for i in range(job_count)]
+
+    result = parq.run(
+        double,
+        values,
+        n_proc=2,
+        results=True,
+        engine=engine,
+        start_method=start_method,
+    )
+    assert result
+    assert result.job_results == {i: 2 * i for i in range(job_count)}
+
+
+@pytest.mark.parametrize('start_method', START_METHODS)
+def test_pool_start_method(start_method):
+    """
+    Ensure that a pool can start its worker processes with each start method.
+    """
+    with parq.Pool(2, start_method=start_method) as pool:
+        result = pool.run(double, [(i,) for i in range(10)], results=True)
+        assert result.job_results == {i: 2 * i for i in range(10)}
+
+
+@pytest.mark.skipif(not START_METHODS, reason='Requires spawn')
+def test_unpicklable_function():
+    """
+    Ensure that a function that cannot be pickled raises a ValueError when
+    the worker processes are not forked.
+    """
+    with pytest.raises(ValueError, match='Invalid function'):
+        parq.run(lambda x: x, [(1,)], n_proc=1, start_method=START_METHODS[0])
+
+
+def test_invalid_start_method():
+    """
+    Ensure that an unknown start method, or preloading modules without a
+    fork server, raises a ValueError.
+    """
+    with pytest.raises(ValueError, match='Invalid start_method'):
+        parq.run(double, [(1,)], n_proc=1, start_method='clone')
+    with pytest.raises(ValueError, match='preloaded'):
+        parq.run(
+            double, [(1,)], n_proc=1, start_method='spawn', preload=['json']
+        )
@@ -0,0 +1,58 @@
+"""Test cases for recording where the time was spent."""
+
+import parq
+import time
+
+
+def sleep_for(duration):
+    time.sleep(duration)
+
+
+def test_stats():
+    """
+    Ensure that the time spent in each phase and by each job is recorded.
+    """
+    job_count = 20
+    values = [(0.01,) for _ in range(job_count)]
+
+    result = parq.run(sleep_for, values, n_proc=2, chunksize=3, stats=True)
+    assert result
+    stats = result.stats
+    assert set(stats.phases) == {'build', 'spawn', 'run', 'join'}
+    assert all(elapsed >= 0 for elapsed in stats.phases.values())
+    assert len(stats.wall_times) == job_count
+    assert len(stats.cpu_times) == job_count
+    assert len(stats.queue_wait_times) == job_count
+    assert len(stats.transfer_times) == 7
+    assert all(wall >= 0.01 for wall in stats.wall_times)
+    assert all(
+        cpu < wall for cpu, wall in zip(stats.cpu_times, stats.wall_times)
+    )
+    assert sum(stats.jobs_per_worker.values()) == job_count
+    assert set(stats.jobs_per_worker) <= {0, 1}
+    assert stats.jobs_per_second() > 0
+    percentiles = stats.percentiles('wall_times')
+    assert set(percentiles) == {50, 90, 99}
+    assert 0.01 <= percentiles[50] <= percentiles[90] <= percentiles[99]
+
+
+def test_stats_disabled():
+    """
+    Ensure that no times are recorded by default.
+    """
+    result = parq.run(sleep_for, [(0,)], n_proc=1)
+    assert result
+    assert result.stats is None
+
+
+def test_stats_pool():
+    """
+    Ensure that the times are recorded for each submission to a pool.
+    """
+    values = [(0,) for _ in range(10)]
+    with parq.Pool(2) as pool:
+        for _ in range(2):
+            result = pool.run(sleep_for, values, stats=True)
+            assert result
+            assert len(result.stats.wall_times) == len(values)
+            assert sum(result.stats.jobs_per_worker.values()) == len(values)
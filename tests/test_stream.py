@@ -0,0 +1,121 @@
+"""Test cases for taking jobs from an iterable as they are needed."""
+
+import itertools
+import os
+import parq
+import pytest
+import time
+
+
+def test_stream_unbounded_generator():
+    """
+    Ensure that jobs can be taken from an unbounded generator, and that only
+    a limited number of jobs are taken from the generator.
+    """
+
+    def func(x):
+        if x == 50:
+            raise ValueError('x == 50')
+
+    max_in_flight = 10
+    values = ((i,) for i in itertools.count())
+    result = parq.run(
+        func, values, n_proc=2, trace=False, max_in_flight=max_in_flight
+    )
+    assert not result.success
+    assert result.successful_jobs is None
+    assert (50,) in result.unsuccessful_jobs
+    assert 50 < result.job_count <= 51 + max_in_flight
+    # NOTE: the other worker may complete several jobs after x == 50 before
+    # it stops.
+    assert 49 <= result.num_successful() < result.job_count
+
+
+def test_stream_results():
+    """
+    Ensure that results are recorded when jobs are taken from a generator.
+    """
+
+    def func(x):
+        return 2 * x
+
+    for chunksize in [1, 3, 'auto']:
+        values = ((i,) for i in range(100))
+        result = parq.run(
+            func,
+            values,
+            n_proc=3,
+            results=True,
+            chunksize=chunksize,
+            max_in_flight=8,
+        )
+        assert result
+        assert result.job_count == 100
+        assert result.successful_jobs is None
+        assert result.unsuccessful_jobs == []
+        assert result.num_successful() == 100
+        assert result.job_results == {i: 2 * i for i in range(100)}
+
+
+def test_stream_sequence():
+    """
+    Ensure that the arguments of successful jobs are retained when jobs are
+    taken from a sequence.
+    """
+
+    def func(x):
+        if x == 3:
+            raise ValueError('x == 3')
+
+    values = [(i,) for i in range(20)]
+    result = parq.run(
+        func, values, n_proc=2, fail_early=False, trace=False, max_in_flight=4
+    )
+    assert not result.success
+    assert result.job_count == 20
+    assert sorted(result.successful_jobs) == [
+        (i,) for i in range(20) if i != 3
+    ]
+    assert result.unsuccessful_jobs == [(3,)]
+
+
+def test_stream_invalid_args():
+    """
+    Ensure that invalid arguments are reported when they are taken from a
+    generator after the worker processes have started.
+    """
+
+    def func(*args):
+        pass
+
+    def cannot_pickle():
+        pass
+
+    def values():
+        for i in range(100):
+            yield (i,)
+        yield (100, cannot_pickle)
+
+    with pytest.raises(ValueError, match='Invalid arguments:'):
+        parq.run(func, values(), n_proc=2, max_in_flight=5)
+
+
+def test_stream_kill_worker():
+    """
+    Ensure that jobs lost to a killed worker do not prevent the remaining
+    jobs from being taken from the generator.
+    """
+
+    def func(kill):
+        time.sleep(0.01)
+        if kill:
+            os.kill(os.getpid(), 9)
+
+    n_jobs = 16
+    values = ((i == 5,) for i in range(n_jobs))
+    result = parq.run(func, values, n_proc=3, timeout=1, max_in_flight=2)
+    assert not result.success
+    assert result.job_count == n_jobs
+    assert result.unsuccessful_jobs == [(True,)]
+    assert result.num_successful() == n_jobs - 1
+    assert result.failed_worker_count == 1